@@ -3,7 +3,7 @@
 
 a = Analysis(
     ['repo_depth_analyser\\main.py'],
-    pathex=[],
+    pathex=['.'],
     binaries=[],
     datas=[],
     hiddenimports=[],
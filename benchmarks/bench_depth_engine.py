@@ -0,0 +1,94 @@
+"""
+Benchmark: the Depth Analyser's thread engine (one future per file on 10
+threads) versus its process engine (256-file tasks on a process pool,
+bounded in flight). A tree of WebForms pages is generated, or an existing
+folder is used, and each engine scans it in a fresh interpreter so that
+peak RSS is measured per engine: the scanning process plus its largest
+worker.
+
+Reports wall time, files/s and peak RSS, and checks both engines produce
+the same inventory.
+
+Usage (from the repository root):
+    python benchmarks/bench_depth_engine.py [path] [--files 4000] [--page-kb 24] [--workers 0]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.sample_pages import webforms_page
+
+
+def build_tree(root, files, page_kb):
+    """files pages of about page_kb KB, 50 per folder."""
+    page = webforms_page(page_kb * 1024)
+    for i in range(files):
+        folder = os.path.join(root, f'Module{i // 50}')
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f'Page{i}.aspx'), 'w') as f:
+            f.write(page)
+
+
+def run_engine(path, engine, workers):
+    """Child side: scans path and prints seconds, file count, RSS and an inventory digest as JSON."""
+    import hashlib
+    import resource
+    from repo_depth_analyser.src.scanner import Scanner
+
+    start = time.perf_counter()
+    inventory, _, _ = Scanner(path, engine=engine, workers=workers).scan()
+    seconds = time.perf_counter() - start
+
+    rows = sorted(json.dumps(row, sort_keys=True, default=str) for row in inventory)
+    print(json.dumps({
+        'seconds': seconds,
+        'files': len(inventory),
+        # ru_maxrss is in KB on Linux; RUSAGE_CHILDREN reports the largest worker
+        'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'worker_rss_mb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        'digest': hashlib.sha1('\n'.join(rows).encode('utf-8')).hexdigest(),
+    }))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the Depth Analyser's analysis engines")
+    arg_parser.add_argument('path', nargs='?', help="Folder to scan (default: a generated tree)")
+    arg_parser.add_argument('--files', type=int, default=4000)
+    arg_parser.add_argument('--page-kb', type=int, default=24)
+    arg_parser.add_argument('--workers', type=int, default=0, help="Process engine workers (0 = one per CPU)")
+    arg_parser.add_argument('--run', choices=['thread', 'process'], help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.run:
+        run_engine(args.path, args.run, args.workers)
+        return
+
+    root = args.path or tempfile.mkdtemp()
+    try:
+        if not args.path:
+            build_tree(root, args.files, args.page_kb)
+            print(f"Tree: {args.files:,} pages of ~{args.page_kb} KB")
+
+        reference = None
+        for engine in ('thread', 'process'):
+            output = subprocess.run([sys.executable, __file__, root, '--run', engine, '--workers', str(args.workers)],
+                                    check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            assert reference is None or reference == result['digest'], "inventories differ"
+            reference = result['digest']
+            print(f"{engine:>8} engine  {result['seconds']:7.2f} s ({result['files'] / result['seconds']:8,.0f} files/s)   "
+                  f"peak RSS {result['rss_mb']:6.1f} MB (largest worker {result['worker_rss_mb']:6.1f} MB)")
+    finally:
+        if not args.path:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: sequential versus threaded discovery on a simulated network
+share. A local tree is generated and os.scandir is wrapped so that every
+folder listing and every DirEntry.stat() sleeps for a fixed round trip,
+like an SMB/NFS mount.
+
+Reports wall time and files/s for RepoScan-Analyser's Scanner.discover
+(stat per candidate file) and the Depth Analyser's walk (names only), and
+checks every thread count finds the same files in the same order.
+
+Usage (from the repository root):
+    python benchmarks/bench_discovery.py [--dirs 400] [--files 20] [--latency-ms 2] [--threads 1 8 32]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.config import ScannerConfig
+from src.scanner import Scanner
+from repo_depth_analyser.src.scanner import Scanner as DepthScanner
+from reposcan_shared.walker import walk
+
+_real_scandir = os.scandir
+
+
+class LatentEntry:
+    """DirEntry stand-in whose stat() costs a round trip."""
+    def __init__(self, entry, latency):
+        self._entry = entry
+        self._latency = latency
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self, follow_symlinks=True):
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self):
+        return self._entry.is_symlink()
+
+    def stat(self, follow_symlinks=True):
+        time.sleep(self._latency)
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+
+class LatentScandir:
+    def __init__(self, path, latency):
+        time.sleep(latency)
+        self._it = _real_scandir(path)
+        self._latency = latency
+
+    def __iter__(self):
+        return (LatentEntry(e, self._latency) for e in self._it)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._it.close()
+
+
+def build_tree(root, dirs, files_per_dir):
+    """A web root of dirs folders (fan-out 8) holding pages, scripts and assets."""
+    names = ['Page{}.aspx', 'Control{}.ascx', 'app{}.js', 'site{}.css', 'logo{}.png']
+    folders = [root]
+    for i in range(1, dirs):
+        folder = os.path.join(folders[(i - 1) // 8], f'Folder{i}')
+        os.makedirs(folder)
+        folders.append(folder)
+    for folder in folders:
+        for j in range(files_per_dir):
+            with open(os.path.join(folder, names[j % len(names)].format(j)), 'w') as f:
+                f.write('<script>init();</script>\n')
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark threaded discovery with injected latency")
+    arg_parser.add_argument('--dirs', type=int, default=400)
+    arg_parser.add_argument('--files', type=int, default=20)
+    arg_parser.add_argument('--latency-ms', type=float, default=2.0)
+    arg_parser.add_argument('--threads', type=int, nargs='+', default=[1, 8, 32])
+    args = arg_parser.parse_args()
+
+    root = tempfile.mkdtemp()
+    try:
+        build_tree(root, args.dirs, args.files)
+        latency = args.latency_ms / 1000
+        os.scandir = lambda path: LatentScandir(path, latency)
+
+        config = ScannerConfig.load(os.path.join(os.path.dirname(__file__), '..', 'config.ini'))
+        config.root_folder = root
+        depth = DepthScanner(root)
+        total = args.dirs * args.files
+        print(f"Tree: {args.dirs:,} folders, {total:,} files, {args.latency_ms:g} ms per listing and per stat")
+
+        reference = {}
+        for threads in args.threads:
+            config.discovery_threads = threads
+            seconds, found = timed(lambda: [f.path for f in Scanner(config).discover()])
+            depth_seconds, names = timed(lambda: [(l.path, l.files) for l in walk(
+                root, lambda entry: entry.name, skip_dir=lambda entry: entry.name in depth.excluded_folders,
+                threads=threads)])
+
+            assert reference.setdefault('found', found) == found, "discovered files differ"
+            assert reference.setdefault('names', names) == names, "walked files differ"
+            print(f"{threads:>3} threads  Analyser {seconds:7.2f} s ({total / seconds:9,.0f} files/s)   "
+                  f"Depth walk {depth_seconds:7.2f} s ({total / depth_seconds:9,.0f} files/s)")
+    finally:
+        os.scandir = _real_scandir
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: fused single-scan enrichment (Parser._enrich) versus the
+previous per-metric passes (five dynamic-code findalls, three complexity
+findalls over a lower-cased copy, three severity searches and a second
+lower-cased copy for the functionality heuristic), on large script blocks.
+
+Usage (from the repository root):
+    python benchmarks/bench_enrichment.py [--block-kb 512] [--blocks 8] [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.parser import Parser, CodeSnippet
+from src import ajax_detector
+from reposcan_shared import patterns
+from benchmarks.sample_pages import WEBFORMS_SCRIPT
+
+FIELDS = ('dynamic_code_detected', 'dynamic_pattern', 'dynamic_count', 'logic_density_score',
+          'complexity', 'server_severity', 'functionality')
+
+SCRIPT_LINES = '''    var row{i} = document.querySelector('#row{i}');
+    row{i}.addEventListener('click', function () {{ highlight(row{i}); }});
+    for (var c = 0; c < cells.length; c++) {{ cells[c].style.width = widths[c] + 'px'; }}
+    while (queue.length) {{ render(queue.shift()); }}
+    status.innerHTML = '<b>' + '@ViewBag.Title' + '</b>';
+    setTimeout(refresh{i}, 500);
+'''
+
+
+def script_block(target_bytes):
+    """A large inline script: WebForms handlers plus generic DOM glue."""
+    parts, size, i = [], 0, 0
+    while size < target_bytes:
+        chunk = WEBFORMS_SCRIPT.format(i=i) + SCRIPT_LINES.format(i=i)
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    return "".join(parts)
+
+
+def legacy_enrich(parser, snippet):
+    """The previous implementation: one pass per metric pattern."""
+    if snippet.category == 'JS':
+        ajax_detector.detect_ajax_patterns(snippet)
+        code = snippet.full_code
+        total_dynamic, first_pattern = 0, ""
+        for group, name in parser.dynamic_groups.items():
+            matches = patterns.get(group).findall(code)
+            if matches:
+                first_pattern = first_pattern or name
+                total_dynamic += len(matches)
+        if total_dynamic:
+            snippet.dynamic_code_detected = True
+            snippet.dynamic_pattern = first_pattern
+            snippet.dynamic_count = total_dynamic
+
+    code = snippet.full_code.lower()
+    counts = {name: len(patterns.get(name).findall(code))
+              for name in ('logic_structures', 'event_listeners', 'dom_selectors')}
+    for name in ('severity_high', 'severity_medium', 'severity_low'):
+        counts[name] = 1 if patterns.get(name).search(snippet.full_code) else 0
+    parser._calculate_complexity(snippet, counts)
+    parser._assess_severity(snippet, counts)
+    snippet.full_code.lower()  # The functionality heuristic took its own copy
+    parser._infer_functionality(snippet)
+
+
+def best_of(repeat, fn, snippets):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for snippet in snippets:
+            fn(snippet)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark Parser enrichment")
+    arg_parser.add_argument('--block-kb', type=int, default=512)
+    arg_parser.add_argument('--blocks', type=int, default=8)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    parser = Parser()
+    code = script_block(args.block_kb * 1024)
+
+    def snippets():
+        return [CodeSnippet('Grid.aspx', 1, code.count('\n') + 1, 'JS', code[:200], 'scriptblock',
+                            full_code=code, source_type='INLINE') for _ in range(args.blocks)]
+
+    legacy_snippets, fused_snippets = snippets(), snippets()
+    legacy = best_of(args.repeat, lambda s: legacy_enrich(parser, s), legacy_snippets)
+    fused = best_of(args.repeat, parser._enrich, fused_snippets)
+
+    for old, new in zip(legacy_snippets, fused_snippets):
+        assert [getattr(old, f) for f in FIELDS] == [getattr(new, f) for f in FIELDS], "fused enrichment differs"
+
+    total_mb = args.blocks * len(code) / (1024 * 1024)
+    print(f"Script blocks:     {args.blocks} x {len(code) / 1024:.0f} KB ({total_mb:.1f} MB, results identical)")
+    print(f"Per-metric passes: {legacy * 1000:8.1f} ms")
+    print(f"Fused scan:        {fused * 1000:8.1f} ms")
+    print(f"Speedup:           {legacy / fused:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: Parser.parse with the BS4 tree backend versus the streaming
+tokenizer backend, on a synthetic WebForms page.
+
+Reports CPU time (best of N) and peak Python allocation (tracemalloc)
+per backend, and checks both produce the same findings. Parser.parse
+also enriches every finding (the same work for both backends), so the
+markup stage is measured on its own as well: building the BeautifulSoup
+tree versus running the stream scanner over the page.
+
+Usage (from the repository root):
+    python benchmarks/bench_parser_backend.py [--size-mb 5] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from bs4 import BeautifulSoup
+from src.parser import Parser
+from src import html_tokenizer
+from benchmarks.sample_pages import webforms_page
+
+REF_TYPES = ('External Script', 'Internal Script', 'External Style', 'Internal Style')
+
+
+def cpu_time(repeat, fn, *args):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        fn(*args)
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def peak_memory(fn, *args):
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def build_tree(content):
+    BeautifulSoup(content, 'html.parser')
+
+
+def scan_events(content):
+    for _ in html_tokenizer.scan(content):
+        pass
+
+
+def comparable(findings):
+    # Tag references keep the source text in the stream backend, not BS4's serialisation
+    return [(f.start_line, f.end_line, f.code_type, f.snippet if f.code_type in REF_TYPES else f.full_code) for f in findings]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark Parser backends")
+    arg_parser.add_argument('--size-mb', type=float, default=5.0)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    content = webforms_page(int(args.size_mb * 1024 * 1024))
+    results = {}
+    for backend in ('bs4', 'stream'):
+        parser = Parser(backend)
+        results[backend] = (
+            cpu_time(args.repeat, parser.parse, 'Grid.aspx', content),
+            peak_memory(parser.parse, 'Grid.aspx', content),
+            comparable(parser.parse('Grid.aspx', content)),
+        )
+
+    assert results['bs4'][2] == results['stream'][2], "stream findings differ from the BS4 reference"
+
+    print(f"Page size:  {len(content) / (1024 * 1024):.2f} MB, {len(results['bs4'][2]):,} findings (identical)")
+    for backend, (cpu, peak, _) in results.items():
+        print(f"{backend:<7} CPU {cpu * 1000:9.1f} ms   peak memory {peak / (1024 * 1024):8.2f} MB")
+    print(f"Speedup:    {results['bs4'][0] / results['stream'][0]:.2f}x CPU, "
+          f"{results['bs4'][1] / results['stream'][1]:.2f}x less peak memory")
+
+    stages = {name: (cpu_time(args.repeat, fn, content), peak_memory(fn, content))
+              for name, fn in (('tree', build_tree), ('scan', scan_events))}
+    print("Markup stage only:")
+    for name, (cpu, peak) in stages.items():
+        print(f"  {name:<5} CPU {cpu * 1000:9.1f} ms   peak memory {peak / (1024 * 1024):8.2f} MB")
+    print(f"  Speedup:  {stages['tree'][0] / stages['scan'][0]:.2f}x CPU, "
+          f"{stages['tree'][1] / stages['scan'][1]:,.0f}x less peak memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark: single-pass Parser._scan_dom versus the previous six-pass walk.
+
+Usage (from the repository root):
+    python benchmarks/bench_scan_dom.py [--size-mb 2] [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.parser import Parser, CodeSnippet
+from benchmarks.sample_pages import webforms_page
+
+
+def legacy_scan_dom(self, file_path, soup, raw_content):
+    """The previous implementation: six separate walks over the tree."""
+    findings = []
+    
+    # --- JavaScript ---
+    # 1. Inline Script Blocks
+    for script in soup.find_all('script'):
+        line_num = self._get_line_number(script, raw_content, str(script))
+        
+        if script.has_attr('src'):
+            # External or Internal Script
+            src = script['src']
+            end_line = line_num  
+            
+            if src.lower().startswith(('http:', 'https:', '//')):
+                # Remote
+                findings.append(CodeSnippet(file_path, line_num, end_line, 'External', src, 'External Script', full_code=str(script), source_type='REMOTE'))
+            else:
+                # LOCAL / Internal
+                findings.append(CodeSnippet(file_path, line_num, end_line, 'Internal', src, 'Internal Script', full_code=str(script), source_type='LOCAL'))
+        else:
+            if script.string or script.contents:
+                code = script.string if script.string else "".join([str(c) for c in script.contents])
+                full_code = code.strip()
+                snippet = full_code[:200]
+                line_count = full_code.count('\n')
+                end_line = line_num + line_count
+                
+                findings.append(CodeSnippet(file_path, line_num, end_line, 'JS', snippet, 'scriptblock', full_code=full_code, source_type='INLINE'))
+
+    # 2. Event Handlers
+    for tag in soup.find_all(True):
+        for attr in tag.attrs:
+            attr_lower = attr.lower()
+            if attr_lower in self.event_handlers:
+                val = tag[attr]
+                full_code = str(val)
+                line_num = self._get_line_number(tag, raw_content, full_code)
+                
+                # Event handlers are attributes, usually start/end on same tag line or close. 
+                # Approximate end line by counting newlines in the attribute value.
+                line_count = full_code.count('\n')
+                end_line = line_num + line_count
+                
+                snippet = f'{attr}="{full_code}"'
+                findings.append(CodeSnippet(file_path, line_num, end_line, 'JS', snippet, attr_lower, full_code=full_code, source_type='INLINE'))
+            
+            if attr_lower in ['href', 'src']:
+                val = tag[attr]
+                if isinstance(val, str) and val.lower().strip().startswith('javascript:'):
+                    line_num = self._get_line_number(tag, raw_content, val)
+                    end_line = line_num + val.count('\n')
+                    findings.append(CodeSnippet(file_path, line_num, end_line, 'JS', val, 'jsuri', full_code=val, source_type='INLINE'))
+
+    # --- CSS ---
+    # 1. Inline Style Blocks
+    for style in soup.find_all('style'):
+        content = style.string if style.string else ""
+        line_num = self._get_line_number(style, raw_content, content)
+        
+        if content and '@import' in content:
+            end_line = line_num + content.strip().count('\n')
+            findings.append(CodeSnippet(file_path, line_num, end_line, 'External', content.strip()[:100], 'External Style (@import)', full_code=content.strip(), source_type='REMOTE'))
+        
+        end_line = line_num + content.strip().count('\n')
+        findings.append(CodeSnippet(file_path, line_num, end_line, 'CSS', content.strip()[:200], 'styleblock', full_code=content.strip(), source_type='INLINE'))
+
+    # 2. Style Attributes
+    for tag in soup.find_all(True):
+        if tag.has_attr('style'):
+            val = tag['style']
+            line_num = self._get_line_number(tag, raw_content, val)
+            end_line = line_num + str(val).count('\n')
+            if '<%' in str(val):
+                 findings.append(CodeSnippet(file_path, line_num, end_line, 'CSS', f'style="{val}"', 'ASP.NET Style', full_code=val, source_type='INLINE'))
+            else:
+                 findings.append(CodeSnippet(file_path, line_num, end_line, 'CSS', f'style="{val}"', 'inlinestyle', full_code=val, source_type='INLINE'))
+
+    # 3. External Stylesheets
+    for link in soup.find_all('link'):
+        rels = link.get('rel', [])
+        if 'stylesheet' in (rels if isinstance(rels, list) else [rels]):
+            if link.has_attr('href'):
+                line_num = self._get_line_number(link, raw_content, str(link))
+                end_line = line_num # Single line typically
+                href = link['href']
+                if href.lower().startswith(('http:', 'https:', '//')):
+                    findings.append(CodeSnippet(file_path, line_num, end_line, 'External', href, 'External Style', full_code=str(link), source_type='REMOTE'))
+                else:
+                    findings.append(CodeSnippet(file_path, line_num, end_line, 'Internal', href, 'Internal Style', full_code=str(link), source_type='LOCAL'))
+
+    return findings
+
+
+def best_of(repeat, fn, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark Parser._scan_dom")
+    arg_parser.add_argument('--size-mb', type=float, default=2.0)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    content = webforms_page(int(args.size_mb * 1024 * 1024))
+    parser = Parser()
+    parser.parse('Grid.aspx', "")  # initialise per-parse state
+    soup = BeautifulSoup(content, 'html.parser')
+
+    legacy = best_of(args.repeat, legacy_scan_dom, parser, 'Grid.aspx', soup, content)
+    single = best_of(args.repeat, parser._scan_dom, 'Grid.aspx', soup, content)
+
+    expected = [vars(f) for f in legacy_scan_dom(parser, 'Grid.aspx', soup, content)]
+    actual = [vars(f) for f in parser._scan_dom('Grid.aspx', soup, content)]
+    assert expected == actual, "single-pass findings differ from the six-pass reference"
+
+    print(f"Page size:         {len(content) / (1024 * 1024):.2f} MB, {len(actual):,} findings (identical)")
+    print(f"Six-pass walk:     {legacy * 1000:8.1f} ms")
+    print(f"Single-pass walk:  {single * 1000:8.1f} ms")
+    print(f"Speedup:           {legacy / single:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Synthetic legacy pages for the benchmarks in this folder.
+"""
+
+WEBFORMS_ROW = '''    <tr class="grid-row" style="background-color: #f5f5f5; border: 1px solid #ccc">
+        <td><asp:Label ID="lblName{i}" runat="server" Text="<%# Eval("Name") %>" /></td>
+        <td><a href="javascript:__doPostBack('grid$ctl{i}$lnkEdit','')" onclick="return confirmEdit({i});">Edit</a></td>
+        <td><input type="button" value="Delete" onclick="deleteRow({i}); return false;" onmouseover="highlight(this)" /></td>
+    </tr>
+'''
+
+WEBFORMS_SCRIPT = '''<script type="text/javascript">
+    function confirmEdit{i}(id) {{
+        if (!confirm('Edit row ' + id + '?')) {{ return false; }}
+        $.ajax({{ url: '/Services/Grid.asmx/Edit', type: 'POST', data: JSON.stringify({{ id: id }}) }});
+        document.getElementById('status').innerHTML = 'Editing ' + id;
+        return true;
+    }}
+</script>
+'''
+
+PAGE_HEADER = '''<%@ Page Language="C#" AutoEventWireup="true" CodeBehind="Grid.aspx.cs" Inherits="Legacy.Grid" %>
+<!DOCTYPE html>
+<html>
+<head runat="server">
+    <link rel="stylesheet" href="/Content/site.css" />
+    <link rel="stylesheet" href="https://cdn.example.com/bootstrap.min.css" />
+    <script src="/Scripts/jquery-1.12.4.min.js"></script>
+    <style>
+        .grid-row td {{ padding: 4px; }}
+    </style>
+</head>
+<body onload="initGrid()">
+<form id="form1" runat="server">
+<table>
+'''
+
+PAGE_FOOTER = '''</table>
+</form>
+</body>
+</html>
+'''
+
+
+def webforms_page(target_bytes: int = 2 * 1024 * 1024) -> str:
+    """A WebForms-style grid page of roughly target_bytes, with an inline script every 50 rows."""
+    parts = [PAGE_HEADER.format()]
+    size = len(parts[0])
+    i = 0
+    while size < target_bytes:
+        chunk = WEBFORMS_ROW.format(i=i)
+        if i % 50 == 0:
+            chunk += WEBFORMS_SCRIPT.format(i=i)
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append(PAGE_FOOTER)
+    return "".join(parts)
@@ -4,18 +4,25 @@ import shutil
 import time
 import glob
 import logging
+import collections
 from src.config import parse_arguments
 from src.scanner import Scanner
-from src.reader import FileReader
-from src.parser import Parser
-from src.reporter import Reporter
+from src.engine import FileResult, analysis_pipeline, resolve_workers
+from src.parser import PARSE_TIERS, TIER_DOM, TIER_LABELS, TIER_TRIAGE
+from src.manifest import ScanManifest
+from src.vendor_index import VendorIndex
 from src.reporter import Reporter
+from repo_depth_analyser.src.scanner import Scanner as DepthScanner
 from src.logger import setup_logger
 try:
     from refactoring_utility.check import generate_report
 except ImportError:
     generate_report = None
     logging.warning("Could not import refactoring_utility.check. Assessment tracker will not be generated.")
+try:
+    from repo_depth_analyser.src.reporter import Reporter as DepthReporter
+except ImportError:
+    DepthReporter = None  # Needs pandas; only the depth report uses it
 
 def cleanup_old_reports(output_folder: str):
     """Removes previous scan reports to keep the output folder clean."""
@@ -87,50 +94,147 @@ def main():
     print("\nDone.")
 
 def run_static_scan(config):
-    # 2. Scanning
-    print("\n[Phase 1] Discovery...")
-    try:
-        scanner = Scanner(config)
-        files_to_scan = list(scanner.scan())
-        print(f"Found {len(files_to_scan)} files to process.")
-    except Exception as e:
-        logging.error(f"Scanning failed: {e}")
-        sys.exit(1)
+    # 2-3. Discovery and analysis, pipelined: files are read and parsed while
+    # discovery is still listing folders, and findings are recorded as they arrive
+    print("\n[Phase 1] Discovery and Analysis...")
+    scanner = Scanner(config)
+    workers = resolve_workers(config.workers)
+    if workers > 1:
+        print(f"Using {workers} worker processes.")
+
+    # Known third-party libraries are summarised, not analysed
+    vendor_index = VendorIndex.load(config.vendor_index_file) if config.skip_vendor else None
 
-    parser = Parser()
+    # Files over the size limit are scanned in windows instead of parsed (or skipped at discovery)
+    window_above = config.max_file_size_mb * 1024 * 1024 if config.oversized_files == "window" else None
+
+    # Incremental mode: unchanged files reuse their findings from the last run
+    manifest = None
+    if config.incremental:
+        manifest = ScanManifest(config.output_folder, config.parser_backend,
+                                vendor_index.fingerprint() if vendor_index else "", window_above or 0,
+                                config.depth_report)
+        manifest.load()
+
+    # Depth report: the Depth Analyser's metrics come with each result, from the same read
+    depth = DepthScanner(config.root_folder) if config.depth_report else None
+
+    discovered_count = 0
+
+    def work_items():
+        nonlocal discovered_count
+        for found in scanner.discover():
+            discovered_count += 1
+            if manifest:
+                findings = manifest.lookup(found.path, found.size, found.mtime, found.digest)
+                if findings is not None:
+                    yield FileResult(found.path, findings, "", digest=manifest.known_digest(found.path), cached=True,
+                                     depth=manifest.cached_depth(found.path))
+                    continue
+                yield found.path, manifest.known_digest(found.path), found.size
+            else:
+                yield found.path, None, found.size
+
+    pipeline = analysis_pipeline(workers, config.read_threads, config.queue_depth, config.parser_backend, vendor_index,
+                                 window_above, config.depth_report)
     all_findings = []
-    
-    # 3. Processing
-    print("\n[Phase 2] Analysis...")
-    processed_count = 0
+    processed_count = cached_count = shared_count = 0
+    file_digests = {}
+    ajax_scans = ajax_scans_avoided = 0
+    decode_strategies = collections.Counter()
+    parse_tiers = collections.Counter()
+    vendor_libraries = collections.Counter()
     start_time = time.time()
 
-    for file_path in files_to_scan:
-        processed_count += 1
-        
-        if processed_count % 10 == 0 or processed_count == len(files_to_scan):
-            sys.stdout.write(f"\rProcessing: {processed_count}/{len(files_to_scan)}")
-            sys.stdout.flush()
+    try:
+        for result in pipeline.run(work_items()):
+            processed_count += 1
+            if processed_count % 10 == 0:
+                # Discovery is still running, so the total grows until it finishes
+                sys.stdout.write(f"\rProcessing: {processed_count}/{discovered_count} discovered")
+                sys.stdout.flush()
 
-        # Read
-        content, encoding = FileReader.read_file(file_path)
-        if content is None:
-            logging.warning(f"Skipping file {file_path}: {encoding}")
-            continue
+            if result.digest:
+                file_digests[result.file_path] = result.digest
+            if depth:
+                depth_record = result.depth or (manifest.cached_depth(result.file_path) if result.unchanged else None)
+                if depth_record:
+                    depth.record(depth_record)
+            if result.cached:
+                cached_count += 1
+                all_findings.extend(result.findings)
+                continue
 
-        # Parse
-        try:
-            findings = parser.parse(file_path, content)
-            all_findings.extend(findings)
-        except Exception as e:
-            logging.error(f"Error parsing {file_path}: {e}")
+            if result.decode_strategy:
+                decode_strategies[result.decode_strategy] += 1
+            if result.unchanged:
+                all_findings.extend(manifest.reuse(result.file_path, result.digest))
+            elif result.error:
+                logging.error(f"Error parsing {result.file_path}: {result.error}")
+            elif result.findings is None:
+                logging.warning(f"Skipping file {result.file_path}: {result.encoding}")
+            else:
+                all_findings.extend(result.findings)
+                shared_count += result.shared
+                if result.vendor:
+                    vendor_libraries[result.vendor] += 1
+                if result.tier:  # Parsed here, not shared, summarised or windowed
+                    parse_tiers[result.tier] += 1
+                ajax_scans += result.ajax_scans[0]
+                ajax_scans_avoided += result.ajax_scans[1]
+                if manifest:
+                    manifest.record(result.file_path, result.digest, result.findings, result.depth)
+    except Exception:
+        sys.stdout.write("\n")
+        logging.exception(f"Scanning failed after {processed_count} of {discovered_count} discovered files")
+        if manifest:
+            # The files analysed so far are not parsed again on the next run
+            manifest.save(partial=True)
+        sys.exit(1)
+    sys.stdout.write(f"\rProcessing: {processed_count}/{discovered_count} discovered\n")
+
+    if manifest:
+        manifest.save()
+
+    # Identical copies (same content hash) across the tree
+    copies = collections.Counter(file_digests.values())
+    for finding in all_findings:
+        digest = file_digests.get(finding.file_path)
+        finding.duplicate_count = copies[digest] - 1 if digest else 0
+    duplicate_files = sum(n for n in copies.values() if n > 1)
 
     duration = time.time() - start_time
-    print(f"\n\nAnalysis complete in {duration:.2f} seconds.")
+    print(f"Analysed {processed_count} files.")
+    print(f"Discovery: {scanner.files_seen:,} files in {scanner.dirs_seen:,} folders "
+          f"in {scanner.elapsed:.2f} seconds ({scanner.files_per_second:,.0f} files/s).")
+    if cached_count:
+        print(f"Reused cached findings for {cached_count} unchanged files.")
+    print(f"\nAnalysis complete in {duration:.2f} seconds.")
+    print("\n".join(pipeline.report()))
+    if duplicate_files:
+        print(f"Duplicate content: {duplicate_files} files are identical to another file; "
+              f"{shared_count} reused the findings of an earlier copy instead of being parsed.")
+    if vendor_libraries:
+        print(f"Known libraries summarised, not analysed: {sum(vendor_libraries.values())} files ("
+              + ", ".join(f"{name} x{count}" for name, count in vendor_libraries.most_common()) + ")")
+    minified_files = sum(1 for f in all_findings if f.category == 'Minified')
+    if minified_files:
+        print(f"Minified/bundled files counted, not analysed: {minified_files}")
+    oversized_files = sum(1 for f in all_findings if f.category == 'Oversized')
+    if oversized_files:
+        print(f"Files over {config.max_file_size_mb} MB scanned in windows, not parsed: {oversized_files}")
     print(f"Total findings: {len(all_findings)}")
+    if ajax_scans:
+        print(f"AJAX regex scans avoided by the literal prefilter: {ajax_scans_avoided} of {ajax_scans}")
+    if parse_tiers[TIER_TRIAGE] or parse_tiers[TIER_DOM]:
+        parsed = sum(parse_tiers.values())
+        print("Parse tiers: " + ", ".join(f"{TIER_LABELS[tier]} {parse_tiers[tier]} ({parse_tiers[tier] / parsed:.0%})"
+                                          for tier in PARSE_TIERS if parse_tiers[tier]))
+    if decode_strategies:
+        print("Encoding decisions: " + ", ".join(f"{name} {count}" for name, count in decode_strategies.most_common()))
 
     # 4. Reporting
-    print("\n[Phase 3] Generating Report...")
+    print("\n[Phase 2] Generating Report...")
     if all_findings:
         try:
             reporter = Reporter(config, all_findings)
@@ -148,6 +252,29 @@ def run_static_scan(config):
     else:
         print("No inline code findings detected. Skipping report generation.")
 
+    if depth:
+        write_depth_report(config, depth)
+
+def write_depth_report(config, depth):
+    """Application Depth Tracker from the Depth Analyser entries collected during the scan."""
+    if DepthReporter is None:
+        logging.error("The depth report needs pandas (pip install -r repo_depth_analyser/requirements.txt).")
+        print("Depth report skipped: pandas is not installed.")
+        return
+    inventory, dir_stats, ajax_details = depth.file_inventory, depth.directory_stats, depth.ajax_details
+    if not inventory:
+        print("No files for the depth report.")
+        return
+    try:
+        report_file = DepthReporter(config.output_folder).generate_report(inventory, dir_stats, ajax_details)
+    except Exception as e:
+        logging.error(f"Failed to generate depth report: {e}")
+        report_file = None
+    if report_file:
+        print(f"- {os.path.basename(report_file)} ({len(inventory)} files in {len(dir_stats)} folders)")
+    else:
+        print("Failed to generate depth report. Check logs.")
+
 def run_extraction(config):
     print("\n[Phase: Extraction]")
     print(f"Logic: SELECTIVE extraction based on Master Tracker assessment.")
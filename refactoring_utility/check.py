@@ -1,9 +1,13 @@
 import os
-import re
+import sys
 import argparse
 from openpyxl import Workbook
 from openpyxl.styles import PatternFill, Font, Alignment
 
+# Helpers shared with RepoScan-Analyser live at the repository root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from reposcan_shared import patterns
+
 def parse_metadata(filename):
     """
     Parses original file info from the extracted filename.
@@ -13,7 +17,7 @@ def parse_metadata(filename):
     try:
         # Match the standard format defined in the tool
         # Example: Views_Home_Index_cshtml_scriptblock_L10-L25.js
-        match = re.search(r'(.+)_([a-zA-Z0-9]+)_L(\d+)-L(\d+)\.(js|css)$', filename)
+        match = patterns.get('extracted_filename').search(filename)
         if match:
             sanitized, code_type, start, end, ext = match.groups()
             # Best effort to restore path readability (replace underscores with slashes)
@@ -30,22 +34,8 @@ def get_refactorability(filename, content):
     Returns: (Status, Complexity, Reason, Action)
     """
     # 1. Critical Blockers: Server-Side Syntax
-    server_patterns = [
-        (r'<%', 'ASP.NET/Classic ASP tags detected'),
-        (r'@Model', 'Razor Model syntax detected'),
-        (r'@ViewBag', 'Razor ViewBag syntax detected'),
-        (r'@ViewData', 'Razor ViewData syntax detected'),
-        (r'@Url\.Action', 'Razor Url.Action detected'),
-        (r'@Url\.Content', 'Razor Url.Content detected'),
-        (r'<%\s', 'Classic ASP block detected'),
-        (r'<%:', 'ASP.NET Output detected'),
-        (r'\{\{', 'Potential Template Syntax ({{) detected'),
-        (r'\bResponse\.Write\b', 'Server-side Response.Write detected'),
-        (r'\bRequest\.Form\b', 'Server-side Request.Form detected')
-    ]
-    
-    for pattern, reason in server_patterns:
-        if re.search(pattern, content):
+    for pattern, reason in patterns.server_dependencies():
+        if pattern.search(content):
             return "Blocked", "Low", f"Contains server-side logic: {reason}", "NOT MOVED - Requires Manual Fix"
 
     # 2. Medium Complexity: Event Handlers and DOM Dependency
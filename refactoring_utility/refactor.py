@@ -1,8 +1,12 @@
 import os
-import re
+import sys
 import argparse
 import shutil
 
+# Helpers shared with RepoScan-Analyser live at the repository root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from reposcan_shared import patterns
+
 def parse_extracted_filename(filename):
     """
     Parses metadata from filename:
@@ -13,7 +17,7 @@ def parse_extracted_filename(filename):
         # Regex to find the _lineX-Y part
         # Updated to match user convention: _L{Start}-L{End}
         # e.g. Views_Home_Index_cshtml_scriptblock_L10-L25.js
-        match = re.search(r'(.+)_([a-zA-Z0-9]+)_L(\d+)-L(\d+)\.(js|css)$', filename)
+        match = patterns.get('extracted_filename').search(filename)
         if not match:
             return None
             
@@ -124,13 +128,7 @@ def is_safe_code(content):
     """
     Checks if code contains server-side logic that cannot be externalized.
     """
-    server_patterns = [
-        r'<%', r'@Model', r'@ViewBag', r'@ViewData', r'\{\{', r'\bResponse\.Write\b'
-    ]
-    for pattern in server_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            return False
-    return True
+    return patterns.get('server_dependency').search(content) is None
 
     # 3. Process Files (The Copy)
     for rel_path, mods in modifications.items():
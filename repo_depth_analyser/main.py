@@ -1,10 +1,12 @@
 import argparse
+import multiprocessing
 import os
 import sys
 import time
 from datetime import datetime
 from src.scanner import Scanner
 from src.reporter import Reporter
+from reposcan_shared.ajax_patterns import ajax_prefilter
 
 def get_banner():
     """Generate professional branded banner string"""
@@ -46,6 +48,7 @@ SCAN SUMMARY:
   Lines of Code:            {summary_stats.get('total_lines', 0):,}
 
   AJAX Calls Detected:      {summary_stats.get('ajax_calls', 0):,}
+  AJAX Regex Scans Avoided: {summary_stats.get('ajax_scans_avoided', 0):,} of {summary_stats.get('ajax_scans', 0):,} (literal prefilter)
   Inline CSS:               {summary_stats.get('inline_css', 0):,}
   Inline JS:                {summary_stats.get('inline_js', 0):,}
   Internal Style Blocks:    {summary_stats.get('internal_css', 0):,}
@@ -84,9 +87,17 @@ def main():
         parser = argparse.ArgumentParser(description="RepoScan - Application Depth Analyser")
         parser.add_argument('path', help="Path to the target directory to scan")
         parser.add_argument('--output', help="Path to output directory", default='output')
+        parser.add_argument('--discovery-threads', type=int, default=1,
+                            help="Folders listed concurrently during discovery (raise to 16-32 on network shares)")
+        parser.add_argument('--engine', choices=['process', 'thread'], default='process',
+                            help="Analyse files on a process pool (default) or on 10 threads")
+        parser.add_argument('--workers', type=int, default=0,
+                            help="Analysis processes for the process engine (0 = one per CPU)")
         args = parser.parse_args()
         target_path = args.path
         output_path = args.output
+        discovery_threads = args.discovery_threads
+        engine, workers = args.engine, args.workers
     else:
         # Interactive Mode
         print("Enter the full path of the code folder to scan:")
@@ -95,6 +106,8 @@ def main():
         output_path = input("> ").strip()
         if not output_path:
             output_path = 'output'
+        discovery_threads = 1
+        engine, workers = 'process', 0
     
     # Clean paths
     target_path = os.path.abspath(target_path)
@@ -124,12 +137,13 @@ Starting scan...
     print("=" * 66)
     
     # Initialize components
-    scanner = Scanner(target_path)
+    scanner = Scanner(target_path, discovery_threads=discovery_threads, engine=engine, workers=workers)
     reporter = Reporter(output_path)
     
     # Run scan
     print("\nAnalyzing codebase structure...")
     inventory, dir_stats, ajax_details = scanner.scan(verbose=verbose)
+    print(f"  Analysis: {scanner.worker_times.elapsed:.2f} seconds, {scanner.worker_times.summary()}")
     
     if not inventory:
         print("\nWarning: No files found to report.")
@@ -150,6 +164,7 @@ Starting scan...
     internal_js = sum(item.get('Internal_Script_Blocks_Count', 0) for item in inventory)
     external_css = sum(item.get('External_Stylesheet_Links_Count', 0) for item in inventory)
     external_js = sum(item.get('External_Script_Tags_Count', 0) for item in inventory)
+    ajax_scans, ajax_scans_avoided, _ = ajax_prefilter().stats.snapshot()
     
     summary_stats = {
         'total_files': total_files,
@@ -162,7 +177,9 @@ Starting scan...
         'internal_css': internal_css,
         'internal_js': internal_js,
         'external_css': external_css,
-        'external_js': external_js
+        'external_js': external_js,
+        'ajax_scans': ajax_scans,
+        'ajax_scans_avoided': ajax_scans_avoided
     }
     
     # Generate Report
@@ -178,4 +195,7 @@ Starting scan...
         if len(sys.argv) <= 1: input("Press Enter to exit...")
 
 if __name__ == "__main__":
+    # In the frozen RepoScan exe, pool workers start by re-running this
+    # script; freeze_support() turns them into workers before main() runs
+    multiprocessing.freeze_support()
     main()
@@ -1,14 +1,131 @@
 import os
+import sys
+import mmap
+import time
+import threading
 import collections
-import re
 import concurrent.futures
 
+# Helpers shared with RepoScan-Analyser live at the repository root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from reposcan_shared.lineindex import LineIndex
+from reposcan_shared.walker import walk
+from reposcan_shared import patterns
+from reposcan_shared.ajax_patterns import ajax_prefilter, classify_ajax_match, find_ajax_calls
+from reposcan_shared.windowed import WindowedScan
+from reposcan_shared.scheduling import WorkerTimes, plan_tasks
+
+# Files from this size on are never decoded into one str: web files are
+# scanned one window at a time (reposcan_shared.windowed) with the bytes
+# form of the patterns, other files have their lines counted on a memory map
+MMAP_THRESHOLD = 10 * 1024 * 1024
+LINE_COUNT_CHUNK = 1024 * 1024
+
+# Relevant Extensions for Client-Side Code (other files only have their lines counted)
+WEB_EXTENSIONS = {
+    '.html', '.htm', '.aspx', '.ascx', '.cshtml', '.vbhtml', '.master',
+    '.php', '.jsp', '.js', '.ts', '.vue', '.jsx', '.tsx', '.razor',
+    '.cs', '.vb', '.ashx', '.asmx', '.config'
+}
+
+# Analysis engines: 'process' analyses tasks of up to TASK_SIZE files and
+# TASK_BYTES bytes on a process pool (the regex work holds the GIL, so
+# threads barely overlap), 'thread' runs one task per file on
+# THREAD_WORKERS threads. Both start the largest files first
+ENGINES = ('process', 'thread')
+TASK_SIZE = 256
+TASK_BYTES = 4 * 1024 * 1024
+THREAD_WORKERS = 10
+
+# One Scanner per worker process, built by the pool initializer so that
+# every worker compiles its patterns exactly once
+_worker_scanner = None
+
+# Running totals of a folder none of whose files could be analysed
+EMPTY_DIRECTORY = {'count': 0, 'lines': 0, 'inline_js': 0, 'inline_css': 0, 'ajax_calls': 0}
+
+
+def _init_worker(target_dir):
+    global _worker_scanner
+    _worker_scanner = Scanner(target_dir)
+
+
+def _process_task(items):
+    """
+    Pool task: analyses (root, file, size) items; returns (root, result)
+    pairs, the worker's AJAX prefilter counts and (pid, busy seconds).
+    """
+    start = time.perf_counter()
+    stats = ajax_prefilter().stats
+    before = stats.snapshot()
+    results = []
+    for root, file, _ in items:
+        try:
+            results.append((root, _worker_scanner.process_file(root, file)))
+        except Exception as exc:
+            results.append((root, exc))
+    after = stats.snapshot()
+    return results, tuple(a - b for a, b in zip(after, before)), (os.getpid(), time.perf_counter() - start)
+
+
+class ScanProgress:
+    """
+    Verbose progress: a status line of files done, redrawn at most every
+    `interval` seconds, and a line per folder as soon as its last file is
+    in, with totals read from the folder's running stats.
+    """
+    def __init__(self, target_dir, all_files, stream=None, interval=0.2):
+        self.target_dir = target_dir
+        self.stream = stream or sys.stdout
+        self.interval = interval
+        self.total = len(all_files)
+        self.remaining = collections.Counter(root for root, _, _ in all_files)  # Files still to come per folder
+        self.folders = len(self.remaining)
+        self.done = 0
+        self.folders_done = 0
+        self._drawn = 0.0
+
+    def file_done(self, root, stats):
+        self.done += 1
+        self.remaining[root] -= 1
+        if not self.remaining[root]:
+            self.folders_done += 1
+            self._clear()
+            self.stream.write(f"  {relative_dir(root, self.target_dir)}\n"
+                              f"    Files: {stats['count']} | JS: {stats['inline_js']} | "
+                              f"CSS: {stats['inline_css']} | AJAX: {stats['ajax_calls']}\n")
+        now = time.monotonic()
+        if now - self._drawn >= self.interval or self.done == self.total:
+            self._drawn = now
+            self.stream.write(f"\r  [{self.done:,}/{self.total:,} files | {self.folders_done:,}/{self.folders:,} folders]")
+            self.stream.flush()
+
+    def message(self, text):
+        """Prints a line above the status line."""
+        self._clear()
+        self.stream.write(text + "\n")
+
+    def finish(self):
+        self._clear()
+        self.stream.flush()
+
+    def _clear(self):
+        self.stream.write("\r" + " " * 66 + "\r")
+
 
 class Scanner:
-    def __init__(self, target_dir):
+    def __init__(self, target_dir, discovery_threads=1, engine='process', workers=0, largest_first=True):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}' (expected one of: {', '.join(ENGINES)})")
         self.target_dir = os.path.abspath(target_dir)
+        self.discovery_threads = discovery_threads  # Concurrent folder listings (1 = sequential)
+        self.engine = engine
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)  # Analysis processes (engine 'process')
+        self.largest_first = largest_first  # Start the largest files first (False = walk order)
+        self.worker_times = WorkerTimes(1)  # Busy/idle per analysis worker in the last scan
         self.file_inventory = []
-        self.directory_stats = collections.defaultdict(lambda: {'count': 0, 'lines': 0})
+        self.directory_stats = collections.defaultdict(lambda: dict(EMPTY_DIRECTORY))
+        self.ajax_details = []
         
         # Folders to exclude (dependencies, build outputs, version control)
         # Folders to exclude (dependencies, build outputs, version control)
@@ -18,461 +135,38 @@ class Scanner:
             '__pycache__', '.pytest_cache', '.venv', 'venv', 'env'
         }
         
-        # Compile Regex Patterns - Matching main utility's comprehensive detection
-        self.patterns = {
+        # Regex Patterns - shared with the main utility (compiled once per process)
+        self.patterns = {name: patterns.get(name) for name in (
             # 1. CSS Patterns
-            'inline_css': re.compile(r'style\s*=\s*["\'][^"\']*["\']', re.IGNORECASE),
-            'internal_style_blocks': re.compile(r'<style\b[^>]*>[\s\S]*?</style>', re.IGNORECASE),
-            'external_stylesheet_links': re.compile(
-                r'(?:<link\b[^>]*rel\s*=\s*["\']stylesheet["\'][^>]*>|@import\s+(?:url\()?["\'][^"\']+["\'])', 
-                re.IGNORECASE
-            ),
-
-            # 2. JS Patterns
-            'inline_js': re.compile(
-                r'(\bon\w+\s*=\s*["\'][^"\']*["\']|href=["\']\s*javascript:)', 
-                re.IGNORECASE
-            ),
-            'internal_script_blocks': re.compile(
-                r'<script\b(?![^>]*\bsrc=)[^>]*>[\s\S]*?</script>', re.IGNORECASE
-            ),
-            'external_script_tags': re.compile(
-                r'(?:<script\b[^>]*src\s*=\s*["\'][^"\']+["\'][^>]*>|\bimport\s+(?:[\w\s{},*]+from\s+)?["\'][^"\']+["\']|\brequire\s*\(\s*["\'][^"\']+["\']\s*\)|\bdefine\s*\(\s*\[)', 
-                re.IGNORECASE
-            ),
-            
-            # 2a. Modern CSS-in-JS
-            'css_in_js': re.compile(
-                r'(?:styled\.\w+|css`|styled\s*\()',
-                re.IGNORECASE
-            ),
-
-            # 3. AJAX / Network Calls
-            'ajax_call': re.compile(
-                r'(\bfetch\s*\(|'
-                r'new\s+XMLHttpRequest\s*\(|'
-                r'(?:\$|jQuery|axios|superagent|http)\s*\.\s*(?:ajax|get|post|getJSON|getScript|load|request|ajaxSetup|ajaxPrefilter|ajaxTransport|param|parseJSON)\s*\(|'
-                r'\.(?:load|ajaxStart|ajaxSend|ajaxSuccess|ajaxError|ajaxComplete|ajaxStop|serialize|serializeArray)\s*\(|'
-                r'\.open\s*\(\s*["\'](?:GET|POST|PUT|DELETE|PATCH)["\']|'
-                r'\bonreadystatechange\s*=|'
-                r'\.send\s*\(|'
-                r'\baxios(?:\.\w+)?\s*\(|'
-                r'new\s+WebSocket\s*\(|'
-                r'new\s+EventSource\s*\(|'
-                r'\bajax\s*:\s*function|'  # Object literal AJAX method definitions
-                r'navigator\.sendBeacon\s*\(|'  # Analytics/Tracking
-                r'new\s+ActiveXObject\s*\(|'    # Legacy IE
-                r'\bio\s*\(|'                   # Socket.io
-                r'HubConnectionBuilder|'        # SignalR
-                r'\bSys\.Net\.WebRequest\s*\(|' # Microsoft AJAX Library (Legacy)
-                r'\bPageMethods\.\w+\s*\(|'     # ASP.NET WebForms RPC
-                r'\b__doPostBack\s*\(|'         # ASP.NET Postback
-                r'\bSys\.WebForms\.PageRequestManager|' # UpdatePanel Manager
-                r'\bdata-ajax(?:-\w+)?\s*=|'    # Unobtrusive AJAX Attributes
-                r'\.setRequestHeader\s*\(|'     # XHR Header Config
-                r'\.abort\s*\(|'                # Request Cancellation
-                r'\.getResponseHeader\s*\(|'    # Header Inspection
-                r'\.getAllResponseHeaders\s*\(|'
-                r'new\s+Headers\s*\(|'          # Fetch API Headers
-                r'new\s+Request\s*\(|'          # Fetch API Request
-                r'\bJSON\.parse\s*\(|'          # Native JSON
-                r'\bJSON\.stringify\s*\(|'      # Native JSON
-                r'<\w+:UpdatePanel|'            # ASP.NET Partial Rendering
-                r'<\w+:ScriptManager|'          # ASP.NET AJAX Enabler
-                r'\bScriptManager\.RegisterStartupScript\s*\(|' # Server-Side Script Injection
-                r'\bScriptManager\.RegisterClientScriptBlock\s*\(|'
-                r'\bClientScript\.RegisterStartupScript\s*\(|'
-                r'\bClientScript\.RegisterClientScriptBlock\s*\(|'
-                r'\bPage\.ClientScript\s*\.|'
-                r'\[WebMethod\]|'               # ASP.NET AJAX Endpoint
-                r'\[ScriptMethod\]|'            # ASP.NET Script Service
-                r'\[WebService\]|'              # Legacy Web Service
-                r'\[OperationContract\]|'       # WCF
-                r'\[ApiController\]|'           # Web API 2 / Core
-                r'\[Route\(\s*["\']api/|'       # API Route
-                r'\[HubName\]|'                 # SignalR Hub
-                r'\bhubConnection\.start\s*\(|' # SignalR Client
-                r'\bClients\.All|'              # SignalR Server
-                r'\bClients\.Caller|'
-                r'@Ajax\.ActionLink|'           # Razor AJAX Helper
-                r'@Ajax\.BeginForm|'
-                r'@Url\.Action\s*\(|'           # URL Generation for AJAX
-                r'@Url\.Content\s*\(|'
-                r'<system\.web\.extensions>|'   # Web.config AJAX
-                r'<scriptResourceHandler>|'
-                r'<telerik:RadAjaxManager|'     # Telerik
-                r'<telerik:RadAjaxPanel|'
-                r'\bRadAjaxManager\b|'
-                r'\bASPxCallback|'              # DevExpress
-                r'\bASPxCallbackPanel|'
-                r'\$http\b|'                    # Angular 1.x / Vue Resource
-                r'\bthis\.http\.get\s*\(|'      # Angular HttpClient
-                r'\bthis\.http\.post\s*\(|'
-                r'\buseQuery\s*\(|'             # React/TanStack Query
-                r'\buseMutation\s*\(|'
-                r'\bnew\s+Ajax\.Request\s*\(|'  # Prototype.js
-                r'\bnew\s+Request(?:.JSON)?\s*\(|' # MooTools
-                r'\bdataType\s*:\s*["\']jsonp["\']|' # jQuery JSONP
-                r'\bResponse\.Write\s*\(\s*["\']<script|' # Server-Side Script Injection (Direct)
-                r'\bChannelFactory<|'           # WCF Client
-                r'\bHttpClient\s+|'             # Blazor / .NET HttpClient usage
-                r'\bIJSRuntime\b|'              # Blazor JS Interop
-                r'\[Http(?:Get|Post|Put|Delete|Patch|Options)\]|' # .NET API Attributes
-                r'\bbackgroundFetch\b|'         # Background Fetch API
-                r'\bIJSRuntime\b|'              # Blazor JS Interop
-                r'\[Http(?:Get|Post|Put|Delete|Patch|Options)\]|' # .NET API Attributes
-                r'\bbackgroundFetch\b|'         # Background Fetch API
-                r'target=["\']_?iframe["\']|'   # Hidden Iframe Target (Naive)
-                r'<iframe\b[^>]*style=["\'].*display:\s*none|' # Hidden Iframe (Structure)
-                r'<iframe\b[^>]*style=["\'].*display:\s*none|' # Hidden Iframe (Structure)
-                r'\bnew\s+FormData\b|'          # Form Data Constructor
-                r'\bnew\s+Image\s*\(|'          # Pixel Tracking (Image)
-                r'\.src\s*=\s*["\']http)',      # Pixel Tracking (src assignment)
-                re.IGNORECASE
-            ),
-
+            'inline_css', 'internal_style_blocks', 'external_stylesheet_links',
+            # 2. JS Patterns (2a. Modern CSS-in-JS)
+            'inline_js', 'internal_script_blocks', 'external_script_tags', 'css_in_js',
             # 4. JS Loading CSS or JS (Dynamic)
-            'dynamic_js': re.compile(
-                r'(\.src\s*=\s*["\'][^"\']+\.js["\']|'
-                r'document\.createElement\s*\(\s*["\']script["\']\s*\)|'
-                r'\.appendChild\s*\(|'
-                r'\.insertBefore\s*\(|'
-                r'eval\s*\(|'
-                r'new\s+Function\s*\(|'
-                r'setTimeout\s*\(|'
-                r'setInterval\s*\(|'
-                r'import\s*\(|'
-                r'System\.import\s*\(|'
-                r'require\s*\(|'
-                r'innerHTML\s*=|'
-                r'outerHTML\s*=|'
-                r'insertAdjacentHTML\s*\(|'
-                r'document\.write\s*\()',
-                re.IGNORECASE
-            ),
-            'dynamic_css': re.compile(
-                r'(\.src\s*=\s*["\'][^"\']+\.css["\']|'
-                r'document\.createElement\s*\(\s*["\']style["\']\s*\)|'
-                r'document\.createElement\s*\(\s*["\']link["\']\s*\)|'
-                r'\.rel\s*=\s*["\']stylesheet["\']|'
-                r'\.href\s*=\s*["\'][^"\']+\.css["\']|'
-                r'\.style\.\w+\s*=|'
-                r'\.style\[\s*["\'][^"\']+["\']\s*\]\s*=|'
-                r'\.cssText\s*=|' # Bulk Style Assignment
-                r'setProperty\s*\(|'
-                r'insertRule\s*\(|'
-                r'addRule\s*\(|'
-                r'setAttribute\s*\(\s*["\']style["\']|' # Dynamic Style Attribute
-                r'\.classList\.(?:add|remove|toggle|replace)\s*\(|' # Indirect CSS
-                r'new\s+CSSStyleSheet\s*\(|'
-                r'adoptedStyleSheets)',
-                re.IGNORECASE
-            )
-        }
+            'dynamic_js', 'dynamic_css',
+        )}
+        self.byte_patterns = {name: patterns.get_bytes(name) for name in self.patterns}
 
     def count_lines_and_analyze(self, filepath):
         """Counts lines and scans for complexity metrics."""
-        metrics = {
-            'lines': 0,
-            'inline_css': 0, 'internal_style_blocks': 0, 'external_stylesheet_links': 0,
-            'inline_js': 0, 'internal_script_blocks': 0, 'external_script_tags': 0,
-            'ajax_calls': 0, 'has_ajax_calls': 'No', 'dynamic_js': 0, 'dynamic_css': 0,
-            'ajax_details': []
-        }
+        metrics = new_metrics()
         
         _, ext = os.path.splitext(filepath)
         ext = ext.lower()
         
-        # Relevant Extensions for Client-Side Code
-        web_exts = {
-            '.html', '.htm', '.aspx', '.ascx', '.cshtml', '.vbhtml', '.master', 
-            '.php', '.jsp', '.js', '.ts', '.vue', '.jsx', '.tsx', '.razor',
-            '.cs', '.vb', '.ashx', '.asmx', '.config'
-        }
-        
         try:
-            # Skip very large files (> 10MB) to prevent memory issues
             file_size = os.path.getsize(filepath)
-            if file_size > 10 * 1024 * 1024:  # 10MB limit
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    metrics['lines'] = sum(1 for _ in f)
+            if file_size >= MMAP_THRESHOLD:
+                with open(filepath, 'rb') as f:
+                    if ext in WEB_EXTENSIONS:
+                        # Read window by window: mapped pages would add the whole file to the RSS
+                        self._analyze_windows(f, metrics)
+                    else:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                            metrics['lines'] = count_newlines(mapped) + 1
                 return metrics
             
             with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                metrics['lines'] = content.count('\n') + 1  # Faster than splitlines()
-                
-                # Only analyze web-related files for Client-Side patterns
-                if ext in web_exts:
-                    # Run Regex Analysis
-                    metrics['inline_css'] = len(self.patterns['inline_css'].findall(content))
-                    metrics['internal_style_blocks'] = len(self.patterns['internal_style_blocks'].findall(content))
-                    metrics['external_stylesheet_links'] = len(self.patterns['external_stylesheet_links'].findall(content))
-                    metrics['inline_js'] = len(self.patterns['inline_js'].findall(content))
-                    metrics['internal_script_blocks'] = len(self.patterns['internal_script_blocks'].findall(content))
-                    metrics['external_script_tags'] = len(self.patterns['external_script_tags'].findall(content))
-                    
-                    # Detailed AJAX Analysis
-                    ajax_matches = self.patterns['ajax_call'].finditer(content)
-                    for match in ajax_matches:
-                        # metrics['ajax_calls'] += 1  <-- REMOVED: Only increment for Logical Requests
-                        line_num = content.count('\n', 0, match.start()) + 1
-                        match_str = match.group()
-                        
-                        # Determine Capability & CSP Directive
-                        capability = "Data Exchange"
-                        csp = "connect-src"
-                        difficulty = "Easy"
-                        
-                        lower_match = match_str.lower()
-                        
-                        # Determine Category and Capability
-                        category = "Request" # Default
-                        capability = "Data Exchange" # Default
-                        is_logical_request = True
-                        difficulty = "Easy"
-
-                        if 'sendbeacon' in lower_match:
-                            capability = "Telemetry"
-                            category = "Request"
-                        elif 'getscript' in lower_match or '.js' in lower_match:
-                            capability = "Script Loading (Dynamic)"
-                            category = "Request"
-                            difficulty = "Hard"
-                        elif '.css' in lower_match:
-                            capability = "CSS Loading"
-                            category = "Request"
-                            difficulty = "Medium"
-                        elif '.html' in lower_match:
-                            capability = "UI Injection"
-                            category = "Request"
-                            difficulty = "Medium"
-                        elif 'load' in lower_match and 'payload' not in lower_match: 
-                            capability = "UI Injection (Likely)"
-                            category = "Request"
-                            difficulty = "Medium"
-                        elif any(x in lower_match for x in ['ajaxsetup', 'ajaxprefilter', 'ajaxtransport']):
-                            capability = "AJAX Configuration"
-                            category = "Config"
-                            is_logical_request = False
-                            difficulty = "Easy"
-                        elif any(x in lower_match for x in ['ajaxstart', 'ajaxsend', 'ajaxsuccess', 'ajaxerror', 'ajaxcomplete', 'ajaxstop', 'onreadystatechange']):
-                            capability = "Global Event Handler"
-                            category = "Event"
-                            is_logical_request = False
-                            difficulty = "Hard (Refactoring Risk)"
-                        elif any(x in lower_match for x in ['serialize', 'param', 'parsejson']):
-                            capability = "Form/Data Utility"
-                            category = "Utility"
-                            is_logical_request = False
-                            difficulty = "Easy"
-                        elif 'sys.net.webrequest' in lower_match:
-                             capability = "Data Exchange (Legacy)"
-                             category = "Request"
-                             difficulty = "Hard"
-                        elif 'pagemethods' in lower_match:
-                             capability = "RPC (Code-Behind)"
-                             category = "Request"
-                             difficulty = "Hard"
-                        elif '__dopostback' in lower_match:
-                             capability = "Partial Postback"
-                             category = "Request"
-                             difficulty = "Medium"
-                        elif 'data-ajax' in lower_match:
-                             capability = "Declarative AJAX"
-                             category = "Request"
-                             difficulty = "Easy"
-                        elif 'sys.webforms' in lower_match:
-                             capability = "UpdatePanel Config"
-                             category = "Config"
-                             is_logical_request = False
-                             difficulty = "Hard"
-                        elif any(x in lower_match for x in ['setrequestheader', 'getresponseheader', 'getallresponseheaders']):
-                             capability = "Request Header Manipulation"
-                             category = "Config"
-                             is_logical_request = False
-                             difficulty = "Medium"
-                        elif 'abort' in lower_match:
-                             capability = "Request Control"
-                             category = "Utility"
-                             is_logical_request = False
-                             difficulty = "Easy"
-                        elif 'json.parse' in lower_match or 'json.stringify' in lower_match:
-                             capability = "JSON Utility"
-                             category = "Utility"
-                             is_logical_request = False
-                             difficulty = "Easy"
-                        elif 'new headers' in lower_match or 'new request' in lower_match:
-                             capability = "Fetch API Construct"
-                             category = "Construct"
-                             is_logical_request = False
-                             difficulty = "Easy"
-                        elif 'updatepanel' in lower_match:
-                             capability = "Partial Rendering (UpdatePanel)"
-                             category = "Request"
-                             difficulty = "Hard"
-                        elif 'scriptmanager' in lower_match or 'clientscript' in lower_match:
-                             capability = "Server-Side Script Injection"
-                             category = "Server"
-                             is_logical_request = False
-                             difficulty = "Hard"
-                        elif 'webmethod' in lower_match or 'scriptmethod' in lower_match or 'webservice' in lower_match:
-                             capability = "AJAX Endpoint (Server)"
-                             category = "Server"
-                             is_logical_request = False
-                             difficulty = "Medium"
-                        elif 'apicontroller' in lower_match or '[route' in lower_match:
-                             capability = "API Endpoint (Server)"
-                             category = "Server"
-                             is_logical_request = False
-                             difficulty = "Medium"
-                        elif 'operationcontract' in lower_match:
-                             capability = "WCF Endpoint (Server)"
-                             category = "Server"
-                             is_logical_request = False
-                             difficulty = "Hard"
-                        elif 'hubname' in lower_match or 'clients.all' in lower_match or 'clients.caller' in lower_match:
-                             capability = "SignalR Hub (Server)"
-                             category = "Server"
-                             is_logical_request = False
-                             difficulty = "Hard"
-                        elif 'hubconnection' in lower_match:
-                             capability = "SignalR Client"
-                             category = "Real-time"
-                             is_logical_request = True
-                             difficulty = "Medium"
-                        elif '@ajax' in lower_match:
-                             capability = "Razor AJAX Helper"
-                             category = "Request"
-                             is_logical_request = True
-                             difficulty = "Medium"
-                        elif '@url' in lower_match:
-                             capability = "Dynamic URL Generation"
-                             category = "Construct"
-                             # Helper itself isn't a request, but often inside one. Let's mark as Construct.
-                             is_logical_request = False 
-                             difficulty = "Easy"
-                        elif '<system.web.extensions>' in lower_match or 'scriptresourcehandler' in lower_match:
-                             capability = "AJAX Configuration"
-                             category = "Config"
-                             is_logical_request = False
-                             difficulty = "Medium"
-                        elif 'radajax' in lower_match or 'telerik' in lower_match:
-                             capability = "Telerik AJAX Control"
-                             category = "Third-Party"
-                             is_logical_request = True # Often wrappers around UpdatePanel
-                             difficulty = "Hard (Vendor Lock-in)"
-                        elif 'aspxcallback' in lower_match:
-                             capability = "DevExpress AJAX Control"
-                             category = "Third-Party"
-                             is_logical_request = True
-                             difficulty = "Hard (Vendor Lock-in)"
-
-                        elif 'response.write' in lower_match:
-                             capability = "Direct Script Injection"
-                             category = "Server"
-                             is_logical_request = False
-                             difficulty = "High (Security Risk)"
-                        elif 'channelfactory' in lower_match:
-                             capability = "WCF Client Proxy"
-                             category = "Server"
-                             is_logical_request = True # It initiates a request
-                             difficulty = "Hard"
-                        elif 'httpclient' in lower_match:
-                             capability = ".NET HttpClient"
-                             category = "Server/Blazor"
-                             is_logical_request = True
-                             difficulty = "Easy"
-                        elif 'ijsruntime' in lower_match:
-                             capability = "Blazor JS Interop"
-                             category = "Blazor"
-                             is_logical_request = False
-                             difficulty = "Medium"
-                        elif '[http' in lower_match:
-                             capability = "API Endpoint Verb"
-                             category = "Server"
-                             is_logical_request = False
-                             difficulty = "Easy"
-                        elif 'backgroundfetch' in lower_match:
-                             capability = "Background Sync/Fetch"
-                             category = "Service Worker"
-                             is_logical_request = True
-                             difficulty = "Medium"
-                        elif 'iframe' in lower_match:
-                             capability = "Hidden Iframe (Pseudo-AJAX)"
-                             category = "Legacy Pattern"
-                             is_logical_request = True
-                             difficulty = "Hard"
-                        elif 'formdata' in lower_match:
-                             capability = "Form Data Construction"
-                             category = "Construct"
-                             # It's usually passed TO a fetch or XHR, so it's a Construct, not a request itself.
-                             is_logical_request = False
-                             difficulty = "Easy"
-                        elif 'new image' in lower_match or '.src' in lower_match:
-                             capability = "Pixel Tracking (Image)"
-                             category = "Request"
-                             is_logical_request = True
-                             difficulty = "Easy"
-                        elif 'usequery' in lower_match or 'usemutation' in lower_match:
-                             capability = "Modern Data Fetching (React Query)"
-                             category = "Modern Framework"
-                             is_logical_request = True
-                             difficulty = "Easy"
-                        elif 'this.http' in lower_match:
-                             capability = "Angular HttpClient"
-                             category = "Modern Framework"
-                             is_logical_request = True
-                             difficulty = "Easy"
-                        elif 'ajax.request' in lower_match or 'new request' in lower_match: # carefully distinguishing MooTools/Prototype
-                             if 'ajax.request' in lower_match:
-                                 capability = "Prototype.js AJAX"
-                                 category = "Legacy Lib"
-                             else:
-                                 capability = "MooTools/Fetch Request" # 'new Request' is also Fetch API!
-                                 if 'mootools' in lower_match: category = "Legacy Lib" # unlikely to match just 'mootools' string here
-                                 else: category = "Construct" # Assume Fetch API unless context proves otherwise
-                             is_logical_request = True
-                             difficulty = "Hard"
-                        elif 'jsonp' in lower_match:
-                             capability = "JSONP (Legacy Cross-Domain)"
-                             category = "Legacy Pattern"
-                             is_logical_request = True
-                             difficulty = "Hard (Security Risk)"
-                        elif 'new xmlhttprequest' in lower_match or '.open' in lower_match:
-                             capability = "XHR Construct"
-                             category = "Construct"
-                             is_logical_request = False
-                        elif 'new websocket' in lower_match or 'new eventsource' in lower_match:
-                             capability = "Real-time Construct"
-                             category = "Construct"
-                             # For these, the 'new' IS the request initiation effectively (connection open), so maybe keep as Logical?
-                             # ChatGPT said "Partial XHR Constructs... new XMLHttpRequest... .open... .send".
-                             # For WS, 'new WebSocket' opens the connection. 
-                             # But to be consistent with XHR, let's count it. But 'new XHR' is NOT a request.
-                             # Let's mark 'new' XHR as False.
-                             if 'xmlhttprequest' in lower_match: is_logical_request = False
-                             else: is_logical_request = True # WS/EventSource open immediately
-                        
-                        # Only increment total count if it's a logical request (Network Traffic)
-                        if is_logical_request:
-                             metrics['ajax_calls'] += 1
-
-                        metrics['ajax_details'].append({
-                            'Line': line_num,
-                            'Code_Snippet': match_str[:100], 
-                            'Category': category,
-                            'Capability': capability,
-                            'Difficulty': difficulty,
-                            'Is_Counted': "Yes" if is_logical_request else "No"
-                        })
-
-                    metrics['has_ajax_calls'] = "Yes" if metrics['ajax_calls'] > 0 else "No"
-                    metrics['dynamic_js'] = len(self.patterns['dynamic_js'].findall(content))
-                    metrics['dynamic_css'] = len(self.patterns['dynamic_css'].findall(content))
-                    
-                    # Add CSS-in-JS to Dynamic CSS count (it's effectively dynamic)
-                    metrics['dynamic_css'] += len(self.patterns['css_in_js'].findall(content))
+                self.analyze_text(f.read(), ext, metrics)
                 
         except (UnicodeDecodeError, PermissionError) as e:
             # Silently skip files with encoding or permission issues
@@ -482,122 +176,291 @@ class Scanner:
             
         return metrics
 
+    def analyze_text(self, content, ext, metrics=None):
+        """Metrics of a file's decoded text (ext in lower case); patterns only run on web files."""
+        metrics = metrics if metrics is not None else new_metrics()
+        metrics['lines'] = content.count('\n') + 1  # Faster than splitlines()
+        
+        # Only analyze web-related files for Client-Side patterns
+        if ext in WEB_EXTENSIONS:
+            self._analyze(content, metrics)
+        return metrics
+
+    def _analyze(self, content, metrics):
+        """Runs the pattern analysis over decoded text."""
+        pats = self.patterns
+        # Run Regex Analysis (counted without building match lists)
+        for name in ('inline_css', 'internal_style_blocks', 'external_stylesheet_links',
+                     'inline_js', 'internal_script_blocks', 'external_script_tags'):
+            metrics[name] = count_matches(pats[name], content)
+        
+        # Detailed AJAX Analysis
+        line_index = LineIndex(content)
+        for match in find_ajax_calls(content):  # Regex runs only near its literal anchors
+            self._record_ajax(metrics, line_index.line_of(match.start()), match)
+
+        metrics['has_ajax_calls'] = "Yes" if metrics['ajax_calls'] > 0 else "No"
+        metrics['dynamic_js'] = count_matches(pats['dynamic_js'], content)
+        metrics['dynamic_css'] = count_matches(pats['dynamic_css'], content)
+        
+        # Add CSS-in-JS to Dynamic CSS count (it's effectively dynamic)
+        metrics['dynamic_css'] += count_matches(pats['css_in_js'], content)
+
+    def _analyze_windows(self, stream, metrics):
+        """Same analysis over a large file's bytes, one window at a time (constant memory)."""
+        counts = collections.Counter()
+        scan = WindowedScan(stream, self.window_finders())
+        for hit in scan:
+            self.record_window_hit(metrics, counts, hit)
+        self.finish_window_metrics(metrics, counts, scan.lines)
+
+    def window_finders(self):
+        """Finders for a WindowedScan whose hits go to record_window_hit (the AJAX one is named 'ajax')."""
+        finders = {name: pattern.finditer for name, pattern in self.byte_patterns.items()}
+        finders['ajax'] = find_ajax_calls  # Literal prefilter, bytes form
+        return finders
+
+    def record_window_hit(self, metrics, counts, hit):
+        if hit.name == 'ajax':
+            self._record_ajax(metrics, hit.line, hit.match)
+        else:
+            counts[hit.name] += 1
+
+    def finish_window_metrics(self, metrics, counts, lines):
+        metrics['lines'] = lines
+        for name in ('inline_css', 'internal_style_blocks', 'external_stylesheet_links',
+                     'inline_js', 'internal_script_blocks', 'external_script_tags', 'dynamic_js'):
+            metrics[name] = counts[name]
+        metrics['has_ajax_calls'] = "Yes" if metrics['ajax_calls'] > 0 else "No"
+        metrics['dynamic_css'] = counts['dynamic_css'] + counts['css_in_js']
+
+    def _record_ajax(self, metrics, line_num, match):
+        """Classifies one AJAX match into metrics['ajax_details']."""
+        # metrics['ajax_calls'] += 1  <-- REMOVED: Only increment for Logical Requests
+        match_str = match.group()
+        if isinstance(match_str, bytes):
+            match_str = match_str.decode('utf-8', errors='ignore')
+        
+        # Determine Category and Capability (one table lookup on the matched alternative)
+        category, capability, difficulty, is_logical_request = classify_ajax_match(match)
+        
+        # Only increment total count if it's a logical request (Network Traffic)
+        if is_logical_request:
+             metrics['ajax_calls'] += 1
+
+        metrics['ajax_details'].append({
+            'Line': line_num,
+            'Code_Snippet': match_str[:100], 
+            'Category': category,
+            'Capability': capability,
+            'Difficulty': difficulty,
+            'Is_Counted': "Yes" if is_logical_request else "No"
+        })
+
     def process_file(self, root, file):
         """Worker function to process a single file."""
         file_path = os.path.join(root, file)
-        size_kb = os.path.getsize(file_path) / 1024
-        
-        # Get extension
-        _, ext = os.path.splitext(file)
-        if not ext:
-            ext = "(No Extension)"
+        return file_record(file_path, os.path.getsize(file_path), self.count_lines_and_analyze(file_path))
+
+    def _timed_process_file(self, root, file):
+        start = time.perf_counter()
+        try:
+            return self.process_file(root, file)
+        finally:
+            self.worker_times.add(threading.current_thread().name, time.perf_counter() - start)
+
+    def _analyse_threads(self, all_files):
+        """One future per file on a thread pool, submitted largest first; yields (root, result or exception) as they complete."""
+        if self.largest_first:
+            all_files = sorted(all_files, key=lambda item: item[2], reverse=True)
+        self.worker_times = WorkerTimes(min(THREAD_WORKERS, len(all_files)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=THREAD_WORKERS) as executor:
+            future_to_file = {executor.submit(self._timed_process_file, r, f): (r, f) for r, f, _ in all_files}
+            for future in concurrent.futures.as_completed(future_to_file):
+                root = future_to_file[future][0]
+                try:
+                    yield root, future.result()
+                except Exception as exc:
+                    yield root, exc
+
+    def _analyse_processes(self, all_files):
+        """
+        Tasks of up to TASK_SIZE files and TASK_BYTES bytes on a process
+        pool, largest first (see reposcan_shared.scheduling), yielded as
+        they complete. At most two tasks per worker are in flight, so memory
+        stays bounded however many files there are. With one worker the same
+        plan runs in this process.
+        """
+        if self.largest_first:
+            tasks = plan_tasks(all_files, lambda item: item[2], TASK_SIZE, TASK_BYTES)
         else:
-            ext = ext.lower()
-            
-        # Analyze File
-        metrics = self.count_lines_and_analyze(file_path)
-        
-        return {
-            'root': root,
-            'file': file,
-            'ext': ext,
-            'size_kb': size_kb,
-            'metrics': metrics,
-            'file_path': file_path
-        }
+            tasks = [all_files[i:i + TASK_SIZE] for i in range(0, len(all_files), TASK_SIZE)]
+        self.worker_times = WorkerTimes(min(self.workers, len(tasks)))
+
+        if self.workers == 1:
+            # No pool: the same plan, run in this process
+            for task in tasks:
+                for root, file, _ in task:
+                    try:
+                        yield root, self._timed_process_file(root, file)
+                    except Exception as exc:
+                        yield root, exc
+            return
+
+        stats = ajax_prefilter().stats
+        max_in_flight = self.workers * 2
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                    initargs=(self.target_dir,)) as executor:
+            pending = set()
+            for task in tasks:
+                if len(pending) >= max_in_flight:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    yield from self._task_results(done, stats)
+                pending.add(executor.submit(_process_task, task))
+            yield from self._task_results(concurrent.futures.as_completed(pending), stats)
+
+    def _task_results(self, futures, stats):
+        for future in futures:
+            results, counts, (worker, busy) = future.result()
+            stats.add(*counts)
+            self.worker_times.add(worker, busy)
+            yield from results
 
     def scan(self, verbose=False):
         """Walks the directory and collects metadata."""
         # Collect all files to scan
         all_files = []
-        for root, dirs, files in os.walk(self.target_dir):
-            # Filter out excluded directories (modifies dirs in-place)
-            dirs[:] = [d for d in dirs if d not in self.excluded_folders]
-            
-            for file in files:
-                all_files.append((root, file))
+        for listing in walk(self.target_dir, discovered_file,
+                            skip_dir=lambda entry: entry.name in self.excluded_folders,
+                            threads=self.discovery_threads):
+            for file, size in listing.files:
+                all_files.append((listing.path, file, size))
         
         if verbose:
-            print(f"\nFound {len(all_files):,} files in {len(set(r for r, f in all_files)):,} directories")
+            print(f"\nFound {len(all_files):,} files in {len(set(r for r, _, _ in all_files)):,} directories")
             print("\nScanning folders:")
             print("-" * 66)
                 
-        # Use ThreadPoolExecutor for concurrent scanning
-        results = []
-        processed_dirs = set()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_file = {executor.submit(self.process_file, r, f): (r, f) for r, f in all_files}
-            for future in concurrent.futures.as_completed(future_to_file):
-                try:
-                    data = future.result()
-                    results.append(data)
-                    
-                    # Verbose progress per folder
-                    if verbose and data['root'] not in processed_dirs:
-                        processed_dirs.add(data['root'])
-                        rel_dir = os.path.relpath(data['root'], self.target_dir)
-                        if rel_dir == '.':
-                            rel_dir = '(Root)'
-                        
-                        # Count elements in this directory
-                        dir_results = [r for r in results if r['root'] == data['root']]
-                        total_inline_js = sum(r['metrics']['inline_js'] for r in dir_results)
-                        total_inline_css = sum(r['metrics']['inline_css'] for r in dir_results)
-                        total_ajax = sum(r['metrics']['ajax_calls'] for r in dir_results)
-                        
-                        print(f"  {rel_dir}")
-                        print(f"    Files: {len(dir_results)} | JS: {total_inline_js} | CSS: {total_inline_css} | AJAX: {total_ajax}")
-                        
-                except Exception as exc:
-                    if verbose:
-                        print(f"  Warning: {exc}")
+        # Inventory, AJAX details and per-folder stats are updated as each file
+        # completes, so the progress display reads running totals in O(1)
+        processed = 0
+        progress = ScanProgress(self.target_dir, all_files) if verbose else None
+        analyse = self._analyse_processes if self.engine == 'process' else self._analyse_threads
+        start = time.perf_counter()
+        for root, item in analyse(all_files):
+            if isinstance(item, Exception):
+                if verbose:
+                    progress.message(f"  Warning: {item}")
+                stats = self.directory_stats.get(relative_dir(root, self.target_dir), EMPTY_DIRECTORY)
+            else:
+                processed += 1
+                stats = self.record(item)
+            if progress:
+                progress.file_done(root, stats)
+        self.worker_times.elapsed = time.perf_counter() - start
 
-        # Aggregate Results
-        all_ajax_details = []
-        
-        for item in results:
-            root = item['root']
-            rel_dir = os.path.relpath(root, self.target_dir)
-            if rel_dir == '.': rel_dir = '(Root)'
-            depth = 0 if rel_dir == '(Root)' else rel_dir.count(os.sep) + 1
-            
-            # Update Inventory
-            self.file_inventory.append({
-                'Directory': rel_dir,
-                'Filename': item['file'],
-                'Extension': item['ext'],
-                'Size_KB': round(item['size_kb'], 2),
-                'Line_Count': item['metrics']['lines'],
-                'Inline_CSS_Count': item['metrics']['inline_css'],
-                'Internal_Style_Blocks_Count': item['metrics']['internal_style_blocks'],
-                'External_Stylesheet_Links_Count': item['metrics']['external_stylesheet_links'],
-                'Inline_JS_Count': item['metrics']['inline_js'],
-                'Internal_Script_Blocks_Count': item['metrics']['internal_script_blocks'],
-                'External_Script_Tags_Count': item['metrics']['external_script_tags'],
-                'AJAX_Calls_Count': item['metrics']['ajax_calls'],
-                'Has_Ajax_Calls': item['metrics']['has_ajax_calls'],
-                'Dynamic_JS_Gen_Count': item['metrics']['dynamic_js'],
-                'Dynamic_CSS_Gen_Count': item['metrics']['dynamic_css'],
-                'Full_Path': item['file_path']
-            })
-            
-            # Collect AJAX Details
-            if item['metrics']['ajax_details']:
-                for detail in item['metrics']['ajax_details']:
-                    detail['File_Path'] = item['file_path']
-                    detail['Filename'] = item['file']
-                    all_ajax_details.append(detail)
-            
-            # Update Directory Stats
-            stats = self.directory_stats[rel_dir]
-            stats['count'] += 1
-            stats['lines'] += item['metrics']['lines']
-            stats['depth'] = depth
-            if 'extensions' not in stats:
-                stats['extensions'] = collections.defaultdict(int)
-            stats['extensions'][item['ext']] += 1
+        # Files complete out of walk order; the report lists them in walk order
+        position = {os.path.join(root, file): i for i, (root, file, _) in enumerate(all_files)}
+        self.file_inventory.sort(key=lambda row: position.get(row['Full_Path'], len(position)))
+        self.ajax_details.sort(key=lambda row: position.get(row['File_Path'], len(position)))
 
         if verbose:
+            progress.finish()
             print("-" * 66)
-            print(f"Processed {len(results):,} files\n")
-        return self.file_inventory, self.directory_stats, all_ajax_details
+            print(f"Processed {processed:,} files\n")
+        return self.file_inventory, self.directory_stats, self.ajax_details
+
+    def record(self, item):
+        """Adds one analysed file (see file_record) to the inventory, AJAX details and folder stats; returns the folder's stats."""
+        rel_dir = relative_dir(item['root'], self.target_dir)
+        metrics = item['metrics']
+        self.file_inventory.append({
+            'Directory': rel_dir,
+            'Filename': item['file'],
+            'Extension': item['ext'],
+            'Size_KB': round(item['size_kb'], 2),
+            'Line_Count': metrics['lines'],
+            'Inline_CSS_Count': metrics['inline_css'],
+            'Internal_Style_Blocks_Count': metrics['internal_style_blocks'],
+            'External_Stylesheet_Links_Count': metrics['external_stylesheet_links'],
+            'Inline_JS_Count': metrics['inline_js'],
+            'Internal_Script_Blocks_Count': metrics['internal_script_blocks'],
+            'External_Script_Tags_Count': metrics['external_script_tags'],
+            'AJAX_Calls_Count': metrics['ajax_calls'],
+            'Has_Ajax_Calls': metrics['has_ajax_calls'],
+            'Dynamic_JS_Gen_Count': metrics['dynamic_js'],
+            'Dynamic_CSS_Gen_Count': metrics['dynamic_css'],
+            'Full_Path': item['file_path']
+        })
+
+        # Collect AJAX Details
+        for detail in metrics['ajax_details']:
+            self.ajax_details.append(dict(detail, File_Path=item['file_path'], Filename=item['file']))
+
+        # Update Directory Stats
+        stats = self.directory_stats[rel_dir]
+        stats['count'] += 1
+        stats['lines'] += metrics['lines']
+        stats['inline_js'] += metrics['inline_js']
+        stats['inline_css'] += metrics['inline_css']
+        stats['ajax_calls'] += metrics['ajax_calls']
+        stats['depth'] = 0 if rel_dir == '(Root)' else rel_dir.count(os.sep) + 1
+        if 'extensions' not in stats:
+            stats['extensions'] = collections.defaultdict(int)
+        stats['extensions'][item['ext']] += 1
+        return stats
+
+
+def new_metrics():
+    return {
+        'lines': 0,
+        'inline_css': 0, 'internal_style_blocks': 0, 'external_stylesheet_links': 0,
+        'inline_js': 0, 'internal_script_blocks': 0, 'external_script_tags': 0,
+        'ajax_calls': 0, 'has_ajax_calls': 'No', 'dynamic_js': 0, 'dynamic_css': 0,
+        'ajax_details': []
+    }
+
+
+def file_record(file_path, size, metrics):
+    """A file's entry for Scanner.record (also what process_file returns)."""
+    root, file = os.path.split(file_path)
+    
+    # Get extension
+    _, ext = os.path.splitext(file)
+    if not ext:
+        ext = "(No Extension)"
+    else:
+        ext = ext.lower()
+    
+    return {
+        'root': root,
+        'file': file,
+        'ext': ext,
+        'size_kb': size / 1024,
+        'metrics': metrics,
+        'file_path': file_path
+    }
+
+
+def discovered_file(entry):
+    """Walk visitor: (name, size in bytes) from the listing's stat, the size ordering the analysis."""
+    try:
+        return entry.name, entry.stat().st_size
+    except OSError:
+        return entry.name, 0
+
+
+def relative_dir(root, target_dir):
+    """Folder name used in the report: relative to the target, '(Root)' for the target itself."""
+    rel_dir = os.path.relpath(root, target_dir)
+    return '(Root)' if rel_dir == '.' else rel_dir
+
+
+def count_matches(pattern, content):
+    """Number of matches of pattern in content (str, bytes or memory map)."""
+    return sum(1 for _ in pattern.finditer(content))
+
+
+def count_newlines(buffer, chunk=LINE_COUNT_CHUNK):
+    """Newlines in a bytes-like buffer, counted one chunk at a time."""
+    return sum(buffer[i:i + chunk].count(b'\n') for i in range(0, len(buffer), chunk))
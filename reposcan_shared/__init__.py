@@ -0,0 +1 @@
+# Helpers shared by RepoScan-Analyser (src/) and the Repo Depth Analyser (repo_depth_analyser/)
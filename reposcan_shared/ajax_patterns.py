@@ -0,0 +1,153 @@
+"""
+AJAX Classification Table
+
+Classifies matches of the AJAX "Giant Regex" (registered as 'ajax_call' /
+'ajax_call_groups' in reposcan_shared.patterns) for both RepoScan-Analyser
+and RepoScan Depth Analyser. Every alternative of the regex sits in a
+named group, and AJAX_CLASSIFICATION maps each group name to its
+classification, so a match is classified with a single match.lastgroup
+lookup instead of substring tests on the matched text.
+
+The scanning form 'ajax_call' has no capturing groups (they make a
+full-text scan with re roughly twice as slow); classify_ajax_match
+re-matches the named form at the hit position only.
+
+find_ajax_calls() runs 'ajax_call' behind a literal prefilter: the regex
+is only tried where one of AJAX_ANCHORS occurs, and text with no anchor
+at all is skipped outright.
+"""
+
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+from . import patterns
+from .prefilter import Anchor, LiteralPrefilter
+
+
+class AjaxClass(NamedTuple):
+    category: str
+    capability: str
+    difficulty: str
+    is_logical_request: bool  # Counted as a network request (vs. config, utility, construct)
+
+
+_DATA_EXCHANGE = AjaxClass("Request", "Data Exchange", "Easy", True)
+_UI_INJECTION = AjaxClass("Request", "UI Injection (Likely)", "Medium", True)
+_GLOBAL_EVENT = AjaxClass("Event", "Global Event Handler", "Hard (Refactoring Risk)", False)
+_DATA_UTILITY = AjaxClass("Utility", "Form/Data Utility", "Easy", False)
+_XHR_CONSTRUCT = AjaxClass("Construct", "XHR Construct", "Easy", False)
+_SIGNALR_CLIENT = AjaxClass("Real-time", "SignalR Client", "Medium", True)
+
+# Named group -> classification
+AJAX_CLASSIFICATION: Dict[str, AjaxClass] = {
+    'fetch': _DATA_EXCHANGE,
+    'xhr_new': _XHR_CONSTRUCT,
+    'lib_request': _DATA_EXCHANGE,
+    'lib_script': AjaxClass("Request", "Script Loading (Dynamic)", "Hard", True),
+    'lib_load': _UI_INJECTION,
+    'lib_config': AjaxClass("Config", "AJAX Configuration", "Easy", False),
+    'lib_utility': _DATA_UTILITY,
+    'dot_load': _UI_INJECTION,
+    'dot_event': _GLOBAL_EVENT,
+    'dot_utility': _DATA_UTILITY,
+    'xhr_open': _XHR_CONSTRUCT,
+    'xhr_event': _GLOBAL_EVENT,
+    'xhr_send': _DATA_EXCHANGE,
+    'axios': _DATA_EXCHANGE,
+    'realtime': AjaxClass("Construct", "Real-time Construct", "Easy", True),  # The connection opens immediately
+    'ajax_method': _DATA_EXCHANGE,
+    'beacon': AjaxClass("Request", "Telemetry", "Easy", True),
+    'activex': _DATA_EXCHANGE,
+    'socket_io': _DATA_EXCHANGE,
+    'signalr_builder': _SIGNALR_CLIENT,
+    'ms_ajax': AjaxClass("Request", "Data Exchange (Legacy)", "Hard", True),
+    'page_methods': AjaxClass("Request", "RPC (Code-Behind)", "Hard", True),
+    'postback': AjaxClass("Request", "Partial Postback", "Medium", True),
+    'prm': AjaxClass("Config", "UpdatePanel Config", "Hard", False),
+    'data_ajax': AjaxClass("Request", "Declarative AJAX", "Easy", True),
+    'xhr_header': AjaxClass("Config", "Request Header Manipulation", "Medium", False),
+    'xhr_abort': AjaxClass("Utility", "Request Control", "Easy", False),
+    'fetch_construct': AjaxClass("Construct", "Fetch API Construct", "Easy", False),
+    'json': AjaxClass("Utility", "JSON Utility", "Easy", False),
+    'update_panel': AjaxClass("Request", "Partial Rendering (UpdatePanel)", "Hard", True),
+    'script_injection': AjaxClass("Server", "Server-Side Script Injection", "Hard", False),
+    'web_method': AjaxClass("Server", "AJAX Endpoint (Server)", "Medium", False),
+    'wcf_endpoint': AjaxClass("Server", "WCF Endpoint (Server)", "Hard", False),
+    'api_endpoint': AjaxClass("Server", "API Endpoint (Server)", "Medium", False),
+    'signalr_hub': AjaxClass("Server", "SignalR Hub (Server)", "Hard", False),
+    'signalr_start': _SIGNALR_CLIENT,
+    'razor_ajax': AjaxClass("Request", "Razor AJAX Helper", "Medium", True),
+    # The helper itself isn't a request, but is often inside one
+    'razor_url': AjaxClass("Construct", "Dynamic URL Generation", "Easy", False),
+    'ajax_config': AjaxClass("Config", "AJAX Configuration", "Medium", False),
+    'telerik': AjaxClass("Third-Party", "Telerik AJAX Control", "Hard (Vendor Lock-in)", True),
+    'devexpress': AjaxClass("Third-Party", "DevExpress AJAX Control", "Hard (Vendor Lock-in)", True),
+    'angular_js': _DATA_EXCHANGE,
+    'angular': AjaxClass("Modern Framework", "Angular HttpClient", "Easy", True),
+    'react_query': AjaxClass("Modern Framework", "Modern Data Fetching (React Query)", "Easy", True),
+    'prototype': AjaxClass("Legacy Lib", "Prototype.js AJAX", "Hard", True),
+    # 'new Request' is also the Fetch API; assume Fetch unless context proves otherwise
+    'mootools': AjaxClass("Construct", "MooTools/Fetch Request", "Hard", True),
+    'jsonp': AjaxClass("Legacy Pattern", "JSONP (Legacy Cross-Domain)", "Hard (Security Risk)", True),
+    'response_write': AjaxClass("Server", "Direct Script Injection", "High (Security Risk)", False),
+    'wcf_client': AjaxClass("Server", "WCF Client Proxy", "Hard", True),
+    'http_client': AjaxClass("Server/Blazor", ".NET HttpClient", "Easy", True),
+    'blazor_interop': AjaxClass("Blazor", "Blazor JS Interop", "Medium", False),
+    'http_verb': AjaxClass("Server", "API Endpoint Verb", "Easy", False),
+    'background_fetch': AjaxClass("Service Worker", "Background Sync/Fetch", "Medium", True),
+    'hidden_iframe': AjaxClass("Legacy Pattern", "Hidden Iframe (Pseudo-AJAX)", "Hard", True),
+    # Usually passed TO a fetch or XHR, so it's a Construct, not a request itself
+    'form_data': AjaxClass("Construct", "Form Data Construction", "Easy", False),
+    'pixel': AjaxClass("Request", "Pixel Tracking (Image)", "Easy", True),
+}
+
+
+def classify_ajax_match(match: 're.Match') -> AjaxClass:
+    """Classification of an 'ajax_call' (or 'ajax_call_groups') match, on text or bytes."""
+    group = match.lastgroup
+    if not group:
+        named = patterns.get_bytes('ajax_call_groups') if isinstance(match.re.pattern, bytes) else patterns.get('ajax_call_groups')
+        group = named.match(match.string, match.start()).lastgroup
+    return AJAX_CLASSIFICATION[group]
+
+
+# Literal anchors of every 'ajax_call' alternative (see reposcan_shared.prefilter
+# for the rules). Keep in step with the alternatives in reposcan_shared/patterns.py.
+AJAX_ANCHORS: List[Anchor] = [
+    ('fetch', 0), ('xmlhttprequest', 'new'),
+    ('$', 0), ('jquery', 0), ('axios', 0), ('superagent', 0), ('http', 0),
+    ('load', 1), ('ajaxstart', 1), ('ajaxsend', 1), ('ajaxsuccess', 1), ('ajaxerror', 1),
+    ('ajaxcomplete', 1), ('ajaxstop', 1), ('serialize', 1),
+    ('open', 1), ('onreadystatechange', 0), ('send', 1),
+    ('websocket', 'new'), ('eventsource', 'new'), ('ajax', 0), ('navigator', 0),
+    ('activexobject', 'new'), ('io', 0), ('hubconnectionbuilder', 0), ('sys.net.webrequest', 0),
+    ('pagemethods.', 0), ('__dopostback', 0), ('sys.webforms.pagerequestmanager', 0), ('data-ajax', 0),
+    ('setrequestheader', 1), ('getresponseheader', 1), ('getallresponseheaders', 1), ('abort', 1),
+    ('headers', 'new'), ('request', 'new'), ('json.', 0),
+    (':updatepanel', 'tag'), (':scriptmanager', 'tag'),
+    ('scriptmanager.register', 0), ('clientscript.register', 0), ('page.clientscript', 0),
+    ('[webmethod]', 0), ('[scriptmethod]', 0), ('[webservice]', 0), ('[operationcontract]', 0),
+    ('[apicontroller]', 0), ('[route(', 0), ('[hubname]', 0), ('hubconnection.start', 0),
+    ('clients.all', 0), ('clients.caller', 0), ('@ajax.', 0), ('@url.', 0),
+    ('<system.web.extensions>', 0), ('<scriptresourcehandler>', 0),
+    ('<telerik:radajax', 0), ('radajaxmanager', 0), ('aspxcallback', 0),
+    ('this.http.', 0), ('usequery', 0), ('usemutation', 0), ('ajax.request', 'new'),
+    ('datatype', 0), ('response.write', 0), ('channelfactory<', 0), ('httpclient', 0),
+    ('ijsruntime', 0), ('[http', 0), ('backgroundfetch', 0), ('target=', 0), ('<iframe', 0),
+    ('formdata', 'new'), ('image', 'new'), ('src', 1),
+]
+
+_prefilter: Optional[LiteralPrefilter] = None
+
+
+def ajax_prefilter() -> LiteralPrefilter:
+    """The process-wide prefilter for 'ajax_call' (built on first use)."""
+    global _prefilter
+    if _prefilter is None:
+        _prefilter = LiteralPrefilter(patterns.get('ajax_call'), AJAX_ANCHORS)
+    return _prefilter
+
+
+def find_ajax_calls(text: Union[str, bytes, 'mmap.mmap'], pos: int = 0) -> Iterator['re.Match']:
+    """Same matches as patterns.get('ajax_call').finditer(text, pos) (get_bytes for bytes-like text), via the literal prefilter."""
+    return ajax_prefilter().finditer(text, pos)
@@ -0,0 +1,98 @@
+"""
+Fused Snippet Enrichment Scan
+
+Counts every per-snippet Parser metric (dynamic code, logic density,
+server dependency severity) from one pass over the snippet's code: the
+anchor literals of all ENRICHMENT_GROUPS members (see
+reposcan_shared.patterns) are located once, and each member pattern is
+tried only at those positions.
+
+Each member is counted on its own, exactly as a separate finditer would
+count it, so matches of different members may overlap: in
+`function setTimeout(` the `function setTimeout` counts as a logic
+structure and the `setTimeout(` as a JS sink. One alternation with a
+named group per member would consume the text and count only the first.
+"""
+
+import re
+import collections
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from . import patterns
+from .prefilter import Anchor, LiteralPrefilter
+
+# Literal anchors of every 'enrichment' alternative (see reposcan_shared.prefilter
+# for the rules); DYNAMIC_ANCHORS alone cover 'dynamic_sinks', and each
+# DYNAMIC_GROUP_ANCHORS entry its own member. Keep in step with the member
+# patterns in reposcan_shared/patterns.py.
+DYNAMIC_GROUP_ANCHORS: Dict[str, List[Anchor]] = {
+    'dom_sink': [('.innerhtml', 0), ('.outerhtml', 0), ('.insertadjacenthtml', 0), ('.write', 0)],
+    'js_sink': [('eval', 0), ('function', 'new'), ('settimeout', 0), ('setinterval', 0), ('import', 0),
+                ('system.import', 0)],
+    'dynamic_load': [('.src', 0), ('.href', 0), ('document.createelement', 0)],
+    'dynamic_style': [('.style.', 0), ('.style[', 0), ('.csstext', 0), ('setproperty', 0), ('insertrule', 0),
+                      ('addrule', 0), ('setattribute', 0), ('.classlist.', 0), ('cssstylesheet', 'new'),
+                      ('adoptedstylesheets', 0)],
+    'css_in_js': [('styled', 0), ('css`', 0)],
+}
+DYNAMIC_ANCHORS: List[Anchor] = [anchor for group in patterns.DYNAMIC_GROUPS for anchor in DYNAMIC_GROUP_ANCHORS[group]]
+ENRICHMENT_ANCHORS: List[Anchor] = DYNAMIC_ANCHORS + [
+    # logic_structures, event_listeners, dom_selectors
+    ('function', 0), ('if', 0), ('for', 0), ('while', 0), ('.addeventlistener', 0),
+    ('document.getelementbyid', 0), ('document.queryselector', 0), ('$(', 0),
+    # severity tiers
+    ('@model.', 0), ('<%', 0), ('@url.', 0), ('@viewbag.', 0), ('@viewdata.', 0), ('@datetime.', 0),
+]
+
+_prefilter: Optional[LiteralPrefilter] = None
+_dynamic_prefilter: Optional[LiteralPrefilter] = None
+_members: Optional[List[Tuple[str, 're.Pattern']]] = None
+_dynamic_members: Optional[List[Tuple[str, 're.Pattern']]] = None
+_group_prefilters: Optional[Dict[str, LiteralPrefilter]] = None
+
+
+def _compile_members(names: Sequence[str]) -> List[Tuple[str, 're.Pattern']]:
+    # Case-insensitive like the alternation the anchors are built for
+    return [(name, re.compile(patterns.PATTERN_SOURCES[name][0], patterns.PATTERN_SOURCES[name][1] | re.IGNORECASE))
+            for name in names]
+
+
+def enrichment_prefilter() -> LiteralPrefilter:
+    """The process-wide prefilter for 'enrichment' (built on first use)."""
+    global _prefilter
+    if _prefilter is None:
+        _prefilter = LiteralPrefilter(patterns.get('enrichment'), ENRICHMENT_ANCHORS)
+    return _prefilter
+
+
+def dynamic_prefilter() -> LiteralPrefilter:
+    """The process-wide prefilter for 'dynamic_sinks' (built on first use)."""
+    global _dynamic_prefilter
+    if _dynamic_prefilter is None:
+        _dynamic_prefilter = LiteralPrefilter(patterns.get('dynamic_sinks'), DYNAMIC_ANCHORS)
+    return _dynamic_prefilter
+
+
+def dynamic_group_prefilters() -> Dict[str, LiteralPrefilter]:
+    """A process-wide prefilter per DYNAMIC_GROUPS member (built on first use), for counting bytes windows."""
+    global _group_prefilters
+    if _group_prefilters is None:
+        _group_prefilters = {name: LiteralPrefilter(pattern, DYNAMIC_GROUP_ANCHORS[name])
+                             for name, pattern in _compile_members(patterns.DYNAMIC_GROUPS)}
+    return _group_prefilters
+
+
+def count_enrichment_groups(text: str) -> 'collections.Counter':
+    """Matches of each ENRICHMENT_GROUPS member in text (case-insensitive), each counted on its own."""
+    global _members
+    if _members is None:
+        _members = _compile_members(patterns.ENRICHMENT_GROUPS)
+    return enrichment_prefilter().count_each(text, _members)
+
+
+def find_dynamic_groups(text: str) -> Iterator[Tuple[str, 're.Match']]:
+    """(group, match) for every match of each DYNAMIC_GROUPS member in text, each member matched on its own."""
+    global _dynamic_members
+    if _dynamic_members is None:
+        _dynamic_members = _compile_members(patterns.DYNAMIC_GROUPS)
+    return dynamic_prefilter().finditer_each(text, _dynamic_members)
@@ -0,0 +1,63 @@
+"""
+Line Offset Index
+
+Maps character (or byte) offsets to 1-based line numbers. The newline
+offsets of a text are collected once, then every lookup is a binary
+search, instead of counting newlines from the start of the text for
+every match.
+"""
+
+import bisect
+from typing import Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _newline_offsets(text: Union[str, bytes]):
+    """Offsets of every '\\n' in text (NumPy array when available, else a list)."""
+    if np is not None:
+        buf = text
+        if isinstance(text, str):
+            # Byte offsets equal character offsets only for ASCII text
+            buf = text.encode('ascii') if text.isascii() else None
+        if buf is not None:
+            return np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == 10)
+
+    newline = '\n' if isinstance(text, str) else b'\n'
+    offsets = []
+    find = text.find
+    pos = find(newline)
+    while pos != -1:
+        offsets.append(pos)
+        pos = find(newline, pos + 1)
+    return offsets
+
+
+class LineIndex:
+    """
+    Line lookups for one text. The index is built lazily on the first
+    lookup, so creating one for a file that never needs it costs nothing.
+    """
+    def __init__(self, text: Union[str, bytes]):
+        self._text = text
+        self._offsets = None
+
+    @property
+    def offsets(self):
+        if self._offsets is None:
+            self._offsets = _newline_offsets(self._text)
+        return self._offsets
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number of the character at offset."""
+        offsets = self.offsets
+        if isinstance(offsets, list):
+            return bisect.bisect_left(offsets, offset) + 1
+        return int(offsets.searchsorted(offset)) + 1
+
+    def line_count(self) -> int:
+        """Number of lines (a trailing newline starts a new, empty line)."""
+        return len(self.offsets) + 1
@@ -0,0 +1,46 @@
+"""
+Minified / Bundled Content Detection
+
+Decides from a sample of a file whether it holds minified or bundled
+code (jquery.min.js, bundle.js, site.min.css): lines thousands of
+characters long with almost no whitespace. Splitting such a file into
+lines and cutting a snippet for every match costs far more than the
+handful of low-value findings is worth, so the Parser only counts
+patterns in them (see Parser.parse).
+"""
+
+from typing import NamedTuple, Optional
+
+SAMPLE_CHARS = 64 * 1024
+MIN_CHARS = 4 * 1024          # Smaller files are cheap to analyse in full
+LONG_LINE = 1000              # A line this long is rare in hand-written code...
+MAX_WHITESPACE_RATIO = 0.12   # ...and together with this little whitespace means minified
+MEAN_LINE_LIMIT = 300         # Or every line is long (bundles that keep some indentation)
+MINIFIABLE_EXTENSIONS = {'.js', '.css'}
+
+
+class TextStats(NamedTuple):
+    lines: int                # Lines in the sample
+    longest_line: int         # Characters
+    mean_line: float          # Characters
+    whitespace_ratio: float   # Spaces, tabs and line breaks / characters
+
+
+def sample_stats(text: str, sample_chars: int = SAMPLE_CHARS) -> TextStats:
+    sample = text[:sample_chars]
+    lines = sample.split('\n')
+    whitespace = sum(sample.count(c) for c in ' \t\r\n')
+    return TextStats(len(lines), max(map(len, lines)), len(sample) / len(lines),
+                     whitespace / len(sample) if sample else 1.0)
+
+
+def looks_minified(text: str) -> Optional[TextStats]:
+    """The sample's statistics if text looks minified or bundled, else None."""
+    if len(text) < MIN_CHARS:
+        return None
+    stats = sample_stats(text)
+    if stats.mean_line >= MEAN_LINE_LIMIT or (stats.longest_line >= LONG_LINE and
+                                              stats.whitespace_ratio <= MAX_WHITESPACE_RATIO):
+        return stats
+    return None
+
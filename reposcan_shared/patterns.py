@@ -0,0 +1,276 @@
+"""
+Shared Pattern Registry
+
+The single home of the regexes used by RepoScan-Analyser, RepoScan Depth
+Analyser and the Refactoring Utility. Sources are plain strings; each
+pattern is compiled on first use and then cached for the life of the
+process, so importing this module costs nothing and tools that only need
+a handful of patterns never compile the rest.
+
+pattern_version() fingerprints every source (and the AJAX classification
+table) so caches such as the scan manifest can detect a detection change.
+"""
+
+import re
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+_I = re.IGNORECASE
+
+# -------------------------------------------------------------------------
+# AJAX / Network Calls (the "Giant Regex"). Every alternative sits in a
+# named group classified by reposcan_shared.ajax_patterns. Alternatives are
+# tried left to right, so the order below is significant.
+# -------------------------------------------------------------------------
+AJAX_CALL_SOURCE = (
+    r'(?P<fetch>\bfetch\s*\()|'
+    r'(?P<xhr_new>new\s+XMLHttpRequest\s*\()|'
+    r'(?:\$|jQuery|axios|superagent|http)\s*\.\s*'
+    r'(?:(?P<lib_request>ajax|get|post|getJSON|request)|'
+    r'(?P<lib_script>getScript)|'
+    r'(?P<lib_load>load)|'
+    r'(?P<lib_config>ajaxSetup|ajaxPrefilter|ajaxTransport)|'
+    r'(?P<lib_utility>param|parseJSON))\s*\(|'
+    r'\.(?:(?P<dot_load>load)|'
+    r'(?P<dot_event>ajaxStart|ajaxSend|ajaxSuccess|ajaxError|ajaxComplete|ajaxStop)|'
+    r'(?P<dot_utility>serialize|serializeArray))\s*\(|'
+    r'(?P<xhr_open>\.open\s*\(\s*["\'](?:GET|POST|PUT|DELETE|PATCH)["\'])|'
+    r'(?P<xhr_event>\bonreadystatechange\s*=)|'
+    r'(?P<xhr_send>\.send\s*\()|'
+    r'(?P<axios>\baxios(?:\.\w+)?\s*\()|'
+    r'(?P<realtime>new\s+WebSocket\s*\(|new\s+EventSource\s*\()|'
+    r'(?P<ajax_method>\bajax\s*:\s*function)|'             # Object literal AJAX method definitions
+    r'(?P<beacon>navigator\.sendBeacon\s*\()|'             # Analytics/Tracking
+    r'(?P<activex>new\s+ActiveXObject\s*\()|'              # Legacy IE
+    r'(?P<socket_io>\bio\s*\()|'                           # Socket.io
+    r'(?P<signalr_builder>HubConnectionBuilder)|'          # SignalR
+    r'(?P<ms_ajax>\bSys\.Net\.WebRequest\s*\()|'           # Microsoft AJAX Library (Legacy)
+    r'(?P<page_methods>\bPageMethods\.\w+\s*\()|'          # ASP.NET WebForms RPC
+    r'(?P<postback>\b__doPostBack\s*\()|'                  # ASP.NET Postback
+    r'(?P<prm>\bSys\.WebForms\.PageRequestManager)|'       # UpdatePanel Manager
+    r'(?P<data_ajax>\bdata-ajax(?:-\w+)?\s*=)|'            # Unobtrusive AJAX Attributes
+    r'(?P<xhr_header>\.setRequestHeader\s*\(|'             # XHR Header Config / Inspection
+    r'\.getResponseHeader\s*\(|\.getAllResponseHeaders\s*\()|'
+    r'(?P<xhr_abort>\.abort\s*\()|'                        # Request Cancellation
+    r'(?P<fetch_construct>new\s+Headers\s*\(|new\s+Request\s*\()|'  # Fetch API Headers / Request
+    r'(?P<json>\bJSON\.parse\s*\(|\bJSON\.stringify\s*\()|'         # Native JSON
+    r'(?P<update_panel><\w+:UpdatePanel)|'                 # ASP.NET Partial Rendering
+    r'(?P<script_injection><\w+:ScriptManager|'            # ASP.NET AJAX Enabler / Server-Side Script Injection
+    r'\bScriptManager\.RegisterStartupScript\s*\(|'
+    r'\bScriptManager\.RegisterClientScriptBlock\s*\(|'
+    r'\bClientScript\.RegisterStartupScript\s*\(|'
+    r'\bClientScript\.RegisterClientScriptBlock\s*\(|'
+    r'\bPage\.ClientScript\s*\.)|'
+    r'(?P<web_method>\[WebMethod\]|\[ScriptMethod\]|\[WebService\])|'  # ASP.NET AJAX Endpoint / Script Service
+    r'(?P<wcf_endpoint>\[OperationContract\])|'            # WCF
+    r'(?P<api_endpoint>\[ApiController\]|\[Route\(\s*["\']api/)|'     # Web API 2 / Core
+    r'(?P<signalr_hub>\[HubName\]|\bClients\.All|\bClients\.Caller)|'  # SignalR Server
+    r'(?P<signalr_start>\bhubConnection\.start\s*\()|'     # SignalR Client
+    r'(?P<razor_ajax>@Ajax\.ActionLink|@Ajax\.BeginForm)|' # Razor AJAX Helper
+    r'(?P<razor_url>@Url\.Action\s*\(|@Url\.Content\s*\()|'           # URL Generation for AJAX
+    r'(?P<ajax_config><system\.web\.extensions>|<scriptResourceHandler>)|'  # Web.config AJAX
+    r'(?P<telerik><telerik:RadAjaxManager|<telerik:RadAjaxPanel|\bRadAjaxManager\b)|'
+    r'(?P<devexpress>\bASPxCallback|\bASPxCallbackPanel)|'
+    r'(?P<angular_js>\$http\b)|'                           # Angular 1.x / Vue Resource
+    r'(?P<angular>\bthis\.http\.get\s*\(|\bthis\.http\.post\s*\()|'    # Angular HttpClient
+    r'(?P<react_query>\buseQuery\s*\(|\buseMutation\s*\()|'            # React/TanStack Query
+    r'(?P<prototype>\bnew\s+Ajax\.Request\s*\()|'          # Prototype.js
+    r'(?P<mootools>\bnew\s+Request(?:.JSON)?\s*\()|'       # MooTools
+    r'(?P<jsonp>\bdataType\s*:\s*["\']jsonp["\'])|'        # jQuery JSONP
+    r'(?P<response_write>\bResponse\.Write\s*\(\s*["\']<script)|'     # Server-Side Script Injection (Direct)
+    r'(?P<wcf_client>\bChannelFactory<)|'                  # WCF Client
+    r'(?P<http_client>\bHttpClient\s+)|'                   # Blazor / .NET HttpClient usage
+    r'(?P<blazor_interop>\bIJSRuntime\b)|'                 # Blazor JS Interop
+    r'(?P<http_verb>\[Http(?:Get|Post|Put|Delete|Patch|Options)\])|'  # .NET API Attributes
+    r'(?P<background_fetch>\bbackgroundFetch\b)|'          # Background Fetch API
+    r'(?P<hidden_iframe>target=["\']_?iframe["\']|'        # Hidden Iframe Target (Naive)
+    r'<iframe\b[^>]*style=["\'].*display:\s*none)|'        # Hidden Iframe (Structure)
+    r'(?P<form_data>\bnew\s+FormData\b)|'                  # Form Data Constructor
+    r'(?P<pixel>\bnew\s+Image\s*\(|\.src\s*=\s*["\']http)'  # Pixel Tracking (Image / src assignment)
+)
+
+PATTERN_SOURCES: Dict[str, Tuple[str, int]] = {
+    # AJAX: named-group form for classification, non-capturing form for
+    # scanning (capturing groups make a full-text scan about twice as slow)
+    'ajax_call_groups': (AJAX_CALL_SOURCE, _I),
+    'ajax_call': (re.sub(r'\(\?P<\w+>', '(?:', AJAX_CALL_SOURCE), _I),
+
+    # Server-side dependencies (see SERVER_DEPENDENCIES for the reasons)
+    'asp_tag': (r'<%', _I),
+    'razor_model': (r'@Model', _I),
+    'razor_viewbag': (r'@ViewBag', _I),
+    'razor_viewdata': (r'@ViewData', _I),
+    'razor_url_action': (r'@Url\.Action', _I),
+    'razor_url_content': (r'@Url\.Content', _I),
+    'asp_block': (r'<%\s', _I),
+    'asp_output': (r'<%:', _I),
+    'template_syntax': (r'\{\{', _I),
+    'response_write': (r'\bResponse\.Write\b', _I),
+    'request_form': (r'\bRequest\.Form\b', _I),
+
+    # Server dependency severity tiers (Parser)
+    'severity_high': (r'@Model\.|<%\s', _I),
+    'severity_medium': (r'@Url\.|@ViewBag\.|@ViewData\.', _I),
+    'severity_low': (r'<%=|@DateTime\.', _I),
+
+    # Dynamic code generation (Parser)
+    'dom_sink': (r'\.(innerHTML|outerHTML|insertAdjacentHTML|write|writeln)\s*=', _I),
+    'js_sink': (r'\b(eval|new\s+Function|setTimeout|setInterval|import|System\.import)\s*\(', _I),
+    'dynamic_load': (r'\.(src|href)\s*=\s*|document\.createElement\s*\(\s*["\'](script|style|link)["\']\s*\)', _I),
+    'dynamic_style': (r'(\.style\.\w+\s*=|\.style\[\s*["\'][^"\']+["\']\s*\]\s*=|\.cssText\s*=|setProperty\s*\(|insertRule\s*\(|addRule\s*\(|setAttribute\s*\(\s*["\']style["\']|\.classList\.(?:add|remove|toggle|replace)\s*\(|new\s+CSSStyleSheet\s*\(|adoptedStyleSheets)', _I),
+    'css_in_js': (r'(?:styled\.\w+|css`|styled\s*\()', _I),
+
+    # Logic density (Parser; matched against lower-cased code)
+    'logic_structures': (r'\bfunction\s+\w+|\bif\s*\(|\bfor\s*\(|\bwhile\s*\(', 0),
+    'event_listeners': (r'\.addeventlistener', 0),
+    'dom_selectors': (r'document\.getelementbyid|document\.queryselector|\$\(["\']', 0),
+
+    # Functionality heuristic (Parser), tried in this order; case-insensitive, so the code is not lower-cased
+    'functionality_validation': (r'validate|regex|return false', _I),
+    'functionality_interaction': (r'click|hover|on\(', _I),
+    'functionality_visualisation': (r'chart|graph', _I),
+    'functionality_visual': (r'style|class|show\(\)|hide\(\)', _I),
+
+    # javascript: URIs (Parser regex pass)
+    'js_uri_attr': (r'href=["\']\s*javascript:', _I),
+
+    # Extracted snippet filenames: {OriginalPath}_{Type}_L{Start}-L{End}.{js|css} (Refactoring Utility)
+    'extracted_filename': (r'(.+)_([a-zA-Z0-9]+)_L(\d+)-L(\d+)\.(js|css)$', 0),
+
+    # Client-side code inventory (Depth Analyser)
+    'inline_css': (r'style\s*=\s*["\'][^"\']*["\']', _I),
+    'internal_style_blocks': (r'<style\b[^>]*>[\s\S]*?</style>', _I),
+    'external_stylesheet_links': (r'(?:<link\b[^>]*rel\s*=\s*["\']stylesheet["\'][^>]*>|@import\s+(?:url\()?["\'][^"\']+["\'])', _I),
+    'inline_js': (r'(\bon\w+\s*=\s*["\'][^"\']*["\']|href=["\']\s*javascript:)', _I),
+    'internal_script_blocks': (r'<script\b(?![^>]*\bsrc=)[^>]*>[\s\S]*?</script>', _I),
+    'external_script_tags': (r'(?:<script\b[^>]*src\s*=\s*["\'][^"\']+["\'][^>]*>|\bimport\s+(?:[\w\s{},*]+from\s+)?["\'][^"\']+["\']|\brequire\s*\(\s*["\'][^"\']+["\']\s*\)|\bdefine\s*\(\s*\[)', _I),
+
+    # DOM triage (Parser): the openings of the count patterns above, loosened so
+    # that nothing the DOM walk reports can go unmatched: script, style and link
+    # tags; javascript: URIs, also entity-encoded (&#...;); and the event handler
+    # (Parser.event_handlers) and style attribute names where html.parser can
+    # read an attribute name (after whitespace, a quote or '/'; before
+    # whitespace, '/', '>', '=' or the end), with or without a value
+    'dom_candidates': (r'<(?:script|style|link)\b|javascript|&#|'
+                       r'(?<=[\s"\'/])(?:style|on(?:abort|beforeunload|blur|change|click|contextmenu|dblclick|'
+                       r'drag|dragend|dragstart|drop|error|focus|input|keydown|keypress|keyup|load|mousedown|'
+                       r'mouseenter|mouseleave|mousemove|mouseout|mouseover|mouseup|pause|play|reset|resize|'
+                       r'scroll|select|submit|timeupdate|unload|volumechange))(?=[\s/>=]|$)', _I),
+    'dynamic_js': (
+        r'(\.src\s*=\s*["\'][^"\']+\.js["\']|'
+        r'document\.createElement\s*\(\s*["\']script["\']\s*\)|'
+        r'\.appendChild\s*\(|'
+        r'\.insertBefore\s*\(|'
+        r'eval\s*\(|'
+        r'new\s+Function\s*\(|'
+        r'setTimeout\s*\(|'
+        r'setInterval\s*\(|'
+        r'import\s*\(|'
+        r'System\.import\s*\(|'
+        r'require\s*\(|'
+        r'innerHTML\s*=|'
+        r'outerHTML\s*=|'
+        r'insertAdjacentHTML\s*\(|'
+        r'document\.write\s*\()', _I),
+    'dynamic_css': (
+        r'(\.src\s*=\s*["\'][^"\']+\.css["\']|'
+        r'document\.createElement\s*\(\s*["\']style["\']\s*\)|'
+        r'document\.createElement\s*\(\s*["\']link["\']\s*\)|'
+        r'\.rel\s*=\s*["\']stylesheet["\']|'
+        r'\.href\s*=\s*["\'][^"\']+\.css["\']|'
+        r'\.style\.\w+\s*=|'
+        r'\.style\[\s*["\'][^"\']+["\']\s*\]\s*=|'
+        r'\.cssText\s*=|'  # Bulk Style Assignment
+        r'setProperty\s*\(|'
+        r'insertRule\s*\(|'
+        r'addRule\s*\(|'
+        r'setAttribute\s*\(\s*["\']style["\']|'  # Dynamic Style Attribute
+        r'\.classList\.(?:add|remove|toggle|replace)\s*\(|'  # Indirect CSS
+        r'new\s+CSSStyleSheet\s*\(|'
+        r'adoptedStyleSheets)', _I),
+}
+
+# Server-side syntax that blocks externalising a snippet, in reporting order
+SERVER_DEPENDENCIES: List[Tuple[str, str]] = [
+    ('asp_tag', 'ASP.NET/Classic ASP tags detected'),
+    ('razor_model', 'Razor Model syntax detected'),
+    ('razor_viewbag', 'Razor ViewBag syntax detected'),
+    ('razor_viewdata', 'Razor ViewData syntax detected'),
+    ('razor_url_action', 'Razor Url.Action detected'),
+    ('razor_url_content', 'Razor Url.Content detected'),
+    ('asp_block', 'Classic ASP block detected'),
+    ('asp_output', 'ASP.NET Output detected'),
+    ('template_syntax', 'Potential Template Syntax ({{) detected'),
+    ('response_write', 'Server-side Response.Write detected'),
+    ('request_form', 'Server-side Request.Form detected'),
+]
+
+# Any server dependency at all, as one alternation
+PATTERN_SOURCES['server_dependency'] = (
+    '|'.join(f'(?:{PATTERN_SOURCES[name][0]})' for name, _ in SERVER_DEPENDENCIES), _I)
+
+# Every per-snippet Parser metric as one alternation, each member pattern in
+# a named group (inner groups made non-capturing). The alternation only
+# builds the literal prefilter (reposcan_shared.enrichment): the members
+# themselves are counted independently with LiteralPrefilter.count_each,
+# so overlapping matches of different members all count. IGNORECASE stands
+# in for the lower-casing of the logic patterns.
+DYNAMIC_GROUPS: Tuple[str, ...] = (
+    'dom_sink', 'js_sink', 'dynamic_load', 'dynamic_style', 'css_in_js',
+)
+ENRICHMENT_GROUPS: Tuple[str, ...] = DYNAMIC_GROUPS + (
+    'logic_structures', 'event_listeners', 'dom_selectors',
+    'severity_high', 'severity_medium', 'severity_low',
+)
+_CAPTURING_GROUP = re.compile(r'(?<!\\)\((?!\?)')
+
+
+def _named_alternation(names: Tuple[str, ...]) -> str:
+    return '|'.join(f'(?P<{name}>{_CAPTURING_GROUP.sub("(?:", PATTERN_SOURCES[name][0])})' for name in names)
+
+
+PATTERN_SOURCES['enrichment'] = (_named_alternation(ENRICHMENT_GROUPS), _I)
+# The dynamic code members alone (prefilter of enrichment.find_dynamic_groups)
+PATTERN_SOURCES['dynamic_sinks'] = (_named_alternation(DYNAMIC_GROUPS), _I)
+
+_compiled: Dict[str, 're.Pattern'] = {}
+_compiled_bytes: Dict[str, 're.Pattern'] = {}
+_version: Optional[str] = None
+
+
+def get(name: str) -> 're.Pattern':
+    """The compiled pattern registered under name (compiled once per process)."""
+    pattern = _compiled.get(name)
+    if pattern is None:
+        source, flags = PATTERN_SOURCES[name]
+        pattern = _compiled[name] = re.compile(source, flags)
+    return pattern
+
+
+def get_bytes(name: str) -> 're.Pattern':
+    """The pattern registered under name, compiled for bytes / memory maps (ASCII semantics for \\w, \\s and case)."""
+    pattern = _compiled_bytes.get(name)
+    if pattern is None:
+        source, flags = PATTERN_SOURCES[name]
+        pattern = _compiled_bytes[name] = re.compile(source.encode('ascii'), flags)
+    return pattern
+
+
+def server_dependencies() -> List[Tuple['re.Pattern', str]]:
+    """(pattern, reason) pairs for every server-side dependency, in reporting order."""
+    return [(get(name), reason) for name, reason in SERVER_DEPENDENCIES]
+
+
+def pattern_version() -> str:
+    """Fingerprint of every pattern source and the AJAX classification table."""
+    global _version
+    if _version is None:
+        from .ajax_patterns import AJAX_CLASSIFICATION
+
+        digest = hashlib.sha1()
+        for name in sorted(PATTERN_SOURCES):
+            source, flags = PATTERN_SOURCES[name]
+            digest.update(f"{name}\x00{source}\x00{flags}\x00".encode('utf-8'))
+        digest.update(repr(sorted(AJAX_CLASSIFICATION.items())).encode('utf-8'))
+        _version = digest.hexdigest()
+    return _version
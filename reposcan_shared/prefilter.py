@@ -0,0 +1,198 @@
+"""
+Literal Prefilter for Large Alternation Regexes
+
+Finds the positions where a regex match could start by searching for the
+literal anchors of its alternatives, then runs the regex anchored at
+those positions only. Text that contains none of the anchors is rejected
+without running the regex at all. The matches produced are exactly those
+of pattern.finditer(text), provided every alternative has an anchor.
+
+Each anchor is (literal, rule) and tells how to get from a literal hit to
+the match start:
+    int     - fixed number of characters before the literal (0 = it starts the match)
+    'new'   - the literal follows 'new' plus whitespace, as in new\\s+XMLHttpRequest
+    'tag'   - the literal follows '<' plus word characters, as in <\\w+:UpdatePanel
+
+Literals are matched against the lower-cased text (the patterns are
+case-insensitive). With pyahocorasick installed all anchors are found in
+one Aho-Corasick pass; otherwise each literal is located with str.find.
+
+bytes and memory maps are searched one SCAN_CHUNK at a time (lower-cased
+and read as Latin-1, so offsets stay put) and matched with the bytes form
+of the pattern, without ever holding the whole buffer as a str. A 'new'
+rule then sees at most LOOKBEHIND bytes of whitespace before a hit at
+the start of a chunk.
+"""
+
+import re
+import threading
+import collections
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+Anchor = Tuple[str, Union[int, str]]
+
+SCAN_CHUNK = 1024 * 1024
+LOOKBEHIND = 256
+
+# Characters that re.IGNORECASE equates with an ASCII letter but that
+# str.lower() leaves alone (or expands); mapped first so offsets stay put.
+_CASE_FOLD_FIXES = str.maketrans({'\u0130': 'i', '\u0131': 'i', '\u017f': 's', '\u212a': 'k'})
+
+
+class PrefilterStats:
+    def __init__(self):
+        self.scans = 0      # Texts searched
+        self.skipped = 0    # Texts rejected without running the regex
+        self.attempts = 0   # Anchored regex attempts at candidate positions
+        self._lock = threading.Lock()
+
+    def add(self, scans: int, skipped: int, attempts: int):
+        with self._lock:
+            self.scans += scans
+            self.skipped += skipped
+            self.attempts += attempts
+
+    def snapshot(self) -> Tuple[int, int, int]:
+        return self.scans, self.skipped, self.attempts
+
+
+class LiteralPrefilter:
+    def __init__(self, pattern: 're.Pattern', anchors: Sequence[Anchor]):
+        self.pattern = pattern
+        self.rules = {}
+        for literal, rule in anchors:
+            self.rules.setdefault(literal.lower(), []).append(rule)
+        self.stats = PrefilterStats()
+
+        self._byte_pattern = None
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for literal in self.rules:
+                self._automaton.add_word(literal, literal)
+            self._automaton.make_automaton()
+
+    def finditer(self, text: Union[str, bytes, 'mmap.mmap'], pos: int = 0) -> Iterator['re.Match']:
+        """Same matches as self.pattern.finditer(text, pos) (its bytes form for bytes-like text)."""
+        if isinstance(text, str):
+            return self._finditer_text(text, pos)
+        return self._finditer_bytes(text, pos)
+
+    def _finditer_text(self, text: str, pos: int) -> Iterator['re.Match']:
+        lowered = text.lower() if text.isascii() else text.translate(_CASE_FOLD_FIXES).lower()
+        if len(lowered) != len(text):
+            # Offsets would not line up; scan the whole text
+            self.stats.add(1, 0, 0)
+            yield from self.pattern.finditer(text, pos)
+            return
+        yield from self._match_at(self.pattern, text, self._candidate_starts(text, lowered, pos), pos)
+
+    def count_each(self, text: str, members: Sequence[Tuple[str, 're.Pattern']]) -> 'collections.Counter':
+        """
+        Matches of each (name, pattern) member counted on its own, as if each
+        ran its own finditer, so matches of different members may overlap.
+        Every member match must start at one of this prefilter's anchors.
+        """
+        return collections.Counter(name for name, _ in self.finditer_each(text, members))
+
+    def finditer_each(self, text: str, members: Sequence[Tuple[str, 're.Pattern']]) -> Iterator[Tuple[str, 're.Match']]:
+        """(name, match) for every match of each member, member by member (see count_each)."""
+        lowered = text.lower() if text.isascii() else text.translate(_CASE_FOLD_FIXES).lower()
+        if len(lowered) != len(text):
+            self.stats.add(1, 0, 0)
+            for name, pattern in members:
+                for match in pattern.finditer(text):
+                    yield name, match
+            return
+
+        starts = self._candidate_starts(text, lowered)
+        if not starts:
+            self.stats.add(1, 1, 0)
+            return
+        attempts = 0
+        for name, pattern in members:
+            end = 0
+            match_at = pattern.match
+            for start in starts:
+                if start < end:
+                    continue
+                attempts += 1
+                match = match_at(text, start)
+                if match:
+                    end = match.end()
+                    yield name, match
+        self.stats.add(1, 0, attempts)
+
+    def _finditer_bytes(self, buffer, pos: int) -> Iterator['re.Match']:
+        if self._byte_pattern is None:
+            self._byte_pattern = re.compile(self.pattern.pattern.encode('ascii'), self.pattern.flags & ~re.UNICODE)
+
+        overlap = max(map(len, self.rules)) - 1
+        starts = set()
+        for begin in range(pos, len(buffer), SCAN_CHUNK):
+            origin = max(0, begin - LOOKBEHIND)
+            chunk = str(buffer[origin:begin + SCAN_CHUNK + overlap], 'latin-1')
+            starts.update(origin + start for start in
+                          self._candidate_starts(chunk, chunk.lower(), begin - origin, begin - origin + SCAN_CHUNK))
+        yield from self._match_at(self._byte_pattern, buffer, sorted(starts), pos)
+
+    def _match_at(self, pattern: 're.Pattern', text, starts: List[int], pos: int) -> Iterator['re.Match']:
+        if not starts:
+            self.stats.add(1, 1, 0)
+            return
+
+        attempts = 0
+        end = pos
+        match_at = pattern.match
+        for start in starts:
+            if start < end:
+                continue
+            attempts += 1
+            match = match_at(text, start)
+            if match:
+                end = match.end()
+                yield match
+        self.stats.add(1, 0, attempts)
+
+    def _literal_hits(self, lowered: str, first: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """(position, literal) of every anchor literal starting in lowered[first:stop]."""
+        if stop is None:
+            stop = len(lowered)
+        if self._automaton is not None:
+            for end, literal in self._automaton.iter(lowered, first):
+                pos = end - len(literal) + 1
+                if pos < stop:
+                    yield pos, literal
+            return
+
+        for literal in self.rules:
+            find = lowered.find
+            pos = find(literal, first)
+            while pos != -1 and pos < stop:
+                yield pos, literal
+                pos = find(literal, pos + 1)
+
+    def _candidate_starts(self, text: str, lowered: str, first: int = 0, stop: Optional[int] = None) -> List[int]:
+        starts = set()
+        for pos, literal in self._literal_hits(lowered, first, stop):
+            for rule in self.rules[literal]:
+                if rule == 'new':
+                    i = pos
+                    while i > 0 and text[i - 1].isspace():
+                        i -= 1
+                    if i < pos and lowered.endswith('new', 0, i):
+                        starts.add(i - 3)
+                elif rule == 'tag':
+                    i = pos
+                    while i > 0 and (text[i - 1].isalnum() or text[i - 1] == '_'):
+                        i -= 1
+                    if i < pos and i > 0 and text[i - 1] == '<':
+                        starts.add(i - 1)
+                elif pos >= rule:
+                    starts.add(pos - rule)
+        return sorted(starts)
@@ -0,0 +1,76 @@
+"""
+Largest-First Scheduling for Parallel Scans
+
+Discovery returns files in os.walk order, so a few multi-megabyte
+generated pages found late in the walk are started last and keep one
+worker busy long after the others have run dry. plan_tasks orders the
+work longest-processing-time first (largest file first, size being the
+best cost estimate known from the discovery stat) and packs it into
+tasks bounded by both a file count and a byte total. Large files then get
+tasks of their own and run early, while the many small files fill in
+behind them until the end.
+
+WorkerTimes keeps the busy seconds of each worker so that the balance
+can be measured: idle time is the wall time of the analysis less a
+worker's busy time.
+"""
+
+import threading
+from collections import Counter
+from typing import Callable, Hashable, List, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+def plan_tasks(items: Sequence[T], size: Callable[[T], int], max_items: int, max_bytes: int) -> List[List[T]]:
+    """
+    Items largest first, in tasks of at most max_items items and max_bytes
+    bytes (an item larger than max_bytes makes a task alone). Tasks are
+    returned largest total first; equal sizes keep their input order.
+    """
+    tasks, totals = [], []
+    task, total = [], 0
+    for item in sorted(items, key=size, reverse=True):
+        item_size = size(item)
+        if task and (len(task) >= max_items or total + item_size > max_bytes):
+            tasks.append(task)
+            totals.append(total)
+            task, total = [], 0
+        task.append(item)
+        total += item_size
+    if task:
+        tasks.append(task)
+        totals.append(total)
+    order = sorted(range(len(tasks)), key=lambda i: totals[i], reverse=True)
+    return [tasks[i] for i in order]
+
+
+class WorkerTimes:
+    """Busy seconds per worker (a process id, thread name, ...) over `elapsed` seconds of wall time."""
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self.busy = Counter()
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, worker: Hashable, seconds: float):
+        with self._lock:
+            self.busy[worker] += seconds
+
+    def times(self) -> List[Tuple[float, float]]:
+        """(busy, idle) seconds per worker, busiest first; a worker that never got work is idle throughout."""
+        busy = sorted(self.busy.values(), reverse=True)
+        busy += [0.0] * max(0, self.workers - len(busy))
+        return [(b, max(0.0, self.elapsed - b)) for b in busy]
+
+    def utilisation(self) -> float:
+        times = self.times()
+        return sum(b for b, _ in times) / (len(times) * self.elapsed) if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        times = self.times()
+        busy = [b for b, _ in times]
+        idle = [i for _, i in times]
+        return (f"{len(times)} worker(s) busy {min(busy):.2f}-{max(busy):.2f} s, "
+                f"idle {min(idle):.2f}-{max(idle):.2f} s ({self.utilisation():.0%} utilised)")
@@ -0,0 +1,115 @@
+"""
+Directory Walker for RepoScan-Analyser and RepoScan Depth Analyser
+
+walk() lists a tree top-down with os.scandir and yields one
+DirectoryListing per folder, in os.walk order. With threads > 1 the
+folders are listed on a bounded thread pool: the next folders in walk
+order are listed ahead of the caller, so on a network share many round
+trips are in flight at once while the caller still consumes the folders
+one by one, in order. At most PREFETCH_PER_THREAD listings per thread
+are held ahead of the caller, so memory does not grow with the tree.
+
+visit_file runs on the listing thread for every file entry, so per-file
+metadata calls (DirEntry.stat) overlap too; it returns whatever the
+caller wants kept for the file, or None to drop it.
+"""
+
+import os
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Callable, Iterator, List, NamedTuple, Optional
+
+# Listings submitted or finished but not yet consumed, per walker thread
+PREFETCH_PER_THREAD = 4
+
+
+class DirectoryListing(NamedTuple):
+    path: str
+    file_count: int   # File entries in the folder, before visit_file filtering
+    files: List[Any]  # visit_file results that were not None, in listing order
+
+
+def _list_directory(path: str, visit_file: Callable[['os.DirEntry'], Any],
+                    skip_dir: Callable[['os.DirEntry'], bool]):
+    """Returns (listing, subfolder paths), or None if the folder can't be listed."""
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError as e:
+        logging.warning(f"Could not list {path}: {e}")
+        return None
+
+    subdirs = []
+    files = []
+    file_count = 0
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if is_dir:
+            # Like os.walk: don't follow links to folders
+            if not skip_dir(entry) and not entry.is_symlink():
+                subdirs.append(entry.path)
+            continue
+
+        file_count += 1
+        result = visit_file(entry)
+        if result is not None:
+            files.append(result)
+
+    return DirectoryListing(path, file_count, files), subdirs
+
+
+def walk(root: str, visit_file: Callable[['os.DirEntry'], Any],
+         skip_dir: Optional[Callable[['os.DirEntry'], bool]] = None, threads: int = 1) -> Iterator[DirectoryListing]:
+    """Yields every folder under root (root first, then each subfolder in listing order)."""
+    skip_dir = skip_dir or (lambda entry: False)
+
+    if threads <= 1:
+        pending = [root]
+        while pending:
+            listed = _list_directory(pending.pop(), visit_file, skip_dir)
+            if listed is None:
+                continue
+            listing, subdirs = listed
+            yield listing
+            pending.extend(reversed(subdirs))
+        return
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads, thread_name_prefix='walker')
+    stopping = threading.Event()
+    max_ahead = threads * PREFETCH_PER_THREAD
+
+    def list_directory(path):
+        if stopping.is_set():
+            return None
+        return _list_directory(path, visit_file, skip_dir)
+
+    # Folders still to yield, the next one last: [path, future once submitted]
+    pending = [[root, None]]
+    in_flight = 0
+    try:
+        while pending:
+            # Submit the next folders in walk order, up to max_ahead listings ahead
+            for entry in reversed(pending):
+                if in_flight >= max_ahead:
+                    break
+                if entry[1] is None:
+                    entry[1] = executor.submit(list_directory, entry[0])
+                    in_flight += 1
+
+            _, future = pending.pop()
+            listed = future.result()
+            in_flight -= 1
+            if listed is None:
+                continue
+            listing, subdirs = listed
+            yield listing
+            pending.extend([p, None] for p in reversed(subdirs))
+    finally:
+        # Listings still queued (the consumer stopped early) return at once
+        stopping.set()
+        executor.shutdown(wait=True)
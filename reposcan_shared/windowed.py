@@ -0,0 +1,71 @@
+"""
+Windowed Scanning of Oversized Files
+
+Runs bytes patterns over a file of any size with constant memory: the
+file is read in windows of WINDOW_BYTES, each extended by OVERLAP_BYTES
+of what follows, and every finder runs over one window at a time.
+
+A match belongs to the window it starts in, and each finder resumes in
+the next window where its last match ended, so the matches are those of
+one finditer over the whole file, as long as no match is longer than
+OVERLAP_BYTES (a longer one is cut off at the end of its window).
+Offsets and line numbers are absolute.
+"""
+
+from typing import Callable, Dict, Iterator, NamedTuple, Optional
+
+from .lineindex import LineIndex
+
+WINDOW_BYTES = 4 * 1024 * 1024
+OVERLAP_BYTES = 1024 * 1024
+
+# finder(window, pos) -> matches in window from pos on, in order
+# (e.g. pattern.finditer, or a LiteralPrefilter's finditer)
+Finder = Callable[[bytes, int], Iterator['re.Match']]
+
+
+class WindowMatch(NamedTuple):
+    name: str        # Key of the finder that produced it
+    offset: int      # Absolute byte offset of the match
+    line: int        # Absolute 1-based line number
+    match: 're.Match'  # Match within the current window (read it before the next one)
+
+
+class WindowedScan:
+    """
+    Iterating yields every match of every finder over stream (anything
+    with read(n): an open binary file, an mmap); afterwards `lines` and
+    `size` cover the whole stream.
+    """
+    def __init__(self, stream, finders: Dict[str, Finder], window: Optional[int] = None,
+                 overlap: Optional[int] = None):
+        self.stream = stream
+        self.finders = finders
+        self.window = window or WINDOW_BYTES
+        self.overlap = overlap or OVERLAP_BYTES
+        self.lines = 1
+        self.size = 0
+
+    def __iter__(self) -> Iterator[WindowMatch]:
+        resume = {name: 0 for name in self.finders}  # Absolute offset each finder continues from
+        offset = 0
+        data = self.stream.read(self.window + self.overlap)
+        while True:
+            last = len(data) <= self.window
+            owned = len(data) if last else self.window  # Matches starting before this belong to the window
+            line_index = LineIndex(data)
+
+            for name, finder in self.finders.items():
+                for match in finder(data, max(0, resume[name] - offset)):
+                    start = match.start()
+                    if start >= owned:
+                        break
+                    resume[name] = offset + max(match.end(), start + 1)
+                    yield WindowMatch(name, offset + start, self.lines + line_index.line_of(start) - 1, match)
+
+            self.lines += data.count(b'\n', 0, owned)
+            self.size = offset + owned
+            if last:
+                return
+            offset += self.window
+            data = data[self.window:] + self.stream.read(self.window)
@@ -8,109 +8,17 @@ Classifies findings by Capability, Difficulty, and extracts endpoint URLs.
 import re
 import os
 from typing import Optional
+from reposcan_shared.lineindex import LineIndex
+from reposcan_shared import patterns
+from reposcan_shared.ajax_patterns import classify_ajax_match, find_ajax_calls
 
 # -------------------------------------------------------------------------
 # COMPREHENSIVE REGEX PATTERNS (Synced with RepoDepthAnalyser)
 # -------------------------------------------------------------------------
 
-# 1. Main AJAX Call Pattern (The "Giant Regex")
-AJAX_CALL_PATTERN = re.compile(
-    r'(\bfetch\s*\(|'
-    r'new\s+XMLHttpRequest\s*\(|'
-    r'(?:\$|jQuery|axios|superagent|http)\s*\.\s*(?:ajax|get|post|getJSON|getScript|load|request|ajaxSetup|ajaxPrefilter|ajaxTransport|param|parseJSON)\s*\(|'
-    r'\.(?:load|ajaxStart|ajaxSend|ajaxSuccess|ajaxError|ajaxComplete|ajaxStop|serialize|serializeArray)\s*\(|'
-    r'\.open\s*\(\s*["\'](?:GET|POST|PUT|DELETE|PATCH)["\']|'
-    r'\bonreadystatechange\s*=|'
-    r'\.send\s*\(|'
-    r'\baxios(?:\.\w+)?\s*\(|'
-    r'new\s+WebSocket\s*\(|'
-    r'new\s+EventSource\s*\(|'
-    r'\bajax\s*:\s*function|'  # Object literal AJAX method definitions
-    r'navigator\.sendBeacon\s*\(|'  # Analytics/Tracking
-    r'new\s+ActiveXObject\s*\(|'    # Legacy IE
-    r'\bio\s*\(|'                   # Socket.io
-    r'HubConnectionBuilder|'        # SignalR
-    r'\bSys\.Net\.WebRequest\s*\(|' # Microsoft AJAX Library (Legacy)
-    r'\bPageMethods\.\w+\s*\(|'     # ASP.NET WebForms RPC
-    r'\b__doPostBack\s*\(|'         # ASP.NET Postback
-    r'\bSys\.WebForms\.PageRequestManager|' # UpdatePanel Manager
-    r'\bdata-ajax(?:-\w+)?\s*=|'    # Unobtrusive AJAX Attributes
-    r'\.setRequestHeader\s*\(|'     # XHR Header Config
-    r'\.abort\s*\(|'                # Request Cancellation
-    r'\.getResponseHeader\s*\(|'    # Header Inspection
-    r'\.getAllResponseHeaders\s*\(|'
-    r'new\s+Headers\s*\(|'          # Fetch API Headers
-    r'new\s+Request\s*\(|'          # Fetch API Request
-    r'\bJSON\.parse\s*\(|'          # Native JSON
-    r'\bJSON\.stringify\s*\(|'      # Native JSON
-    r'<\w+:UpdatePanel|'            # ASP.NET Partial Rendering
-    r'<\w+:ScriptManager|'          # ASP.NET AJAX Enabler
-    r'\bScriptManager\.RegisterStartupScript\s*\(|' # Server-Side Script Injection
-    r'\bScriptManager\.RegisterClientScriptBlock\s*\(|'
-    r'\bClientScript\.RegisterStartupScript\s*\(|'
-    r'\bClientScript\.RegisterClientScriptBlock\s*\(|'
-    r'\bPage\.ClientScript\s*\.|'
-    r'\[WebMethod\]|'               # ASP.NET AJAX Endpoint
-    r'\[ScriptMethod\]|'            # ASP.NET Script Service
-    r'\[WebService\]|'              # Legacy Web Service
-    r'\[OperationContract\]|'       # WCF
-    r'\[ApiController\]|'           # Web API 2 / Core
-    r'\[Route\(\s*["\']api/|'       # API Route
-    r'\[HubName\]|'                 # SignalR Hub
-    r'\bhubConnection\.start\s*\(|' # SignalR Client
-    r'\bClients\.All|'              # SignalR Server
-    r'\bClients\.Caller|'
-    r'@Ajax\.ActionLink|'           # Razor AJAX Helper
-    r'@Ajax\.BeginForm|'
-    r'@Url\.Action\s*\(|'           # URL Generation for AJAX
-    r'@Url\.Content\s*\(|'
-    r'<system\.web\.extensions>|'   # Web.config AJAX
-    r'<scriptResourceHandler>|'
-    r'<telerik:RadAjaxManager|'     # Telerik
-    r'<telerik:RadAjaxPanel|'
-    r'\bRadAjaxManager\b|'
-    r'\bASPxCallback|'              # DevExpress
-    r'\bASPxCallbackPanel|'
-    r'\$http\b|'                    # Angular 1.x / Vue Resource
-    r'\bthis\.http\.get\s*\(|'      # Angular HttpClient
-    r'\bthis\.http\.post\s*\(|'
-    r'\buseQuery\s*\(|'             # React/TanStack Query
-    r'\buseMutation\s*\(|'
-    r'\bnew\s+Ajax\.Request\s*\(|'  # Prototype.js
-    r'\bnew\s+Request(?:.JSON)?\s*\(|' # MooTools
-    r'\bdataType\s*:\s*["\']jsonp["\']|' # jQuery JSONP
-    r'\bResponse\.Write\s*\(\s*["\']<script|' # Server-Side Script Injection (Direct)
-    r'\bChannelFactory<|'           # WCF Client
-    r'\bHttpClient\s+|'             # Blazor / .NET HttpClient usage
-    r'\bIJSRuntime\b|'              # Blazor JS Interop
-    r'\[Http(?:Get|Post|Put|Delete|Patch|Options)\]|' # .NET API Attributes
-    r'\bbackgroundFetch\b|'         # Background Fetch API
-    r'\bIJSRuntime\b|'              # Blazor JS Interop
-    r'\[Http(?:Get|Post|Put|Delete|Patch|Options)\]|' # .NET API Attributes
-    r'\bbackgroundFetch\b|'         # Background Fetch API
-    r'target=["\']_?iframe["\']|'   # Hidden Iframe Target (Naive)
-    r'<iframe\b[^>]*style=["\'].*display:\s*none|' # Hidden Iframe (Structure)
-    r'<iframe\b[^>]*style=["\'].*display:\s*none|' # Hidden Iframe (Structure)
-    r'\bnew\s+FormData\b|'          # Form Data Constructor
-    r'\bnew\s+Image\s*\(|'          # Pixel Tracking (Image)
-    r'\.src\s*=\s*["\']http)',      # Pixel Tracking (src assignment)
-    re.IGNORECASE
-)
-
-# Server-side dependency patterns
-SERVER_PATTERNS = [
-    re.compile(r'@Model\.', re.IGNORECASE),
-    re.compile(r'@ViewBag\.', re.IGNORECASE),
-    re.compile(r'@ViewData\.', re.IGNORECASE),
-    re.compile(r'@Url\.Action', re.IGNORECASE),
-    re.compile(r'@Url\.Content', re.IGNORECASE),
-    re.compile(r'<%=', re.IGNORECASE),
-    re.compile(r'<%:', re.IGNORECASE),
-    re.compile(r'<%\s', re.IGNORECASE),
-    re.compile(r'\{\{.*?\}\}', re.IGNORECASE),  # Template engines
-    re.compile(r'\bResponse\.Write\b', re.IGNORECASE),
-    re.compile(r'\bRequest\.Form\b', re.IGNORECASE),
-]
+# The Giant Regex, its classification table and the server-side dependency
+# patterns are shared with RepoDepthAnalyser: see reposcan_shared/patterns.py
+# and reposcan_shared/ajax_patterns.py
 
 # URL extraction patterns
 URL_PATTERNS = {
@@ -153,8 +61,8 @@ def detect_ajax_patterns(snippet) -> bool:
     
     code = snippet.full_code
     
-    # 1. Run the Giant Regex
-    matches = list(AJAX_CALL_PATTERN.finditer(code))
+    # 1. Run the Giant Regex (only near its literal anchors)
+    matches = list(find_ajax_calls(code))
     
     if not matches:
         return False
@@ -164,203 +72,20 @@ def detect_ajax_patterns(snippet) -> bool:
     snippet.ajax_details = [] # Store detailed findings
 
     first_classification_done = False
+    line_index = LineIndex(code)
 
     for match in matches:
         match_str = match.group()
         lower_match = match_str.lower()
         
-        # Classification Logic (Synced with RepoDepthAnalyser)
-        capability = "Data Exchange"
-        category = "Request"
-        is_logical_request = True
-        difficulty = "Easy"
-
-        if 'sendbeacon' in lower_match:
-            capability = "Telemetry"
-        elif 'getscript' in lower_match or '.js' in lower_match:
-            capability = "Script Loading (Dynamic)"
-            difficulty = "Hard"
-        elif '.css' in lower_match:
-            capability = "CSS Loading"
-            difficulty = "Medium"
-        elif '.html' in lower_match:
-            capability = "UI Injection"
-            difficulty = "Medium"
-        elif 'load' in lower_match and 'payload' not in lower_match: 
-            capability = "UI Injection (Likely)"
-            difficulty = "Medium"
-        elif any(x in lower_match for x in ['ajaxsetup', 'ajaxprefilter', 'ajaxtransport']):
-            capability = "AJAX Configuration"
-            category = "Config"
-            is_logical_request = False
-        elif any(x in lower_match for x in ['ajaxstart', 'ajaxsend', 'ajaxsuccess', 'ajaxerror', 'ajaxcomplete', 'ajaxstop', 'onreadystatechange']):
-            capability = "Global Event Handler"
-            category = "Event"
-            is_logical_request = False
-            difficulty = "Hard (Refactoring Risk)"
-        elif any(x in lower_match for x in ['serialize', 'param', 'parsejson']):
-            capability = "Form/Data Utility"
-            category = "Utility"
-            is_logical_request = False
-        elif 'sys.net.webrequest' in lower_match:
-                capability = "Data Exchange (Legacy)"
-                difficulty = "Hard"
-        elif 'pagemethods' in lower_match:
-                capability = "RPC (Code-Behind)"
-                difficulty = "Hard"
-        elif '__dopostback' in lower_match:
-                capability = "Partial Postback"
-                difficulty = "Medium"
-        elif 'data-ajax' in lower_match:
-                capability = "Declarative AJAX"
-        elif 'sys.webforms' in lower_match:
-                capability = "UpdatePanel Config"
-                category = "Config"
-                is_logical_request = False
-                difficulty = "Hard"
-        elif any(x in lower_match for x in ['setrequestheader', 'getresponseheader', 'getallresponseheaders']):
-                capability = "Request Header Manipulation"
-                category = "Config"
-                is_logical_request = False
-                difficulty = "Medium"
-        elif 'abort' in lower_match:
-                capability = "Request Control"
-                category = "Utility"
-                is_logical_request = False
-        elif 'json.parse' in lower_match or 'json.stringify' in lower_match:
-                capability = "JSON Utility"
-                category = "Utility"
-                is_logical_request = False
-        elif 'new headers' in lower_match or 'new request' in lower_match:
-                capability = "Fetch API Construct"
-                category = "Construct"
-                is_logical_request = False
-        elif 'updatepanel' in lower_match:
-                capability = "Partial Rendering (UpdatePanel)"
-                difficulty = "Hard"
-        elif 'scriptmanager' in lower_match or 'clientscript' in lower_match:
-                capability = "Server-Side Script Injection"
-                category = "Server"
-                is_logical_request = False
-                difficulty = "Hard"
-        elif 'webmethod' in lower_match or 'scriptmethod' in lower_match or 'webservice' in lower_match:
-                capability = "AJAX Endpoint (Server)"
-                category = "Server"
-                is_logical_request = False
-                difficulty = "Medium"
-        elif 'apicontroller' in lower_match or '[route' in lower_match:
-                capability = "API Endpoint (Server)"
-                category = "Server"
-                is_logical_request = False
-                difficulty = "Medium"
-        elif 'operationcontract' in lower_match:
-                capability = "WCF Endpoint (Server)"
-                category = "Server"
-                is_logical_request = False
-                difficulty = "Hard"
-        elif 'hubname' in lower_match or 'clients.all' in lower_match or 'clients.caller' in lower_match:
-                capability = "SignalR Hub (Server)"
-                category = "Server"
-                is_logical_request = False
-                difficulty = "Hard"
-        elif 'hubconnection' in lower_match:
-                capability = "SignalR Client"
-                category = "Real-time"
-        elif '@ajax' in lower_match:
-                capability = "Razor AJAX Helper"
-        elif '@url' in lower_match:
-                capability = "Dynamic URL Generation"
-                category = "Construct"
-                is_logical_request = False
-        elif '<system.web.extensions>' in lower_match or 'scriptresourcehandler' in lower_match:
-                capability = "AJAX Configuration"
-                category = "Config"
-                is_logical_request = False
-                difficulty = "Medium"
-        elif 'radajax' in lower_match or 'telerik' in lower_match:
-                capability = "Telerik AJAX Control"
-                category = "Third-Party"
-                difficulty = "Hard (Vendor Lock-in)"
-        elif 'aspxcallback' in lower_match:
-                capability = "DevExpress AJAX Control"
-                category = "Third-Party"
-                difficulty = "Hard (Vendor Lock-in)"
-        elif 'response.write' in lower_match:
-                capability = "Direct Script Injection"
-                category = "Server"
-                is_logical_request = False
-                difficulty = "High (Security Risk)"
-        elif 'channelfactory' in lower_match:
-                capability = "WCF Client Proxy"
-                category = "Server"
-                difficulty = "Hard"
-        elif 'httpclient' in lower_match:
-                capability = ".NET HttpClient"
-                category = "Server/Blazor"
-        elif 'ijsruntime' in lower_match:
-                capability = "Blazor JS Interop"
-                category = "Blazor"
-                is_logical_request = False
-                difficulty = "Medium"
-        elif '[http' in lower_match:
-                capability = "API Endpoint Verb"
-                category = "Server"
-                is_logical_request = False
-        elif 'backgroundfetch' in lower_match:
-                capability = "Background Sync/Fetch"
-                category = "Service Worker"
-                difficulty = "Medium"
-        elif 'iframe' in lower_match:
-                capability = "Hidden Iframe (Pseudo-AJAX)"
-                category = "Legacy Pattern"
-                difficulty = "Hard"
-        elif 'formdata' in lower_match:
-                capability = "Form Data Construction"
-                category = "Construct"
-                is_logical_request = False
-        elif 'new image' in lower_match or '.src' in lower_match:
-                capability = "Pixel Tracking (Image)"
-        elif 'usequery' in lower_match or 'usemutation' in lower_match:
-                capability = "Modern Data Fetching (React Query)"
-                category = "Modern Framework"
-        elif 'this.http' in lower_match:
-                capability = "Angular HttpClient"
-                category = "Modern Framework"
-        elif 'ajax.request' in lower_match or 'new request' in lower_match:
-                if 'ajax.request' in lower_match:
-                    capability = "Prototype.js AJAX"
-                    category = "Legacy Lib"
-                    difficulty = "Hard"
-                else:
-                    capability = "MooTools/Fetch Request"
-                    if 'mootools' in lower_match: 
-                        category = "Legacy Lib" 
-                    else: 
-                        category = "Construct"
-                    is_logical_request = True # Keeping as request for now
-                    difficulty = "Hard"
-        elif 'jsonp' in lower_match:
-                capability = "JSONP (Legacy Cross-Domain)"
-                category = "Legacy Pattern"
-                difficulty = "Hard (Security Risk)"
-        elif 'new xmlhttprequest' in lower_match or '.open' in lower_match:
-                capability = "XHR Construct"
-                category = "Construct"
-                is_logical_request = False
-                if 'xmlhttprequest' in lower_match: is_logical_request = False
-                else: is_logical_request = True # open is start
+        # Classification (one table lookup on the matched alternative)
+        category, capability, difficulty, is_logical_request = classify_ajax_match(match)
         
         # Determine Endpoint based on the match type
         endpoint = extract_endpoint_url(code, lower_match)
 
-        # Populate Details (Line Number calculation is rough here since we are working on a snippet)
-        # We can try to find the line relative to the snippet start
-        # start_offset = match.start()
-        # rel_line = code[:start_offset].count('\n') 
-        # abs_line = snippet.start_line + rel_line
-        
-        relative_line_offset = code[:match.start()].count('\\n')
-        absolute_line = snippet.start_line + relative_line_offset
+        # Line of the match relative to the snippet start
+        absolute_line = snippet.start_line + line_index.line_of(match.start()) - 1
 
         detail = {
             'Line': absolute_line,
@@ -387,11 +112,7 @@ def detect_ajax_patterns(snippet) -> bool:
     snippet.is_inline_ajax = is_inline_ajax(snippet.file_path)
     
     # Check for server dependencies
-    snippet.has_server_deps = False
-    for dep_pattern in SERVER_PATTERNS:
-        if dep_pattern.search(code):
-            snippet.has_server_deps = True
-            break
+    snippet.has_server_deps = patterns.get('server_dependency').search(code) is not None
             
     return True
 
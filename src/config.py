@@ -9,8 +9,24 @@ class ScannerConfig:
         self.root_folder: str = "."
         self.output_folder: str = "."
         self.include_extensions: Set[str] = set()
+        self.exclude_folders: List[str] = [] # .gitignore-style rules (see path_matcher.py)
+        self.exclude_files: List[str] = []
         self.max_file_size_mb: int = 10
+        self.oversized_files: str = "skip" # Files over max_file_size_mb: window (scan in windows) or skip
         self.snippet_max_length: int = 500
+        # Performance
+        self.workers: int = 1 # Analysis processes (<= 0 means one per CPU)
+        self.discovery_threads: int = 1 # Concurrent folder listings during discovery (1 = sequential)
+        self.discovery: str = "walk" # walk (list folders) or git (files tracked in .git/index)
+        self.read_threads: int = 4 # Files read concurrently by the pipeline
+        self.queue_depth: int = 64 # Files in flight between discovery and the findings sink
+        self.incremental: bool = False # Reuse findings of unchanged files from the scan manifest
+        self.parser_backend: str = "bs4" # HTML backend: bs4 (tree) or stream (tokenizer)
+        # Vendor
+        self.skip_vendor: bool = False # Summarise known third-party libraries instead of analysing them
+        self.vendor_index_file: str = "vendor_libraries.json" # Local additions to the library index (optional)
+        # Depth
+        self.depth_report: bool = False # Also write the Depth Analyser workbook from the same read of each file
         # Phase 2 Args
         self.target_url: str = None
         self.mode: str = "static" # static, dynamic, combined, extract
@@ -35,16 +51,40 @@ class ScannerConfig:
             exts = parser['Filters'].get('include_extensions', '')
             config.include_extensions = {e.strip().lower() for e in exts.split(',') if e.strip()}
             
+            # Exclusion rules keep their order: with !negation the last matching rule wins
             folders = parser['Filters'].get('exclude_folders', '')
-            config.exclude_folders = {f.strip() for f in folders.split(',') if f.strip()}
+            config.exclude_folders = [f.strip() for f in folders.split(',') if f.strip()]
             
             files = parser['Filters'].get('exclude_files', '')
-            config.exclude_files = {f.strip() for f in files.split(',') if f.strip()}
+            config.exclude_files = [f.strip() for f in files.split(',') if f.strip()]
 
         # Limits
         if 'Limits' in parser:
             config.max_file_size_mb = int(parser['Limits'].get('max_file_size_mb', 10))
             config.snippet_max_length = int(parser['Limits'].get('snippet_max_length', 500))
+            config.oversized_files = parser['Limits'].get('oversized_files', 'skip').strip().lower()
+
+        # Performance
+        if 'Performance' in parser:
+            config.workers = int(parser['Performance'].get('workers', 1))
+            config.discovery_threads = int(parser['Performance'].get('discovery_threads', 1))
+            config.discovery = parser['Performance'].get('discovery', 'walk').strip().lower()
+            config.read_threads = int(parser['Performance'].get('read_threads', 4))
+            config.queue_depth = int(parser['Performance'].get('queue_depth', 64))
+            config.incremental = parser['Performance'].getboolean('incremental', False)
+
+        # Parser
+        if 'Parser' in parser:
+            config.parser_backend = parser['Parser'].get('backend', 'bs4').strip().lower()
+
+        # Vendor
+        if 'Vendor' in parser:
+            config.skip_vendor = parser['Vendor'].getboolean('skip_known_libraries', False)
+            config.vendor_index_file = parser['Vendor'].get('index_file', 'vendor_libraries.json').strip()
+
+        # Depth
+        if 'Depth' in parser:
+            config.depth_report = parser['Depth'].getboolean('report', False)
 
         return config
 
@@ -56,6 +96,14 @@ class ScannerConfig:
                 os.makedirs(self.output_folder)
             except OSError as e:
                 raise ValueError(f"Could not create output folder: {self.output_folder}. Error: {e}")
+        if self.discovery not in ("walk", "git"):
+            raise ValueError(f"Unknown discovery method: {self.discovery} (expected walk or git)")
+        if self.oversized_files not in ("window", "skip"):
+            raise ValueError(f"Unknown oversized_files mode: {self.oversized_files} (expected window or skip)")
+        if self.read_threads < 1 or self.queue_depth < 1:
+            raise ValueError("read_threads and queue_depth must be at least 1")
+        if self.parser_backend not in ("bs4", "stream"):
+            raise ValueError(f"Unknown parser backend: {self.parser_backend} (expected bs4 or stream)")
 
 def parse_arguments() -> ScannerConfig:
     parser = argparse.ArgumentParser(description="RepoScan-Analyser: Static & Dynamic Assessment Utility")
@@ -63,6 +111,15 @@ def parse_arguments() -> ScannerConfig:
     parser.add_argument("--root", help="Root folder to scan (overrides config)")
     parser.add_argument("--output", help="Output folder (overrides config)")
     parser.add_argument("--url", help="Target URL for Dynamic/Combined scan")
+    parser.add_argument("--workers", type=int, help="Number of analysis processes (0 = one per CPU, overrides config)")
+    parser.add_argument("--discovery-threads", type=int, help="Concurrent folder listings during discovery, for network shares (overrides config)")
+    parser.add_argument("--discovery", choices=["walk", "git"], help="Walk the folders, or list the files tracked in the git index (overrides config)")
+    parser.add_argument("--incremental", action="store_true", help="Reuse findings of unchanged files from the scan manifest")
+    parser.add_argument("--full-scan", action="store_true", help="Ignore the scan manifest and re-analyse every file")
+    parser.add_argument("--skip-vendor", action="store_true", help="Summarise known third-party libraries instead of analysing them")
+    parser.add_argument("--analyse-vendor", action="store_true", help="Analyse known third-party libraries in full instead of summarising them")
+    parser.add_argument("--parser-backend", choices=["bs4", "stream"], help="HTML parser backend (overrides config)")
+    parser.add_argument("--depth-report", action="store_true", help="Also write the Application Depth Tracker, from the same scan")
     
     # Action Flags
     group = parser.add_mutually_exclusive_group()
@@ -91,6 +148,24 @@ def parse_arguments() -> ScannerConfig:
         config.output_folder = args.output
     if args.url:
         config.target_url = args.url
+    if args.workers is not None:
+        config.workers = args.workers
+    if args.discovery_threads is not None:
+        config.discovery_threads = args.discovery_threads
+    if args.discovery:
+        config.discovery = args.discovery
+    if args.incremental:
+        config.incremental = True
+    if args.full_scan:
+        config.incremental = False
+    if args.parser_backend:
+        config.parser_backend = args.parser_backend
+    if args.skip_vendor:
+        config.skip_vendor = True
+    if args.analyse_vendor:
+        config.skip_vendor = False
+    if args.depth_report:
+        config.depth_report = True
         
     config.validate()
     return config
@@ -0,0 +1,431 @@
+"""
+Analysis Engine for RepoScan
+
+Reads, decodes and parses the discovered files (Parser.parse with the
+configured HTML backend) as the stages of a pipeline.Pipeline, so
+discovery, reading and parsing overlap: serially (default) or on a
+process pool for large ASPX/Razor estates, where each worker gets a
+batch of read files per task. Results are streamed back in discovery
+order, so the caller can report progress as they arrive.
+
+It also parses each distinct file content once: identical copies (the
+same jquery-*.js in twenty folders) get the first copy's findings.
+Files a VendorIndex recognises as a known library are not parsed at all;
+they get one summary finding. So do files over the size limit: instead
+of being read whole they are scanned in windows (reposcan_shared.windowed)
+for pattern counts and line numbers.
+
+With depth=True each file also gets its Depth Analyser metrics
+(repo_depth_analyser), computed from the same read and decoded text, so
+one scan feeds both workbooks.
+"""
+
+import os
+import copy
+import hashlib
+import threading
+import collections
+import concurrent.futures
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .reader import DirectoryEncodings, FileReader, STRATEGY_BOM, STRATEGY_UTF8, needs_folder_encoding
+from .parser import Parser, CodeSnippet, DYNAMIC_GROUP_NAMES
+from .manifest import content_digest
+from .pipeline import Pipeline, DEFAULT_READ_THREADS, DEFAULT_QUEUE_DEPTH
+from .vendor_index import VendorIndex, VendorMatch
+from reposcan_shared import patterns
+from reposcan_shared.ajax_patterns import ajax_prefilter, find_ajax_calls
+from reposcan_shared.enrichment import dynamic_group_prefilters
+from reposcan_shared.windowed import WindowedScan, WINDOW_BYTES
+from repo_depth_analyser.src import scanner as depth_scanner
+
+DEFAULT_BATCH = 16     # Read results handed to a pool worker per task
+OVERSIZED_LINES = 100  # Line numbers kept per pattern in an oversized file's finding
+
+# Patterns counted in oversized files (besides the AJAX regex; the dynamic code groups are counted too)
+OVERSIZED_PATTERNS = ('inline_js', 'internal_script_blocks', 'external_script_tags',
+                      'inline_css', 'internal_style_blocks', 'external_stylesheet_links')
+
+
+class FileResult(NamedTuple):
+    file_path: str
+    findings: Optional[List[CodeSnippet]]  # None when the file could not be read or parsed
+    encoding: str                          # Detected encoding, or the read error message
+    error: str = ""                        # Parse error message, if any
+    digest: str = ""                       # Content hash of the raw file
+    unchanged: bool = False                # Content matches the known digest; findings were not recomputed
+    ajax_scans: Tuple[int, int] = (0, 0)   # AJAX regex scans requested / avoided by the literal prefilter
+    decode_strategy: str = ""              # How the encoding was chosen (see reader.STRATEGY_*)
+    cached: bool = False                   # Findings were carried over by the caller (scan manifest)
+    shared: bool = False                   # Findings copied from an identical file parsed earlier in the run
+    vendor: str = ""                       # Known library the file was classified as (not parsed)
+    windowed: bool = False                 # Over the size limit: scanned in windows, not parsed
+    depth: Optional[dict] = None           # Depth Analyser entry (depth_scanner.file_record), with depth=True
+    tier: str = ""                         # How Parser.parse handled the file (parser.PARSE_TIERS)
+
+
+class _Oversized(NamedTuple):
+    """A file over the size limit, left unread by the read stage for a windowed scan."""
+    file_path: str
+    known_digest: Optional[str]
+    size: int
+
+
+# One Parser per worker process, built by the pool initializer so that
+# every worker compiles its patterns exactly once
+_worker_parser: Optional[Parser] = None
+
+
+def _init_worker(parser_backend: str):
+    global _worker_parser
+    _worker_parser = Parser(parser_backend)
+
+
+# The Depth Analyser's patterns, built on first use in each process
+_depth: Optional[depth_scanner.Scanner] = None
+
+
+def _depth_analyser() -> depth_scanner.Scanner:
+    global _depth
+    if _depth is None:
+        _depth = depth_scanner.Scanner(os.curdir)
+    return _depth
+
+
+def _depth_record(file_path: str, size: int, content: str) -> dict:
+    """The Depth Analyser's entry for a file, from its decoded text."""
+    ext = os.path.splitext(file_path)[1].lower()
+    return depth_scanner.file_record(file_path, size, _depth_analyser().analyze_text(content, ext))
+
+
+def _read_file(file_path: str, known_digest: Optional[str] = None, size: Optional[int] = None,
+               vendor_index: Optional[VendorIndex] = None, window_above: Optional[int] = None,
+               depth: bool = False, encodings: Optional[DirectoryEncodings] = None):
+    """
+    Returns (file_path, raw_data, digest, folder_encoding) to parse, the
+    final FileResult (read error, unchanged, vendor), or an _Oversized file
+    to scan. folder_encoding is looked up in encodings, here in the parent,
+    only for a file that is neither BOM-marked nor UTF-8.
+    """
+    if window_above is not None and size is not None and size > window_above:
+        return _Oversized(file_path, known_digest, size)
+    try:
+        raw_data = FileReader.read_bytes(file_path, size)
+    except Exception as e:
+        return FileResult(file_path, None, str(e))
+
+    digest = content_digest(raw_data)
+    if digest == known_digest:
+        return FileResult(file_path, None, "", digest=digest, unchanged=True)
+
+    folder_encoding = None
+    if encodings is not None and needs_folder_encoding(raw_data):
+        folder_encoding = encodings.encoding_for(file_path)
+
+    if vendor_index is not None:
+        match = vendor_index.classify(file_path, raw_data, digest)
+        if match:
+            depth_record = None
+            if depth:
+                content = FileReader.decode_with_strategy(raw_data, folder_encoding)[0]
+                depth_record = _depth_record(file_path, len(raw_data), content) if content is not None else None
+            return FileResult(file_path, [_vendor_finding(file_path, raw_data, match)], "", digest=digest,
+                              vendor=match.label, depth=depth_record)
+    return file_path, raw_data, digest, folder_encoding
+
+
+def _vendor_finding(file_path: str, raw_data: bytes, match: VendorMatch) -> CodeSnippet:
+    """The single finding that stands in for a known library's file."""
+    finding = CodeSnippet(file_path, 1, raw_data.count(b'\n') + 1, 'Vendor', match.label, 'Vendor Library',
+                          source_type='LOCAL')
+    finding.identified_by = match.matched_by
+    return finding
+
+
+class _HashingReader:
+    """File wrapper that hashes what is read, so a windowed scan also yields the content digest."""
+    def __init__(self, f, size: int):
+        self.f = f
+        self.size = size
+        self.bytes_read = 0
+        self.digest = hashlib.sha1(b'blob %d\0' % size)  # Same as git_index.blob_id
+
+    def read(self, n: int) -> bytes:
+        data = self.f.read(n)
+        self.bytes_read += len(data)
+        self.digest.update(data)
+        return data
+
+
+def _stream_digest(f, size: int) -> str:
+    """content_digest of the next size bytes of f, read a window at a time."""
+    reader = _HashingReader(f, size)
+    while reader.bytes_read < size and reader.read(min(WINDOW_BYTES, size - reader.bytes_read)):
+        pass
+    return reader.digest.hexdigest()
+
+
+def _scan_oversized(file_path: str, known_digest: Optional[str], depth: bool = False) -> FileResult:
+    """One summary finding for a file over the size limit, from a windowed scan (constant memory)."""
+    finders = {name: patterns.get_bytes(name).finditer for name in OVERSIZED_PATTERNS}
+    finders['ajax'] = find_ajax_calls
+    # Each dynamic code group on its own, like the snippet enrichment counts
+    for group, prefilter in dynamic_group_prefilters().items():
+        finders[DYNAMIC_GROUP_NAMES[group]] = prefilter.finditer
+
+    # The depth metrics come from the same windows (the shared patterns run once)
+    depth_finders = {}
+    if depth:
+        depth_analyser = _depth_analyser()
+        depth_metrics, depth_counts = depth_scanner.new_metrics(), collections.Counter()
+        if os.path.splitext(file_path)[1].lower() in depth_scanner.WEB_EXTENSIONS:
+            depth_finders = depth_analyser.window_finders()
+            finders = dict(depth_finders, **finders)
+
+    counts = collections.Counter()
+    lines = collections.defaultdict(list)
+    reported = set(OVERSIZED_PATTERNS) | {'ajax'} | set(DYNAMIC_GROUP_NAMES.values())
+    try:
+        with open(file_path, 'rb') as f:
+            # The size now, not at discovery: the digest must be the blob id of what is read
+            size = os.fstat(f.fileno()).st_size
+            if known_digest is not None:
+                # Changed on disk since the last run: hash first, and only scan if the content changed
+                digest = _stream_digest(f, size)
+                if digest == known_digest:
+                    return FileResult(file_path, None, "", digest=digest, unchanged=True)
+                f.seek(0)
+
+            reader = _HashingReader(f, size)
+            scan = WindowedScan(reader, finders)
+            for hit in scan:
+                if hit.name in depth_finders:
+                    depth_analyser.record_window_hit(depth_metrics, depth_counts, hit)
+                if hit.name not in reported:
+                    continue
+                counts[hit.name] += 1
+                if len(lines[hit.name]) < OVERSIZED_LINES:
+                    lines[hit.name].append(hit.line)
+
+            digest = reader.digest.hexdigest()
+            if reader.bytes_read != size:
+                # The file was resized while it was scanned
+                f.seek(0)
+                digest = _stream_digest(f, reader.bytes_read)
+    except Exception as e:
+        return FileResult(file_path, None, str(e))
+
+    depth_record = None
+    if depth:
+        depth_analyser.finish_window_metrics(depth_metrics, depth_counts, scan.lines)
+        depth_record = depth_scanner.file_record(file_path, scan.size, depth_metrics)
+
+    summary = f"{scan.size / (1024 * 1024):,.1f} MB, {scan.lines:,} lines; scanned in windows, not parsed"
+    finding = CodeSnippet(file_path, 1, scan.lines, 'Oversized', summary, 'Oversized File', source_type='LOCAL')
+    finding.pattern_counts = dict(counts)
+    finding.match_lines = dict(lines)
+    return FileResult(file_path, [finding], "", digest=digest, windowed=True, depth=depth_record)
+
+
+def _parse_file(parser: Parser, file_path: str, raw_data: bytes, digest: str,
+                folder_encoding: Optional[str] = None, depth: bool = False) -> FileResult:
+    content, encoding, strategy = FileReader.decode_with_strategy(raw_data, folder_encoding)
+    if content is None:
+        return FileResult(file_path, None, encoding, digest=digest)
+    depth_record = _depth_record(file_path, len(raw_data), content) if depth else None
+
+    stats = ajax_prefilter().stats
+    scans, avoided, _ = stats.snapshot()
+    try:
+        findings = parser.parse(file_path, content)
+    except Exception as e:
+        return FileResult(file_path, None, encoding, str(e), digest=digest, decode_strategy=strategy,
+                          depth=depth_record)
+
+    scans_after, avoided_after, _ = stats.snapshot()
+    return FileResult(file_path, findings, encoding, digest=digest,
+                      ajax_scans=(scans_after - scans, avoided_after - avoided), decode_strategy=strategy,
+                      depth=depth_record, tier=parser.last_tier)
+
+
+def _parse_batch(read_results: List[Tuple[str, bytes, str, Optional[str]]], depth: bool = False) -> List[FileResult]:
+    """Pool task: decodes and parses a batch of files read by the pipeline, with the worker's Parser."""
+    return [_parse_file(_worker_parser, *read_result, depth=depth) for read_result in read_results]
+
+
+class _SharedParses:
+    """
+    Parses each distinct (content, extension) once per run. The findings
+    depend on nothing else, except when the encoding came from the folder
+    (see reader.decode_with_strategy); so only results decoded from a BOM
+    or strict UTF-8 are shared, anything else is parsed per copy.
+
+    Called with a batch of read results, it parses the ones whose content
+    is new in one call of parse_files, and copies the findings of the rest
+    from the first copy (waiting for it when another thread is parsing it).
+    """
+
+    _SHAREABLE = (STRATEGY_BOM, STRATEGY_UTF8)
+
+    def __init__(self, parse_files: Callable[[List[Tuple[str, bytes, str, Optional[str]]]], List[FileResult]]):
+        self.parse_files = parse_files
+        self._lock = threading.Lock()
+        self._results: Dict[Tuple[str, str], Optional[FileResult]] = {}  # None: not shareable
+        self._pending: Dict[Tuple[str, str], threading.Event] = {}
+
+    def __call__(self, read_results: List[Tuple[str, bytes, str, Optional[str]]]) -> List[FileResult]:
+        results: List[Optional[FileResult]] = [None] * len(read_results)
+        first, copies = [], []   # (index, key) parsed here / copied from a first copy
+        with self._lock:
+            for i, (file_path, _, digest, _) in enumerate(read_results):
+                key = (digest, os.path.splitext(file_path)[1].lower())
+                if key in self._results or key in self._pending:
+                    copies.append((i, key))
+                else:
+                    self._pending[key] = threading.Event()
+                    first.append((i, key))
+
+        parsed = []
+        try:
+            if first:
+                parsed = self.parse_files([read_results[i] for i, _ in first])
+        finally:
+            with self._lock:
+                for n, (i, key) in enumerate(first):
+                    result = parsed[n] if n < len(parsed) else None
+                    shareable = (result is not None and result.findings is not None
+                                 and result.decode_strategy in self._SHAREABLE)
+                    self._results[key] = result if shareable else None
+                    self._pending.pop(key).set()
+        for (i, _), result in zip(first, parsed):
+            results[i] = result
+
+        unshared = []
+        for i, key in copies:
+            with self._lock:
+                pending = self._pending.get(key)
+            if pending is not None:
+                # An identical file is being parsed on another thread
+                pending.wait()
+            with self._lock:
+                original = self._results[key]
+            if original is None:
+                unshared.append(i)
+            else:
+                results[i] = self._copy(original, read_results[i][0], read_results[i][2])
+        if unshared:
+            for i, result in zip(unshared, self.parse_files([read_results[i] for i in unshared])):
+                results[i] = result
+        return results
+
+    @staticmethod
+    def _copy(original: FileResult, file_path: str, digest: str) -> FileResult:
+        findings = []
+        for finding in original.findings:
+            finding = copy.copy(finding)
+            finding.file_path = file_path
+            findings.append(finding)
+        depth = original.depth and depth_scanner.file_record(file_path, original.depth['size_kb'] * 1024,
+                                                             original.depth['metrics'])
+        return FileResult(file_path, findings, original.encoding, digest=digest,
+                          decode_strategy=original.decode_strategy, shared=True, depth=depth)
+
+
+def resolve_workers(workers: int) -> int:
+    """Maps the configured worker count to a concrete one (<= 0 means one per CPU)."""
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+class _LazyPool:
+    """
+    A process pool that starts on the first submit, i.e. inside
+    Pipeline.run(), and is shut down by close() when the run ends. A
+    pipeline that is built but never run starts no processes.
+    """
+
+    def __init__(self, workers: int, parser_backend: str):
+        self.workers = workers
+        self.parser_backend = parser_backend
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args) -> concurrent.futures.Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker, initargs=(self.parser_backend,))
+            executor = self._executor
+        return executor.submit(fn, *args)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+def analysis_pipeline(workers: int = 1, read_threads: int = DEFAULT_READ_THREADS,
+                      queue_depth: int = DEFAULT_QUEUE_DEPTH, parser_backend: str = 'bs4',
+                      vendor_index: Optional[VendorIndex] = None, window_above: Optional[int] = None,
+                      depth: bool = False) -> Pipeline:
+    """
+    A Pipeline whose run() takes (file_path, known_digest, size) items and
+    yields one FileResult per item, in input order. Files are read on
+    read_threads threads and parsed on a process pool with workers > 1;
+    a file identical to one parsed earlier in the run is not parsed again
+    (FileResult.shared), and with a vendor_index known libraries are
+    summarised without parsing (FileResult.vendor). A pool worker gets
+    up to DEFAULT_BATCH read results per task. Files larger than
+    window_above bytes are not read whole but scanned in windows on the
+    parse stage (FileResult.windowed). With depth=True every result read
+    from disk also carries the file's Depth Analyser entry
+    (FileResult.depth). A FileResult passed in as an item (e.g. cached
+    findings) is yielded unchanged, in its place.
+    """
+    workers = resolve_workers(workers)
+    encodings = DirectoryEncodings()
+
+    def read(item):
+        return item if isinstance(item, FileResult) else _read_file(*item, vendor_index=vendor_index,
+                                                                    window_above=window_above, depth=depth,
+                                                                    encodings=encodings)
+
+    pool = None
+    if workers == 1:
+        parser = Parser(parser_backend)
+        shared_parses = _SharedParses(lambda read_results: [_parse_file(parser, *read_result, depth=depth)
+                                                            for read_result in read_results])
+        scan_oversized = lambda file_path, known_digest: _scan_oversized(file_path, known_digest, depth)
+    else:
+        pool = _LazyPool(workers, parser_backend)
+        shared_parses = _SharedParses(lambda read_results: pool.submit(_parse_batch, read_results, depth).result())
+        scan_oversized = lambda file_path, known_digest: pool.submit(_scan_oversized, file_path, known_digest,
+                                                                     depth).result()
+
+    def parse(read_results):
+        results = list(read_results)   # A FileResult is final as it is
+        to_parse = []
+        for i, read_result in enumerate(read_results):
+            if isinstance(read_result, _Oversized):
+                results[i] = scan_oversized(read_result.file_path, read_result.known_digest)
+            elif not isinstance(read_result, FileResult):
+                to_parse.append(i)
+        if to_parse:
+            for i, result in zip(to_parse, shared_parses([read_results[i] for i in to_parse])):
+                results[i] = result
+        return results
+
+    def work_size(read_result):
+        # Bytes to parse; results that need no parsing go first
+        if isinstance(read_result, _Oversized):
+            return read_result.size
+        return 0 if isinstance(read_result, FileResult) else len(read_result[1])
+
+    # With a pool, one parser thread per process keeps every process busy,
+    # each handing its process a batch at a time; the largest files waiting
+    # are parsed first
+    return Pipeline(read, parse, readers=read_threads, parsers=workers, depth=queue_depth,
+                    on_close=pool.close if pool else None, work_size=work_size,
+                    batch=DEFAULT_BATCH if pool else 1)
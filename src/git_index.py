@@ -0,0 +1,196 @@
+"""
+Git Index Reader for RepoScan Discovery
+
+Enumerates the files tracked by a git checkout by reading .git/index
+directly (no git executable needed), with the size, mtime and blob id
+git cached for each. Discovery then touches only tracked files instead of
+listing every folder, untracked build output included.
+
+Supports index versions 2-4. Layouts this reader cannot resolve on its
+own (split index, sparse-directory entries, SHA-256 repositories) raise
+GitIndexError, and the caller falls back to walking the folder.
+"""
+
+import os
+import re
+import struct
+import hashlib
+from typing import List, NamedTuple, Tuple
+
+_HEADER = struct.Struct('>4sII')
+# ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size, sha-1, flags
+_ENTRY = struct.Struct('>10I20sH')
+
+_EXTENDED = 0x4000        # flags: a second 16-bit flags word follows (v3+)
+_SKIP_WORKTREE = 0x4000   # extended flags: not checked out (sparse checkout)
+_INTENT_TO_ADD = 0x2000   # extended flags: `git add -N`, the blob id is a placeholder
+
+MODE_FILE = 0o100000
+MODE_SYMLINK = 0o120000
+MODE_GITLINK = 0o160000   # Submodule: its files live in its own index
+MODE_DIRECTORY = 0o040000  # Sparse-directory entry
+
+
+class GitIndexError(Exception):
+    pass
+
+
+class IndexEntry(NamedTuple):
+    path: str       # '/'-separated; relative to the worktree (read_index) or the scan root (tracked_files)
+    mode: int       # Object type bits (MODE_FILE, MODE_SYMLINK, MODE_GITLINK)
+    size: int       # Size git cached (truncated to 32 bits, as git stores it)
+    mtime_ns: int   # mtime git cached
+    blob_id: str    # Hex blob id, or "" when it does not describe the file (conflict, intent-to-add)
+
+
+def blob_id(raw_data: bytes) -> str:
+    """The git blob id of raw_data (what `git hash-object` prints)."""
+    digest = hashlib.sha1(b'blob %d\0' % len(raw_data))
+    digest.update(raw_data)
+    return digest.hexdigest()
+
+
+def find_worktree(path: str) -> Tuple[str, str]:
+    """(worktree root, git dir) of the checkout containing path."""
+    path = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(path, '.git')
+        if os.path.isdir(dot_git):
+            return path, dot_git
+        if os.path.isfile(dot_git):
+            # Linked worktree or submodule: ".git" is a "gitdir: <path>" pointer
+            try:
+                with open(dot_git, 'r', encoding='utf-8') as f:
+                    pointer = f.read().strip()
+            except OSError as e:
+                raise GitIndexError(f"cannot read {dot_git}: {e}")
+            if not pointer.startswith('gitdir:'):
+                raise GitIndexError(f"unrecognised {dot_git}")
+            return path, os.path.normpath(os.path.join(path, pointer[len('gitdir:'):].strip()))
+
+        parent = os.path.dirname(path)
+        if parent == path:
+            raise GitIndexError("not inside a git checkout")
+        path = parent
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """git's offset varint (index v4 path compression)."""
+    c = data[pos]
+    pos += 1
+    value = c & 0x7f
+    while c & 0x80:
+        c = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (c & 0x7f)
+    return value, pos
+
+
+def read_index(index_path: str) -> List[IndexEntry]:
+    """Every worktree entry of the index file, in index (path) order."""
+    try:
+        with open(index_path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        raise GitIndexError(f"cannot read {index_path}: {e}")
+
+    if len(data) < _HEADER.size + 20:
+        raise GitIndexError("index file is truncated")
+    signature, version, count = _HEADER.unpack_from(data)
+    if signature != b'DIRC' or version not in (2, 3, 4):
+        raise GitIndexError(f"unsupported index format ({signature!r}, version {version})")
+
+    entries = []
+    pos = _HEADER.size
+    previous_path = b''
+    for _ in range(count):
+        fields = _ENTRY.unpack_from(data, pos)
+        start = pos
+        pos += _ENTRY.size
+        mtime_s, mtime_ns, mode, size, sha, flags = fields[2], fields[3], fields[6], fields[9], fields[10], fields[11]
+
+        extended = 0
+        if flags & _EXTENDED and version >= 3:
+            extended, = struct.unpack_from('>H', data, pos)
+            pos += 2
+
+        if version == 4:
+            strip, pos = _read_varint(data, pos)
+            end = data.index(b'\0', pos)
+            path = previous_path[:len(previous_path) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            end = data.index(b'\0', pos)
+            path = data[pos:end]
+            # Entries are NUL-padded to a multiple of 8 bytes
+            pos = start + ((end - start + 8) & ~7)
+        previous_path = path
+
+        object_type = mode & 0o170000
+        if object_type == MODE_DIRECTORY:
+            raise GitIndexError("sparse index (directory entries)")
+        if extended & _SKIP_WORKTREE:
+            continue
+
+        stage = (flags >> 12) & 0x3
+        known = stage == 0 and not extended & _INTENT_TO_ADD
+        entry = IndexEntry(path.decode('utf-8', 'surrogateescape'), object_type, size,
+                           mtime_s * 1_000_000_000 + mtime_ns, sha.hex() if known else "")
+        if entries and entries[-1].path == entry.path:
+            # Unmerged path: one entry per conflict stage, none describes the file
+            entries[-1] = entry._replace(blob_id="")
+            continue
+        entries.append(entry)
+
+    # Extensions: a split index keeps most entries in a shared index file
+    while pos + 8 <= len(data) - 20:
+        signature, size = struct.unpack_from('>4sI', data, pos)
+        if signature == b'link':
+            raise GitIndexError("split index")
+        pos += 8 + size
+
+    return entries
+
+
+def tracked_files(root: str) -> Tuple[List[IndexEntry], int]:
+    """
+    The index entries under root, with paths relative to root, and the
+    index file's mtime (entries modified at or after it are "racy": git
+    cannot vouch for their cached stat data).
+    """
+    worktree, git_dir = find_worktree(root)
+    try:
+        with open(os.path.join(git_dir, 'config'), 'r', encoding='utf-8', errors='replace') as f:
+            if re.search(r'objectformat\s*=\s*sha256', f.read(), re.IGNORECASE):
+                raise GitIndexError("SHA-256 repository")
+    except OSError:
+        pass
+
+    index_path = os.path.join(git_dir, 'index')
+    try:
+        index_mtime_ns = os.stat(index_path).st_mtime_ns
+    except OSError as e:
+        raise GitIndexError(f"no index ({e})")
+    entries = read_index(index_path)
+
+    prefix = os.path.relpath(os.path.abspath(root), worktree).replace(os.sep, '/')
+    if prefix == '.':
+        return entries, index_mtime_ns
+    prefix += '/'
+    return [e._replace(path=e.path[len(prefix):]) for e in entries if e.path.startswith(prefix)], index_mtime_ns
+
+
+def stat_matches(entry: IndexEntry, st: os.stat_result, index_mtime_ns: int) -> bool:
+    """
+    Whether git's cached stat data still describes the file, i.e. the file
+    holds the entry's blob. Like git, a file modified in the same instant
+    the index was written is not trusted.
+    """
+    if not entry.blob_id or entry.size != st.st_size & 0xffffffff:
+        return False
+    if entry.mtime_ns % 1_000_000_000:
+        same_mtime = entry.mtime_ns == st.st_mtime_ns
+    else:
+        # Built without nanosecond timestamps: git stored whole seconds
+        same_mtime = entry.mtime_ns // 1_000_000_000 == st.st_mtime_ns // 1_000_000_000
+    return same_mtime and entry.mtime_ns < index_mtime_ns
@@ -0,0 +1,269 @@
+"""
+Streaming HTML Tokenizer for RepoScan
+
+A tree-less alternative to BeautifulSoup for the Parser. It yields events
+in document order as the markup is scanned:
+
+    StartTag    - every opening tag with its attributes and source position
+    ElementText - the raw body of a <script> or <style> element, on close
+
+Only script/style bodies are kept; all other text is skipped, and no
+document tree is ever built.
+
+Two tokenizers produce these events:
+
+    scan()      - a hand-written scanner: the next '<' is found with
+                  str.find, a start tag is matched with html.parser's own
+                  start tag grammar, and a script/style body is sliced out
+                  up to its end tag. Line numbers are counted forward from
+                  the previous tag. Markup outside the constructs it
+                  handles (see Unsupported) stops it.
+    tokenize()  - html.parser.HTMLParser (the tokenizer BS4's 'html.parser'
+                  backend uses), fed in fixed-size chunks. Exact for any
+                  input, several times slower.
+
+On every page scan() accepts, it yields the same events as tokenize();
+the Parser uses scan() and falls back to tokenize() when it stops.
+"""
+
+import re
+from html import unescape
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+FEED_CHUNK_SIZE = 64 * 1024
+
+# Elements whose body is delivered as an ElementText event
+RAW_TEXT_ELEMENTS = ('script', 'style')
+
+
+class StartTag(NamedTuple):
+    name: str
+    attrs: Dict[str, str]   # Lower-cased names, last duplicate wins, valueless attributes -> ''
+    line: int               # 1-based
+    column: int             # 0-based
+    offset: int             # Character offset of '<' in the source
+    source: str             # The start tag exactly as written
+
+
+class ElementText(NamedTuple):
+    name: str               # 'script' or 'style'
+    text: str               # Raw body ('' when empty)
+    start: StartTag         # The element's opening tag
+
+
+class Unsupported(ValueError):
+    """Markup scan() leaves to tokenize(): anything whose tokenization is not plain or differs between Python versions."""
+
+
+# html.parser's start tag grammar (tagfind_tolerant, attrfind_tolerant and
+# locatestarttagend_tolerant), so tags and attributes come out as BS4 sees them
+_TAG_NAME = re.compile(r'([a-zA-Z][^\t\n\r\f />\x00]*)(?:\s|/(?!>))*')
+_ATTRIBUTE = re.compile(
+    r'((?<=[\'"\s/])[^\s/>][^\s/=>]*)(\s*=+\s*'
+    r'(\'[^\']*\'|"[^"]*"|(?![\'"])[^>\s]*))?(?:\s|/(?!>))*')
+_START_TAG = re.compile(r"""
+  <[a-zA-Z][^\t\n\r\f />\x00]*
+  (?:[\s/]*
+    (?:(?<=['"\s/])[^\s/>][^\s/=>]*
+      (?:\s*=+\s*
+        (?:'[^']*'
+          |"[^"]*"
+          |(?!['"])[^>\s]*
+         )
+        \s*
+       )?(?:\s|/(?!>))*
+     )*
+   )?
+  \s*
+""", re.VERBOSE)
+_END_TAG = re.compile(r'</\s*([a-zA-Z][-.a-zA-Z0-9:_]*)\s*>')
+# A '&#' html.parser does not take as a character reference changes how
+# the rest of the page is tokenized
+_BAD_CHARREF = re.compile(r'&#(?!(?:[0-9]+|[xX][0-9a-fA-F]+)[^0-9a-fA-F])')
+# A body ends at the first '</script' (Python 3.13+), which must also be
+# where html.parser's older '</\s*script\s*>' ends it
+_RAW_TEXT_END = {name: (re.compile('</' + name, re.I), re.compile(r'</\s*%s\s*>' % name, re.I))
+                 for name in RAW_TEXT_ELEMENTS}
+_NESTED_SCRIPT = re.compile('<script', re.I)
+
+
+def scan(content: str) -> Iterator[Union[StartTag, ElementText]]:
+    """
+    The events of tokenize(content), from one forward pass over the
+    content. Raises Unsupported on markup it does not handle (events
+    already yielded are then incomplete).
+    """
+    find = content.find
+    startswith = content.startswith
+    match_tag, match_name, match_attribute = _START_TAG.match, _TAG_NAME.match, _ATTRIBUTE.match
+    n = len(content)
+    i = 0
+    line, line_start, counted = 1, 0, 0
+    bad_charref = -1
+
+    while True:
+        j = find('<', i)
+        if j < 0:
+            j = n
+        # Text between tags is skipped, unless html.parser would stumble on it
+        if bad_charref < i:
+            match = _BAD_CHARREF.search(content, i)
+            bad_charref = match.start() if match else n
+        if bad_charref < j:
+            raise Unsupported(f"character reference at offset {bad_charref}")
+        if j + 1 >= n:
+            return   # Only text (or a lone '<') left
+
+        next_char = content[j + 1]
+        if next_char.isascii() and next_char.isalpha():
+            end = match_tag(content, j).end()
+            if startswith('>', end):
+                endpos = end + 1
+            elif startswith('/>', end):
+                endpos = end + 2
+            else:
+                raise Unsupported(f"unterminated start tag at offset {j}")
+
+            match = match_name(content, j + 1)
+            name = match.group(1).lower()
+            k = match.end()
+            attrs = {}
+            while k < endpos:
+                match = match_attribute(content, k)
+                if not match:
+                    break
+                attr, rest, value = match.group(1, 2, 3)
+                if not rest:
+                    value = ''
+                elif value[:1] == '\'' == value[-1:] or value[:1] == '"' == value[-1:]:
+                    value = value[1:-1]
+                if value:
+                    value = unescape(value)
+                attrs[attr.lower()] = value
+                k = match.end()
+            closing = content[k:endpos].strip()
+            if closing not in ('>', '/>'):
+                raise Unsupported(f"malformed start tag at offset {j}")
+
+            newlines = content.count('\n', counted, j)
+            if newlines:
+                line += newlines
+                line_start = content.rfind('\n', counted, j) + 1
+            counted = j
+            tag = StartTag(name, attrs, line, j - line_start, j, content[j:endpos])
+            yield tag
+            i = endpos
+
+            if name in RAW_TEXT_ELEMENTS:
+                if closing == '/>':
+                    yield ElementText(name, '', tag)
+                    continue
+                end_tag, tolerant_end_tag = _RAW_TEXT_END[name]
+                match = end_tag.search(content, endpos)
+                if (not match or not startswith('>', match.end())
+                        or tolerant_end_tag.search(content, endpos).start() != match.start()):
+                    raise Unsupported(f"<{name}> at offset {j} has no plain end tag")
+                text = content[endpos:match.start()]
+                if name == 'script' and '<!--' in text and _NESTED_SCRIPT.search(text):
+                    raise Unsupported(f"escaped script text at offset {endpos}")
+                yield ElementText(name, text, tag)
+                i = match.end() + 1
+
+        elif next_char == '/':
+            match = _END_TAG.match(content, j)
+            if not match:
+                raise Unsupported(f"malformed end tag at offset {j}")
+            i = match.end()
+
+        elif startswith('<!--', j):
+            close = find('--', j + 4)
+            if close < 0 or not startswith('>', close + 2) or startswith('>', j + 4) or startswith('->', j + 4):
+                raise Unsupported(f"comment at offset {j}")
+            i = close + 3
+
+        elif next_char in '!?':
+            # <!DOCTYPE ...> and <?...> processing instructions run to the next '>'
+            if next_char == '!' and content[j:j + 9].lower() != '<!doctype':
+                raise Unsupported(f"declaration at offset {j}")
+            close = find('>', j + 2)
+            if close < 0:
+                raise Unsupported(f"unterminated declaration at offset {j}")
+            i = close + 1
+
+        else:
+            i = j + 1   # A '<' that opens nothing (e.g. '<%') is text
+
+
+class HtmlTokenizer(HTMLParser):
+    def __init__(self, content: str, chunk_size: int = FEED_CHUNK_SIZE):
+        super().__init__(convert_charrefs=False)
+        self._content = content
+        self._chunk_size = chunk_size
+        self._events: List[Union[StartTag, ElementText]] = []
+        self._open_element: Optional[StartTag] = None
+        self._open_text: List[str] = []
+        # Start of the line getpos() last reported; tags only move forward
+        self._line = 1
+        self._line_start = 0
+
+    def events(self) -> Iterator[Union[StartTag, ElementText]]:
+        """Tokenizes the content, yielding events chunk by chunk."""
+        for i in range(0, len(self._content), self._chunk_size):
+            self.feed(self._content[i:i + self._chunk_size])
+            yield from self._drain()
+
+        self.close()
+        self._close_element()
+        yield from self._drain()
+
+    def _drain(self):
+        events, self._events = self._events, []
+        return events
+
+    def _offset(self, line: int, column: int) -> int:
+        while self._line < line:
+            self._line_start = self._content.index('\n', self._line_start) + 1
+            self._line += 1
+        return self._line_start + column
+
+    def _start_tag(self, tag: str, attrs, self_closing: bool):
+        attr_dict = {}
+        for key, value in attrs:
+            attr_dict[key] = value if value is not None else ''
+
+        line, column = self.getpos()
+        event = StartTag(tag, attr_dict, line, column, self._offset(line, column), self.get_starttag_text())
+        self._events.append(event)
+
+        if tag in RAW_TEXT_ELEMENTS:
+            self._close_element()
+            self._open_element = event
+            if self_closing:
+                self._close_element()
+
+    def _close_element(self):
+        if self._open_element is not None:
+            self._events.append(ElementText(self._open_element.name, "".join(self._open_text), self._open_element))
+            self._open_element = None
+            self._open_text = []
+
+    # --- HTMLParser callbacks ---
+
+    def handle_starttag(self, tag, attrs):
+        self._start_tag(tag, attrs, self_closing=False)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start_tag(tag, attrs, self_closing=True)
+
+    def handle_endtag(self, tag):
+        if self._open_element is not None and tag == self._open_element.name:
+            self._close_element()
+
+    def handle_data(self, data):
+        if self._open_element is not None:
+            self._open_text.append(data)
+
+
+def tokenize(content: str, chunk_size: int = FEED_CHUNK_SIZE) -> Iterator[Union[StartTag, ElementText]]:
+    return HtmlTokenizer(content, chunk_size).events()
@@ -0,0 +1,148 @@
+"""
+Incremental Scan Manifest for RepoScan
+
+Persists, per scanned file, its size, mtime, content hash and the
+CodeSnippet findings produced for it (and its Depth Analyser entry when
+that report is on), so the next run over the same tree only re-parses
+new or modified files. The manifest is stamped with an
+analysis version; a change to the tool or its patterns invalidates it.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from .parser import CodeSnippet
+from reposcan_shared import patterns
+from .git_index import blob_id
+
+MANIFEST_FILENAME = "scan_manifest.json"
+TOOL_VERSION = "1.0"
+
+# Modules whose logic determines the findings; editing any of them must
+# invalidate cached results even when no regex changed (patterns.py is
+# covered by pattern_version).
+_ANALYSIS_MODULES = ['engine.py', 'reader.py', 'parser.py', 'ajax_detector.py', 'html_tokenizer.py', 'vendor_index.py'] + [
+    os.path.join('..', 'reposcan_shared', name)
+    for name in ('ajax_patterns.py', 'enrichment.py', 'prefilter.py', 'lineindex.py', 'minified.py', 'windowed.py')]
+_DEPTH_MODULES = [os.path.join('..', 'repo_depth_analyser', 'src', 'scanner.py')]
+
+
+def analysis_version(parser_backend: str = 'bs4', vendor_fingerprint: str = "", window_above: int = 0,
+                     depth: bool = False) -> str:
+    """Fingerprint of the tool version, parser backend, vendor index, windowed-scan size limit, depth report, analysis patterns and analysis code."""
+    digest = hashlib.sha1(f"{TOOL_VERSION}\x00{parser_backend}\x00{vendor_fingerprint}\x00{window_above}\x00"
+                          f"{int(depth)}\x00{patterns.pattern_version()}".encode('utf-8'))
+
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in _ANALYSIS_MODULES + (_DEPTH_MODULES if depth else []):
+        try:
+            with open(os.path.join(module_dir, name), 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            # Frozen builds ship without sources; the pattern hash still applies
+            pass
+
+    return digest.hexdigest()
+
+
+def content_digest(raw_data: bytes) -> str:
+    # The git blob id, so a clean file's digest is known from the git index without reading it
+    return blob_id(raw_data)
+
+
+class ScanManifest:
+    def __init__(self, output_folder: str, parser_backend: str = 'bs4', vendor_fingerprint: str = "",
+                 window_above: int = 0, depth: bool = False):
+        self.path = os.path.join(output_folder, MANIFEST_FILENAME)
+        self.version = analysis_version(parser_backend, vendor_fingerprint, window_above, depth)
+        self.entries: Dict[str, dict] = {}   # Previous run, keyed by file path
+        self.updated: Dict[str, dict] = {}   # This run
+        self._stats: Dict[str, Tuple[int, int]] = {}
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read scan manifest {self.path}: {e}. Running a full scan.")
+            return
+
+        if data.get('version') != self.version:
+            logging.info("Scan manifest was written by a different tool/pattern version. Running a full scan.")
+            return
+
+        self.entries = data.get('files', {})
+
+    def lookup(self, file_path: str, size: Optional[int] = None, mtime: Optional[int] = None,
+               digest: Optional[str] = None) -> Optional[List[CodeSnippet]]:
+        """
+        Returns the cached findings if the file's size and mtime are unchanged
+        since the last run, or its content digest (e.g. the blob id from the
+        git index, after a checkout touched it) matches the recorded one;
+        otherwise None (the file must be analysed).
+        """
+        if size is None or mtime is None:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return None
+            size, mtime = st.st_size, st.st_mtime_ns
+
+        self._stats[file_path] = (size, mtime)
+
+        entry = self.entries.get(file_path)
+        if entry and ((entry['size'] == size and entry['mtime'] == mtime) or (digest and entry['hash'] == digest)):
+            return self._reuse(file_path, entry['hash'])
+        return None
+
+    def known_digest(self, file_path: str) -> Optional[str]:
+        """Content hash recorded by the last run (lets workers skip re-parsing touched-but-identical files)."""
+        entry = self.entries.get(file_path)
+        return entry['hash'] if entry else None
+
+    def reuse(self, file_path: str, digest: str) -> List[CodeSnippet]:
+        """Carries the previous findings forward for a file whose content hash is unchanged."""
+        return self._reuse(file_path, digest)
+
+    def cached_depth(self, file_path: str) -> Optional[dict]:
+        """Depth Analyser entry recorded with the findings just reused (None if there is none)."""
+        entry = self.entries.get(file_path)
+        return entry.get('depth') if entry else None
+
+    def record(self, file_path: str, digest: str, findings: List[CodeSnippet], depth: Optional[dict] = None):
+        size, mtime = self._stats.get(file_path, (None, None))
+        self.updated[file_path] = {
+            'size': size,
+            'mtime': mtime,
+            'hash': digest,
+            'findings': [f.to_dict() for f in findings]
+        }
+        if depth is not None:
+            self.updated[file_path]['depth'] = depth
+
+    def _reuse(self, file_path: str, digest: str) -> List[CodeSnippet]:
+        entry = self.entries[file_path]
+        size, mtime = self._stats.get(file_path, (entry['size'], entry['mtime']))
+        self.updated[file_path] = dict(entry, size=size, mtime=mtime, hash=digest)
+        return [CodeSnippet.from_dict(d) for d in entry['findings']]
+
+    def save(self, partial: bool = False):
+        """
+        Writes the entries seen in this run (files that disappeared are
+        dropped). partial=True, for a run that stopped early, also keeps
+        the previous run's entries for the files it did not reach.
+        """
+        files = dict(self.entries, **self.updated) if partial else self.updated
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'files': files}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"Could not save scan manifest {self.path}: {e}")
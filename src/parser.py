@@ -1,8 +1,41 @@
-import re
 import os
-from typing import List, Dict, Any
+import logging
+import collections
+from typing import List, Dict, Any, Callable
 from bs4 import BeautifulSoup
 import bs4
+from reposcan_shared.lineindex import LineIndex
+from reposcan_shared import patterns
+from reposcan_shared import minified
+from reposcan_shared.ajax_patterns import find_ajax_calls
+from reposcan_shared.enrichment import count_enrichment_groups, find_dynamic_groups
+from . import html_tokenizer
+
+# 'bs4' builds a BeautifulSoup tree (reference implementation);
+# 'stream' uses the tree-less tokenizer in html_tokenizer.py.
+PARSER_BACKENDS = ('bs4', 'stream')
+
+# Dynamic code groups of the 'enrichment' pattern -> reported pattern name (in reporting order)
+DYNAMIC_GROUP_NAMES = {
+    'dom_sink': 'dom_sink',
+    'js_sink': 'js_sink',
+    'dynamic_load': 'dynamic_load',
+    'dynamic_style': 'dynamic_css',
+    'css_in_js': 'css_in_js'
+}
+
+MINIFIED_OFFSETS = 100  # Character offsets kept per pattern in a minified file's finding
+
+# How Parser.parse handled a file (Parser.last_tier), cheapest first:
+# minified JS/CSS counted; markup with no candidate construct, settled by the
+# 'dom_candidates' regex alone; standalone script; markup walked as a DOM
+TIER_MINIFIED = 'minified'
+TIER_TRIAGE = 'triage'
+TIER_SCRIPT = 'script'
+TIER_DOM = 'dom'
+PARSE_TIERS = (TIER_MINIFIED, TIER_TRIAGE, TIER_SCRIPT, TIER_DOM)
+TIER_LABELS = {TIER_MINIFIED: 'minified counted', TIER_TRIAGE: 'regex triage (no DOM)',
+               TIER_SCRIPT: 'standalone script', TIER_DOM: 'DOM parse'}
 
 class CodeSnippet:
     def __init__(self, file_path: str, start_line: int, end_line: int, category: str, snippet: str, code_type: str, full_code: str = "", ajax_detected: bool = False, source_type: str = "INLINE"):
@@ -29,6 +62,11 @@ class CodeSnippet:
         self.difficulty = "Unknown"
         self.ajax_details = [] # List of dicts for multiple calls in one block
         self.bundled_file = ""  # Populated by Reporter
+        self.duplicate_count = 0  # Other scanned files with identical content (set after the scan)
+        self.identified_by = ""  # Vendor findings: how the library was recognised (content hash, file name + banner)
+        self.pattern_counts = {}  # Minified findings: matches per pattern ('ajax', 'dom_sink', ...)
+        self.match_offsets = {}  # Minified findings: character offsets of the first MINIFIED_OFFSETS matches per pattern
+        self.match_lines = {}  # Oversized findings: line numbers of the first matches per pattern (see engine)
         # Metric Fields (Phase 4)
         self.logic_density_score = 0
         self.complexity = "Low" # Low, Medium, High
@@ -37,9 +75,23 @@ class CodeSnippet:
         self.target_filename_suggestion = "" # {OriginalFilePath}_{BlockType}_L{StartLine}-L{EndLine}.{Extension}
         self.recommended_action = "Review"
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-data form of the finding (used by the scan manifest cache)."""
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CodeSnippet':
+        # Start from the constructor defaults so fields added later are always present
+        snippet = cls(data['file_path'], data['start_line'], data['end_line'], data['category'], data['snippet'], data['code_type'])
+        snippet.__dict__.update(data)
+        return snippet
+
 
 class Parser:
-    def __init__(self):
+    def __init__(self, backend: str = 'bs4'):
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend '{backend}' (expected one of: {', '.join(PARSER_BACKENDS)})")
+        self.backend = backend
         # Event handler attributes to scan for
         self.event_handlers = {
             # Mouse
@@ -55,23 +107,42 @@ class Parser:
             'onerror', 'onabort', 'onplay', 'onpause', 'onvolumechange', 'ontimeupdate',
             'ondrag', 'ondragstart', 'ondragend', 'ondrop'
         }
-        self.dynamic_patterns = {
-            'dom_sink': re.compile(r'\.(innerHTML|outerHTML|insertAdjacentHTML|write|writeln)\s*=', re.IGNORECASE),
-            'js_sink': re.compile(r'\b(eval|new\s+Function|setTimeout|setInterval|import|System\.import)\s*\(', re.IGNORECASE),
-            'dynamic_load': re.compile(r'\.(src|href)\s*=\s*|document\.createElement\s*\(\s*["\'](script|style|link)["\']\s*\)', re.IGNORECASE),
-            'dynamic_css': re.compile(r'(\.style\.\w+\s*=|.style\[\s*["\'][^"\']+["\']\s*\]\s*=|.cssText\s*=|setProperty\s*\(|insertRule\s*\(|addRule\s*\(|setAttribute\s*\(\s*["\']style["\']|.classList\.(?:add|remove|toggle|replace)\s*\(|new\s+CSSStyleSheet\s*\(|adoptedStyleSheets)', re.IGNORECASE),
-            'css_in_js': re.compile(r'(?:styled\.\w+|css`|styled\s*\()', re.IGNORECASE)
-        }
+        self.dynamic_groups = DYNAMIC_GROUP_NAMES
+        # Functionality heuristic: first pattern found -> functionality
+        self.functionality_hints = [
+            (patterns.get('functionality_validation'), "Form Validation"),
+            (patterns.get('functionality_interaction'), "UI Interaction"),
+            (patterns.get('functionality_visualisation'), "Data Visualization"),
+            (patterns.get('functionality_visual'), "Visual Effects"),
+        ]
+        self.dom_candidates = patterns.get('dom_candidates')
+        self.last_tier = None  # Tier of the last parse() call
 
     def parse(self, file_path: str, content: str) -> List[CodeSnippet]:
+        # 0. Minified/bundled JS and CSS are counted, not analysed
+        _, ext = os.path.splitext(file_path)
+        if ext.lower() in minified.MINIFIABLE_EXTENSIONS:
+            stats = minified.looks_minified(content)
+            if stats:
+                self.last_tier = TIER_MINIFIED
+                return [self._count_minified(file_path, content, stats)]
+
+        # 0.5 Triage: markup without a single candidate construct has nothing
+        # for the regex pass or the DOM walk to find, so no tree is built
+        is_script = ext.lower() == '.js'
+        if not is_script and not self.dom_candidates.search(content):
+            self.last_tier = TIER_TRIAGE
+            return []
+        self.last_tier = TIER_SCRIPT if is_script else TIER_DOM
+
         all_findings = []
+        self._line_index = LineIndex(content) # Built on first fallback lookup only
         
         # 1. Regex approach
         all_findings.extend(self._scan_regex(file_path, content))
         
         # 1.5 Standalone JS File handling
-        _, ext = os.path.splitext(file_path)
-        if ext.lower() == '.js':
+        if is_script:
             all_findings.append(CodeSnippet(
                 file_path, 
                 1, 
@@ -84,16 +155,15 @@ class Parser:
             ))
         
         # 2. DOM Parsing (for HTML/ASPX files)
-        if ext.lower() != '.js':
-            # Prefer html.parser as it reliably supports sourceline in recent BS4 versions.
-            # lxml often returns None for sourceline unless configured specifically with XML.
-            try:
-                soup = BeautifulSoup(content, 'html.parser')
-            except:
-                # Fallback for really broken HTML
-                soup = BeautifulSoup(content, 'lxml')
-                
-            all_findings.extend(self._scan_dom(file_path, soup, content))
+        if not is_script:
+            if self.backend == 'stream':
+                try:
+                    all_findings.extend(self._scan_stream(file_path, content))
+                except Exception as e:
+                    logging.warning(f"Streaming tokenizer failed on {file_path} ({e}); falling back to BeautifulSoup")
+                    all_findings.extend(self._scan_bs4(file_path, content))
+            else:
+                all_findings.extend(self._scan_bs4(file_path, content))
         
         # 3. Deduplicate
         unique_findings = []
@@ -109,26 +179,56 @@ class Parser:
                 seen.add(key)
                 unique_findings.append(finding)
         
-        # 4. Enrichment (AJAX and Dynamic Code Detection)
-        from . import ajax_detector
+        # 4. Enrichment (AJAX, Dynamic Code, Complexity & Severity)
         for finding in unique_findings:
-            if finding.category == 'JS':
-                ajax_detector.detect_ajax_patterns(finding)
-                self._detect_dynamic(finding)
-                
-            # Phase 4: Calculate Complexity & Severity
-            self._calculate_complexity(finding)
-            self._assess_severity(finding)
-            self._infer_functionality(finding)
+            self._enrich(finding)
                 
         return unique_findings
 
+    def _count_minified(self, file_path: str, content: str, stats: 'minified.TextStats') -> CodeSnippet:
+        """One summary finding for a minified file: pattern counts and character offsets, no per-match snippets."""
+        counts = collections.Counter()
+        offsets = collections.defaultdict(list)
+
+        def record(name, position):
+            counts[name] += 1
+            if len(offsets[name]) < MINIFIED_OFFSETS:
+                offsets[name].append(position)
+
+        for match in find_ajax_calls(content):
+            record('ajax', match.start())
+        # Each dynamic group on its own, like the snippet enrichment counts
+        for group, match in find_dynamic_groups(content):
+            record(self.dynamic_groups[group], match.start())
+
+        lines = content.count('\n') + 1
+        summary = (f"{len(content):,} chars, {lines:,} line(s); sampled longest line {stats.longest_line:,} chars, "
+                   f"{stats.whitespace_ratio:.0%} whitespace")
+        finding = CodeSnippet(file_path, 1, lines, 'Minified', summary, 'Minified/Bundled', source_type='LOCAL')
+        finding.pattern_counts = dict(counts)
+        finding.match_offsets = dict(offsets)
+        return finding
+
+    def _enrich(self, snippet: CodeSnippet):
+        """Fills every enrichment field from one scan of the snippet's code."""
+        from . import ajax_detector
+        counts = count_enrichment_groups(snippet.full_code)
+        
+        if snippet.category == 'JS':
+            ajax_detector.detect_ajax_patterns(snippet)
+            self._detect_dynamic(snippet, counts)
+            
+        # Phase 4: Calculate Complexity & Severity
+        self._calculate_complexity(snippet, counts)
+        self._assess_severity(snippet, counts)
+        self._infer_functionality(snippet)
+
     def _scan_regex(self, file_path: str, content: str) -> List[CodeSnippet]:
         findings = []
         lines = content.splitlines()
         
         # Regex for 'javascript:' protocol
-        js_proto_pattern = re.compile(r'href=["\']\s*javascript:', re.IGNORECASE)
+        js_proto_pattern = patterns.get('js_uri_attr')
         
         for i, line in enumerate(lines):
             line_num = i + 1
@@ -136,97 +236,168 @@ class Parser:
                 findings.append(CodeSnippet(file_path, line_num, line_num, 'JS', line.strip(), 'jsuri', full_code=line.strip(), source_type='INLINE'))
         return findings
 
-    def _scan_dom(self, file_path: str, soup: BeautifulSoup, raw_content: str) -> List[CodeSnippet]:
-        findings = []
-        
-        # --- JavaScript ---
-        # 1. Inline Script Blocks
-        for script in soup.find_all('script'):
-            line_num = self._get_line_number(script, raw_content, str(script))
+    def _scan_bs4(self, file_path: str, content: str) -> List[CodeSnippet]:
+        # Prefer html.parser as it reliably supports sourceline in recent BS4 versions.
+        # lxml often returns None for sourceline unless configured specifically with XML.
+        try:
+            soup = BeautifulSoup(content, 'html.parser')
+        except:
+            # Fallback for really broken HTML
+            soup = BeautifulSoup(content, 'lxml')
             
-            if script.has_attr('src'):
-                # External or Internal Script
-                src = script['src']
-                end_line = line_num  
+        return self._scan_dom(file_path, soup, content)
+
+    def _scan_dom(self, file_path: str, soup: BeautifulSoup, raw_content: str) -> List[CodeSnippet]:
+        """
+        Collects all JS/CSS findings in a single walk over the tree, dispatching
+        per tag name and per attribute. Findings are kept in per-kind buckets so
+        the output order stays: script tags, JS attributes, style blocks,
+        style attributes, stylesheet links.
+        """
+        scripts, js_attrs, style_blocks, style_attrs, stylesheets = [], [], [], [], []
+
+        for tag in soup.descendants:
+            if not isinstance(tag, bs4.Tag):
+                continue
+
+            name = tag.name
+            if name == 'script':
+                self._visit_script(file_path, tag, raw_content, scripts)
+            elif name == 'style':
+                self._visit_style(file_path, tag, raw_content, style_blocks)
+            elif name == 'link':
+                self._visit_link(file_path, tag, raw_content, stylesheets)
+
+            self._visit_attrs(file_path, tag.attrs, lambda val, tag=tag: self._get_line_number(tag, raw_content, val), js_attrs, style_attrs)
+
+        return scripts + js_attrs + style_blocks + style_attrs + stylesheets
+
+    def _scan_stream(self, file_path: str, raw_content: str) -> List[CodeSnippet]:
+        """
+        Same findings as _scan_dom, collected from the streaming tokenizer
+        without building a tree. Tag references (script src, stylesheet
+        links) keep the start tag as written in full_code.
+        """
+        try:
+            return self._collect_events(file_path, html_tokenizer.scan(raw_content))
+        except html_tokenizer.Unsupported:
+            # Markup the fast scanner leaves to html.parser: start over with it
+            return self._collect_events(file_path, html_tokenizer.tokenize(raw_content))
+
+    def _collect_events(self, file_path: str, events) -> List[CodeSnippet]:
+        scripts, js_attrs, style_blocks, style_attrs, stylesheets = [], [], [], [], []
+
+        for event in events:
+            if isinstance(event, html_tokenizer.ElementText):
+                start = event.start
+                if event.name == 'style':
+                    self._add_style(file_path, start.line, event.text, style_blocks)
+                elif 'src' not in start.attrs and event.text:
+                    self._add_script(file_path, start.line, None, event.text, start.source, scripts)
+                continue
+
+            name, attrs = event.name, event.attrs
+            if name == 'script' and 'src' in attrs:
+                self._add_script(file_path, event.line, attrs['src'], None, event.source, scripts)
+            elif name == 'link' and 'stylesheet' in attrs.get('rel', '').split() and 'href' in attrs:
+                self._add_stylesheet(file_path, event.line, attrs['href'], event.source, stylesheets)
+
+            self._visit_attrs(file_path, attrs, lambda val, line=event.line: line, js_attrs, style_attrs)
+
+        return scripts + js_attrs + style_blocks + style_attrs + stylesheets
+
+    def _visit_attrs(self, file_path: str, attrs: Dict[str, Any], line_of: Callable[[Any], int], js_attrs: List[CodeSnippet], style_attrs: List[CodeSnippet]):
+        """Event handlers, javascript: URIs and style attributes of one tag."""
+        for attr, val in attrs.items():
+            attr_lower = attr.lower()
+
+            # --- JavaScript: Event Handlers ---
+            if attr_lower in self.event_handlers:
+                full_code = str(val)
+                line_num = line_of(full_code)
                 
-                if src.lower().startswith(('http:', 'https:', '//')):
-                    # Remote
-                    findings.append(CodeSnippet(file_path, line_num, end_line, 'External', src, 'External Script', full_code=str(script), source_type='REMOTE'))
-                else:
-                    # LOCAL / Internal
-                    findings.append(CodeSnippet(file_path, line_num, end_line, 'Internal', src, 'Internal Script', full_code=str(script), source_type='LOCAL'))
-            else:
-                if script.string or script.contents:
-                    code = script.string if script.string else "".join([str(c) for c in script.contents])
-                    full_code = code.strip()
-                    snippet = full_code[:200]
-                    line_count = full_code.count('\n')
-                    end_line = line_num + line_count
-                    
-                    findings.append(CodeSnippet(file_path, line_num, end_line, 'JS', snippet, 'scriptblock', full_code=full_code, source_type='INLINE'))
-
-        # 2. Event Handlers
-        for tag in soup.find_all(True):
-            for attr in tag.attrs:
-                attr_lower = attr.lower()
-                if attr_lower in self.event_handlers:
-                    val = tag[attr]
-                    full_code = str(val)
-                    line_num = self._get_line_number(tag, raw_content, full_code)
-                    
-                    # Event handlers are attributes, usually start/end on same tag line or close. 
-                    # Approximate end line by counting newlines in the attribute value.
-                    line_count = full_code.count('\n')
-                    end_line = line_num + line_count
-                    
-                    snippet = f'{attr}="{full_code}"'
-                    findings.append(CodeSnippet(file_path, line_num, end_line, 'JS', snippet, attr_lower, full_code=full_code, source_type='INLINE'))
+                # Event handlers are attributes, usually start/end on same tag line or close. 
+                # Approximate end line by counting newlines in the attribute value.
+                line_count = full_code.count('\n')
+                end_line = line_num + line_count
                 
-                if attr_lower in ['href', 'src']:
-                    val = tag[attr]
-                    if isinstance(val, str) and val.lower().strip().startswith('javascript:'):
-                        line_num = self._get_line_number(tag, raw_content, val)
-                        end_line = line_num + val.count('\n')
-                        findings.append(CodeSnippet(file_path, line_num, end_line, 'JS', val, 'jsuri', full_code=val, source_type='INLINE'))
-
-        # --- CSS ---
-        # 1. Inline Style Blocks
-        for style in soup.find_all('style'):
-            content = style.string if style.string else ""
-            line_num = self._get_line_number(style, raw_content, content)
-            
-            if content and '@import' in content:
-                end_line = line_num + content.strip().count('\n')
-                findings.append(CodeSnippet(file_path, line_num, end_line, 'External', content.strip()[:100], 'External Style (@import)', full_code=content.strip(), source_type='REMOTE'))
-            
-            end_line = line_num + content.strip().count('\n')
-            findings.append(CodeSnippet(file_path, line_num, end_line, 'CSS', content.strip()[:200], 'styleblock', full_code=content.strip(), source_type='INLINE'))
+                snippet = f'{attr}="{full_code}"'
+                js_attrs.append(CodeSnippet(file_path, line_num, end_line, 'JS', snippet, attr_lower, full_code=full_code, source_type='INLINE'))
+
+            # --- JavaScript: javascript: URIs ---
+            elif attr_lower in ('href', 'src'):
+                if isinstance(val, str) and val.lower().strip().startswith('javascript:'):
+                    line_num = line_of(val)
+                    end_line = line_num + val.count('\n')
+                    js_attrs.append(CodeSnippet(file_path, line_num, end_line, 'JS', val, 'jsuri', full_code=val, source_type='INLINE'))
 
-        # 2. Style Attributes
-        for tag in soup.find_all(True):
-            if tag.has_attr('style'):
-                val = tag['style']
-                line_num = self._get_line_number(tag, raw_content, val)
+            # --- CSS: Style Attributes ---
+            if attr == 'style':
+                line_num = line_of(val)
                 end_line = line_num + str(val).count('\n')
                 if '<%' in str(val):
-                     findings.append(CodeSnippet(file_path, line_num, end_line, 'CSS', f'style="{val}"', 'ASP.NET Style', full_code=val, source_type='INLINE'))
+                     style_attrs.append(CodeSnippet(file_path, line_num, end_line, 'CSS', f'style="{val}"', 'ASP.NET Style', full_code=val, source_type='INLINE'))
                 else:
-                     findings.append(CodeSnippet(file_path, line_num, end_line, 'CSS', f'style="{val}"', 'inlinestyle', full_code=val, source_type='INLINE'))
-
-        # 3. External Stylesheets
-        for link in soup.find_all('link'):
-            rels = link.get('rel', [])
-            if 'stylesheet' in (rels if isinstance(rels, list) else [rels]):
-                if link.has_attr('href'):
-                    line_num = self._get_line_number(link, raw_content, str(link))
-                    end_line = line_num # Single line typically
-                    href = link['href']
-                    if href.lower().startswith(('http:', 'https:', '//')):
-                        findings.append(CodeSnippet(file_path, line_num, end_line, 'External', href, 'External Style', full_code=str(link), source_type='REMOTE'))
-                    else:
-                        findings.append(CodeSnippet(file_path, line_num, end_line, 'Internal', href, 'Internal Style', full_code=str(link), source_type='LOCAL'))
+                     style_attrs.append(CodeSnippet(file_path, line_num, end_line, 'CSS', f'style="{val}"', 'inlinestyle', full_code=val, source_type='INLINE'))
 
-        return findings
+    def _visit_script(self, file_path: str, script: bs4.Tag, raw_content: str, findings: List[CodeSnippet]):
+        """Inline script blocks and <script src> references."""
+        # Only serialise the tag when BS4 has no sourceline for it
+        line_num = script.sourceline or self._get_line_number(script, raw_content, str(script))
+        
+        if script.has_attr('src'):
+            self._add_script(file_path, line_num, script['src'], None, str(script), findings)
+        elif script.string or script.contents:
+            code = script.string if script.string else "".join([str(c) for c in script.contents])
+            self._add_script(file_path, line_num, None, code, str(script), findings)
+
+    def _visit_style(self, file_path: str, style: bs4.Tag, raw_content: str, findings: List[CodeSnippet]):
+        """Inline style blocks (and @import references inside them)."""
+        content = style.string if style.string else ""
+        line_num = self._get_line_number(style, raw_content, content)
+        self._add_style(file_path, line_num, content, findings)
+
+    def _visit_link(self, file_path: str, link: bs4.Tag, raw_content: str, findings: List[CodeSnippet]):
+        """External stylesheets."""
+        rels = link.get('rel', [])
+        if 'stylesheet' in (rels if isinstance(rels, list) else [rels]):
+            if link.has_attr('href'):
+                line_num = link.sourceline or self._get_line_number(link, raw_content, str(link))
+                self._add_stylesheet(file_path, line_num, link['href'], str(link), findings)
+
+    def _add_script(self, file_path: str, line_num: int, src, code, tag_code: str, findings: List[CodeSnippet]):
+        if src is not None:
+            # External or Internal Script
+            end_line = line_num  
+            
+            if src.lower().startswith(('http:', 'https:', '//')):
+                # Remote
+                findings.append(CodeSnippet(file_path, line_num, end_line, 'External', src, 'External Script', full_code=tag_code, source_type='REMOTE'))
+            else:
+                # LOCAL / Internal
+                findings.append(CodeSnippet(file_path, line_num, end_line, 'Internal', src, 'Internal Script', full_code=tag_code, source_type='LOCAL'))
+        else:
+            full_code = code.strip()
+            snippet = full_code[:200]
+            line_count = full_code.count('\n')
+            end_line = line_num + line_count
+            
+            findings.append(CodeSnippet(file_path, line_num, end_line, 'JS', snippet, 'scriptblock', full_code=full_code, source_type='INLINE'))
+
+    def _add_style(self, file_path: str, line_num: int, content: str, findings: List[CodeSnippet]):
+        if content and '@import' in content:
+            end_line = line_num + content.strip().count('\n')
+            findings.append(CodeSnippet(file_path, line_num, end_line, 'External', content.strip()[:100], 'External Style (@import)', full_code=content.strip(), source_type='REMOTE'))
+        
+        end_line = line_num + content.strip().count('\n')
+        findings.append(CodeSnippet(file_path, line_num, end_line, 'CSS', content.strip()[:200], 'styleblock', full_code=content.strip(), source_type='INLINE'))
+
+    def _add_stylesheet(self, file_path: str, line_num: int, href: str, tag_code: str, findings: List[CodeSnippet]):
+        end_line = line_num # Single line typically
+        if href.lower().startswith(('http:', 'https:', '//')):
+            findings.append(CodeSnippet(file_path, line_num, end_line, 'External', href, 'External Style', full_code=tag_code, source_type='REMOTE'))
+        else:
+            findings.append(CodeSnippet(file_path, line_num, end_line, 'Internal', href, 'Internal Style', full_code=tag_code, source_type='LOCAL'))
 
     def _get_line_number(self, tag: bs4.Tag, raw_content: str = "", search_snippet: str = "") -> int:
         # 1. Try BS4 logic
@@ -239,27 +410,25 @@ class Parser:
             # Try exact match first
             index = raw_content.find(search_snippet)
             if index != -1:
-                return raw_content[:index].count('\n') + 1
+                return self._line_index.line_of(index)
             
             # Try trimmed snpped (some parsers might normalize whitespace)
             index = raw_content.find(search_snippet.strip())
             if index != -1:
-                return raw_content[:index].count('\n') + 1
+                return self._line_index.line_of(index)
                 
         return 0
 
-    def _detect_dynamic(self, snippet: CodeSnippet):
-        """Detects dynamic code generation patterns in a snippet."""
-        code = snippet.full_code
+    def _detect_dynamic(self, snippet: CodeSnippet, counts: Dict[str, int]):
+        """Detects dynamic code generation patterns in a snippet (counts per 'enrichment' group)."""
         total_dynamic = 0
         first_pattern = ""
         
-        for name, pattern in self.dynamic_patterns.items():
-            matches = pattern.findall(code)
-            if matches:
+        for group, name in self.dynamic_groups.items():
+            if counts[group]:
                 if not first_pattern:
                     first_pattern = name
-                total_dynamic += len(matches)
+                total_dynamic += counts[group]
         
         if total_dynamic > 0:
             snippet.dynamic_code_detected = True
@@ -268,20 +437,19 @@ class Parser:
             return True
         return False
 
-    def _calculate_complexity(self, snippet: CodeSnippet):
+    def _calculate_complexity(self, snippet: CodeSnippet, counts: Dict[str, int]):
         """Calculates Logic Density Score (Phase 4)."""
         score = 0
-        code = snippet.full_code.lower()
         
         # +2 Points: Logic Structures
-        score += 2 * len(re.findall(r'\bfunction\s+\w+|\bif\s*\(|\bfor\s*\(|\bwhile\s*\(', code))
+        score += 2 * counts['logic_structures']
         
         # +1 Point: AJAX / Interactive
         if snippet.ajax_detected: score += 1
-        score += 1 * len(re.findall(r'\.addeventlistener', code))
+        score += 1 * counts['event_listeners']
         
         # -2 Points: Basic DOM Glue
-        dom_selectors = len(re.findall(r'document\.getelementbyid|document\.queryselector|\$\(["\']', code))
+        dom_selectors = counts['dom_selectors']
         if dom_selectors > 0 and score < 2:
             score -= 2
             
@@ -291,38 +459,32 @@ class Parser:
         elif score >= 2: snippet.complexity = "Medium"
         else: snippet.complexity = "Low"
 
-    def _assess_severity(self, snippet: CodeSnippet):
+    def _assess_severity(self, snippet: CodeSnippet, counts: Dict[str, int]):
         """Assess Server Dependency Severity (Phase 4)."""
-        code = snippet.full_code
         severity = "None"
         
         # High: Logic-breaking dependencies (Model properties, Classic ASP blocks)
-        if re.search(r'@Model\.|<%\s', code, re.IGNORECASE):
+        if counts['severity_high']:
             severity = "High"
         
         # Medium: Config/Routing (Url.Action, ViewBag)
-        elif re.search(r'@Url\.|@ViewBag\.|@ViewData\.', code, re.IGNORECASE):
+        elif counts['severity_medium']:
             if severity != "High": severity = "Medium"
             
         # Low: Cosmetic/Replaceable (DateTime, simple vars)
-        elif re.search(r'<%=|@DateTime\.', code, re.IGNORECASE):
+        elif counts['severity_low']:
             if severity == "None": severity = "Low"
             
         snippet.server_severity = severity
 
     def _infer_functionality(self, snippet: CodeSnippet):
         """Heuristic to guess functionality type."""
-        code = snippet.full_code.lower()
-        
         if snippet.ajax_detected:
             snippet.functionality = "Data/Network Operation"
-        elif 'validate' in code or 'regex' in code or 'return false' in code:
-            snippet.functionality = "Form Validation"
-        elif 'click' in code or 'hover' in code or 'on(' in code:
-            snippet.functionality = "UI Interaction"
-        elif 'chart' in code or 'graph' in code:
-            snippet.functionality = "Data Visualization"
-        elif 'style' in code or 'class' in code or 'show()' in code or 'hide()' in code:
-            snippet.functionality = "Visual Effects"
-        else:
-            snippet.functionality = "General Logic"
+            return
+        
+        for pattern, functionality in self.functionality_hints:
+            if pattern.search(snippet.full_code):
+                snippet.functionality = functionality
+                return
+        snippet.functionality = "General Logic"
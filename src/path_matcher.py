@@ -0,0 +1,162 @@
+"""
+Compiled Path Filter for RepoScan Discovery
+
+Compiles the [Filters] settings into one matcher that Scanner consults
+once per directory entry:
+
+    include_extensions  file extensions to scan
+    exclude_folders     folder rules; a matching folder is not descended into
+    exclude_files       file rules
+
+Rules follow .gitignore conventions:
+    bin                 no '/': matches the name at any depth
+    Scripts/vendor      with '/': matches the path relative to the scan root
+    Scripts/vendor/**   '**' spans any number of folders ('a/**/b', '**/b')
+    *.min.js            '*', '?' and '[...]' stay within one path segment
+    !app.min.js         negation: re-includes what an earlier rule excluded
+                        (the last matching rule wins)
+
+Exact names and paths (the common case: bin, obj, node_modules) are
+dictionary lookups. The wildcard rules are compiled into one regex for
+names and one for paths, ordered so that the first alternative matching
+is the last rule; a capture-free copy of each screens entries first, so
+the common no-match case stays cheap however many rules are configured.
+Case sensitivity follows the platform, like fnmatch.
+"""
+
+import os
+import re
+from typing import Dict, Iterable, Set
+
+_CASE_INSENSITIVE = os.path.normcase('A') == 'a'
+_WILDCARDS = re.compile(r'[*?\[]')
+
+
+def _fold(text: str) -> str:
+    return text.lower() if _CASE_INSENSITIVE else text
+
+
+def _translate_segment(segment: str) -> str:
+    """Regex for one path segment of a glob ('*' and '?' never match '/')."""
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == '*':
+            while i < n and segment[i] == '*':
+                i += 1
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = i
+            if j < n and segment[j] in '!^':
+                j += 1
+            if j < n and segment[j] == ']':
+                j += 1
+            j = segment.find(']', j)
+            if j == -1:
+                out.append('\\[')
+            else:
+                stuff = segment[i:j].replace('\\', '\\\\')
+                if stuff[0] == '!':
+                    stuff = '^' + stuff[1:]
+                out.append(f'[{stuff}]')
+                i = j + 1
+        else:
+            out.append(re.escape(c))
+    return ''.join(out)
+
+
+def translate(pattern: str) -> str:
+    """
+    Regex of one rule pattern, for fullmatch against the entry name (pattern
+    without '/') or the '/'-separated path relative to the scan root.
+    """
+    parts = pattern.lstrip('/').split('/')
+    regex = ''
+    for i, part in enumerate(parts):
+        last = i == len(parts) - 1
+        if part == '**':
+            regex += '.*' if last else '(?:.*/)?'
+        else:
+            regex += _translate_segment(part) + ('' if last else '/')
+    return regex
+
+
+class _RuleSet:
+    """Ordered exclude/negate rules; the last rule matching a path decides."""
+
+    def __init__(self, patterns: Iterable[str], folders: bool):
+        self.names: Dict[str, int] = {}    # Exact name (any depth) -> last rule index
+        self.paths: Dict[str, int] = {}    # Exact relative path -> last rule index
+        self.negated: Set[int] = set()
+        name_globs, path_globs = [], []
+
+        for index, pattern in enumerate(p.strip() for p in patterns):
+            negate = pattern.startswith('!')
+            if negate:
+                pattern = pattern[1:]
+            elif pattern.startswith('\\!'):
+                pattern = pattern[1:]
+            pattern = pattern.rstrip('/')
+            if folders and pattern.endswith('/**'):
+                # Excluding everything inside a folder is excluding the folder
+                pattern = pattern[:-3]
+            if not pattern:
+                continue
+            if negate:
+                self.negated.add(index)
+
+            pattern = _fold(pattern)
+            if _WILDCARDS.search(pattern):
+                (path_globs if '/' in pattern else name_globs).append((index, translate(pattern)))
+            elif '/' in pattern:
+                self.paths[pattern.strip('/')] = index
+            else:
+                self.names[pattern] = index
+
+        self.name_regex = self._compile(name_globs)
+        self.path_regex = self._compile(path_globs)
+
+    @staticmethod
+    def _compile(globs):
+        """
+        (any_rule, which_rule) regexes. any_rule has no capturing groups, so
+        re can reject most entries on their first character; which_rule
+        names the rule and only runs on a hit.
+        """
+        if not globs:
+            return None
+        # Later rules first: the alternative that matches is the last matching rule
+        globs = globs[::-1]
+        return (re.compile('|'.join(f'(?:{regex})' for _, regex in globs)),
+                re.compile('|'.join(f'(?P<r{index}>{regex})' for index, regex in globs)))
+
+    def excluded(self, rel_path: str, name: str) -> bool:
+        rule = max(self.names.get(name, -1), self.paths.get(rel_path, -1))
+        for regexes, text in ((self.name_regex, name), (self.path_regex, rel_path)):
+            if regexes is not None and regexes[0].fullmatch(text):
+                rule = max(rule, int(regexes[1].fullmatch(text).lastgroup[1:]))
+        return rule >= 0 and rule not in self.negated
+
+
+class PathMatcher:
+    def __init__(self, include_extensions: Iterable[str], exclude_folders: Iterable[str] = (),
+                 exclude_files: Iterable[str] = ()):
+        self.include_extensions = {e.lower() for e in include_extensions}
+        self._folders = _RuleSet(exclude_folders, folders=True)
+        self._files = _RuleSet(exclude_files, folders=False)
+
+    def include_dir(self, rel_path: str) -> bool:
+        """Whether to descend into the folder at rel_path ('/'-separated, relative to the scan root)."""
+        rel_path = _fold(rel_path)
+        return not self._folders.excluded(rel_path, rel_path.rpartition('/')[2])
+
+    def include_file(self, rel_path: str) -> bool:
+        """Whether the file at rel_path is scanned (extension included and not excluded)."""
+        name = rel_path.rpartition('/')[2]
+        if os.path.splitext(name)[1].lower() not in self.include_extensions:
+            return False
+        return not self._files.excluded(_fold(rel_path), _fold(name))
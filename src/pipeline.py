@@ -0,0 +1,265 @@
+"""
+Staged Pipeline for RepoScan-Analyser
+
+Connects the static scan stages with bounded queues so they overlap:
+
+    discovery --[read queue]--> readers --[parse queue]--> parsers --[done queue]--> sink
+
+Discovery runs on its own thread, reading (I/O) on a small thread pool and
+parsing on one thread per parser (which may hand the work to a process
+pool). The sink is the caller: run() yields results in input order as
+soon as they are ready, so findings are recorded while later files are
+still being read.
+
+At most `depth` items are in flight between discovery and the sink
+(queued, being worked on, or waiting to be yielded in order), so memory
+holds at most `depth` files' content however large the tree is.
+With a `work_size`, the parse queue hands out the largest read result
+first, so a big file that arrives with smaller ones is not left to run
+alone at the end. With a `batch`, each parser takes up to that many read
+results at once (never more than its share of what is waiting) and
+parse gets them as a list, so handing work to a process pool costs one
+round trip per batch instead of per file. Per-stage throughput and busy time (per thread, to show
+how evenly the work spreads), and per-queue occupancy, are kept for the
+summary.
+"""
+
+import time
+import heapq
+import queue
+import itertools
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from reposcan_shared.scheduling import WorkerTimes
+
+DEFAULT_READ_THREADS = 4
+DEFAULT_QUEUE_DEPTH = 64
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class StageMetrics:
+    def __init__(self, name: str, threads: int):
+        self.name = name
+        self.threads = threads
+        self.items = 0
+        self.busy = 0.0   # Seconds spent working, summed over the stage's threads
+        self.thread_times = WorkerTimes(threads)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float, items: int = 1):
+        with self._lock:
+            self.items += items
+            self.busy += seconds
+        self.thread_times.add(threading.current_thread().name, seconds)
+
+    def utilisation(self, elapsed: float) -> float:
+        return self.busy / (self.threads * elapsed) if elapsed > 0 else 0.0
+
+
+class MeteredQueue(queue.Queue):
+    """Bounded queue that samples its occupancy on every put."""
+
+    def __init__(self, name: str, depth: int, maxsize: int):
+        super().__init__(maxsize)
+        self.name = name
+        self.depth = depth
+        self.samples = 0
+        self.total = 0
+        self.peak = 0
+
+    def _put(self, item):
+        # Called with the queue's mutex held
+        super()._put(item)
+        self._sample(item)
+
+    def _sample(self, item):
+        if item is _DONE:
+            return
+        size = len(self.queue)
+        self.samples += 1
+        self.total += size
+        self.peak = max(self.peak, size)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.samples if self.samples else 0.0
+
+
+class LargestFirstQueue(MeteredQueue):
+    """MeteredQueue of (seq, item) entries that hands out the largest work_size(item) first, end markers last."""
+
+    def __init__(self, name: str, depth: int, maxsize: int, work_size: Callable[[Any], int]):
+        self.work_size = work_size
+        self._markers = itertools.count()
+        super().__init__(name, depth, maxsize)
+
+    def _init(self, maxsize):
+        self.queue = []
+
+    def _put(self, item):
+        # Ties keep input order
+        key = (1, 0, next(self._markers)) if item is _DONE else (0, -self.work_size(item[1]), item[0])
+        heapq.heappush(self.queue, (key, item))
+        self._sample(item)
+
+    def _get(self):
+        return heapq.heappop(self.queue)[1]
+
+
+class Pipeline:
+    def __init__(self, read: Callable[[Any], Any], parse: Callable[[Any], Any], readers: int = DEFAULT_READ_THREADS,
+                 parsers: int = 1, depth: int = DEFAULT_QUEUE_DEPTH, on_close: Optional[Callable[[], None]] = None,
+                 work_size: Optional[Callable[[Any], int]] = None, batch: Optional[int] = None):
+        self.read = read
+        self.parse = parse
+        self.readers = max(1, readers)
+        self.parsers = max(1, parsers)
+        self.depth = max(1, depth)
+        self.on_close = on_close
+        self.work_size = work_size  # Cost estimate of a read result, to parse the largest first
+        self.batch = batch          # parse takes a list of up to batch read results (None: one at a time)
+        self.stages: List[StageMetrics] = []
+        self.queues: List[MeteredQueue] = []
+        self.elapsed = 0.0
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Yields parse(read(item)) for every item, in input order."""
+        # The in-flight bound keeps every queue below depth; the extra room
+        # is for end markers, so a put never blocks
+        capacity = self.depth + self.readers + self.parsers + 1
+        read_q = MeteredQueue('read', self.depth, capacity)
+        parse_q = (LargestFirstQueue('parse', self.depth, capacity, self.work_size) if self.work_size
+                   else MeteredQueue('parse', self.depth, capacity))
+        done_q = MeteredQueue('done', self.depth, capacity)
+        discovery, reading, parsing, sink = (StageMetrics('discovery', 1), StageMetrics('read', self.readers),
+                                            StageMetrics('parse', self.parsers), StageMetrics('sink', 1))
+        self.stages = [discovery, reading, parsing, sink]
+        self.queues = [read_q, parse_q, done_q]
+
+        stop = threading.Event()
+        in_flight = threading.Semaphore(self.depth)
+        start = time.perf_counter()
+
+        def feed():
+            try:
+                source = iter(items)
+                seq = 0
+                while not stop.is_set():
+                    t0 = time.perf_counter()
+                    try:
+                        item = next(source)
+                    except StopIteration:
+                        break
+                    discovery.add(time.perf_counter() - t0)
+                    while not in_flight.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    read_q.put((seq, item))
+                    seq += 1
+            except BaseException as e:
+                stop.set()
+                done_q.put((-1, _Failure(e)))
+            finally:
+                for _ in range(self.readers):
+                    read_q.put(_DONE)
+
+        def stage(fn, inbox, outbox, metrics, running, downstream, batch=None):
+            try:
+                finished = False
+                while not finished:
+                    entry = inbox.get()
+                    if entry is _DONE:
+                        break
+                    entries = [entry]
+                    if batch:
+                        # Up to a fair share of what is waiting, so every parser gets work
+                        limit = min(batch, inbox.qsize() // self.parsers + 1)
+                        while len(entries) < limit:
+                            try:
+                                entry = inbox.get_nowait()
+                            except queue.Empty:
+                                break
+                            if entry is _DONE:
+                                finished = True
+                                break
+                            entries.append(entry)
+                    if stop.is_set():
+                        continue   # Drain
+                    t0 = time.perf_counter()
+                    try:
+                        results = fn([item for _, item in entries]) if batch else [fn(entries[0][1])]
+                    except BaseException as e:
+                        stop.set()
+                        done_q.put((-1, _Failure(e)))
+                        continue
+                    metrics.add(time.perf_counter() - t0, len(entries))
+                    for (seq, _), result in zip(entries, results):
+                        outbox.put((seq, result))
+            finally:
+                # The last thread of the stage passes the end marker on
+                with running[1]:
+                    running[0] -= 1
+                    last = running[0] == 0
+                if last:
+                    for _ in range(downstream):
+                        outbox.put(_DONE)
+
+        threads = [threading.Thread(target=feed, name='pipeline-discovery', daemon=True)]
+        readers_running = [self.readers, threading.Lock()]
+        parsers_running = [self.parsers, threading.Lock()]
+        threads += [threading.Thread(target=stage, args=(self.read, read_q, parse_q, reading, readers_running, self.parsers),
+                                     name=f'pipeline-read-{i}', daemon=True) for i in range(self.readers)]
+        threads += [threading.Thread(target=stage, args=(self.parse, parse_q, done_q, parsing, parsers_running, 1,
+                                                         self.batch),
+                                     name=f'pipeline-parse-{i}', daemon=True) for i in range(self.parsers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            # Results finish out of order; hold them until their turn
+            ready = {}
+            next_seq = 0
+            while True:
+                entry = done_q.get()
+                if entry is _DONE:
+                    break
+                seq, result = entry
+                if isinstance(result, _Failure):
+                    raise result.error
+                ready[seq] = result
+                while next_seq in ready:
+                    result = ready.pop(next_seq)
+                    next_seq += 1
+                    t0 = time.perf_counter()
+                    yield result
+                    sink.add(time.perf_counter() - t0)
+                    in_flight.release()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            if self.on_close:
+                self.on_close()
+            self.elapsed = time.perf_counter() - start
+            for s in self.stages:
+                s.thread_times.elapsed = self.elapsed
+
+    def report(self) -> List[str]:
+        """Per-stage throughput and busy time, and per-queue occupancy, of the last run."""
+        lines = [f"Pipeline: {self.elapsed:.2f} seconds, at most {self.depth} files in flight."]
+        for s in self.stages:
+            rate = s.items / self.elapsed if self.elapsed > 0 else 0.0
+            lines.append(f"  {s.name:<10}{s.items:>8,} files {rate:>10,.0f} files/s   "
+                         f"{s.threads} thread(s) {s.utilisation(self.elapsed):>5.0%} busy")
+            if s.threads > 1:
+                lines.append(f"  {'':<10}{s.thread_times.summary()}")
+        for q in self.queues:
+            lines.append(f"  {q.name + ' queue':<16} occupancy mean {q.mean:.1f}, peak {q.peak} of {q.depth}")
+        return lines
@@ -1,42 +1,195 @@
 import chardet
+import codecs
 import os
-from typing import Tuple, Optional
+import threading
+from typing import Dict, Tuple, Optional
+
+# Encoding strategies, in the order they are tried (reported in the run summary)
+STRATEGY_BOM = 'BOM'
+STRATEGY_UTF8 = 'UTF-8'
+STRATEGY_DIRECTORY = 'Directory cache'
+STRATEGY_SAMPLED = 'Sampled detection'
+STRATEGY_FALLBACK = 'Fallback'
+
+# chardet is pure Python; it only ever sees this much of a file
+DETECTION_SAMPLE_BYTES = 64 * 1024
+
+# Siblings sampled (in sorted order) to learn a folder's encoding
+DIRECTORY_SAMPLE_FILES = 16
+
+# Longest BOMs first: the UTF-32 LE BOM starts with the UTF-16 LE one
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'), (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def _sniff_bom(raw_data: bytes) -> Optional[str]:
+    for bom, encoding in _BOMS:
+        if raw_data.startswith(bom):
+            return encoding
+    return None
+
+
+def _is_utf8(sample: bytes) -> bool:
+    """Whether a leading sample is UTF-8 (a sequence cut off at its end is allowed)."""
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def needs_folder_encoding(raw_data: bytes) -> bool:
+    """Whether decoding raw_data gets past BOM sniffing and strict UTF-8."""
+    if raw_data.isascii() or _sniff_bom(raw_data) is not None:
+        return False
+    try:
+        raw_data.decode('utf-8')
+        return False
+    except UnicodeDecodeError:
+        return True
+
+
+class DirectoryEncodings:
+    """
+    The encoding of each folder's non-UTF-8 files, for one scan. A folder's
+    encoding (per extension) is detected from the first file among its
+    first DIRECTORY_SAMPLE_FILES sorted siblings whose leading sample is
+    neither BOM-marked nor UTF-8, not from whichever sibling happened to be
+    decoded first. Each folder is detected once, however many threads ask;
+    pool workers are handed the decision rather than repeating it.
+    """
+
+    def __init__(self):
+        self._encodings: Dict[Tuple[str, str], Optional[str]] = {}
+        self._detecting: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def encoding_for(self, file_path: str) -> Optional[str]:
+        directory, name = os.path.split(file_path)
+        key = (directory, os.path.splitext(name)[1].lower())
+        with self._lock:
+            if key in self._encodings:
+                return self._encodings[key]
+            detecting = self._detecting.setdefault(key, threading.Lock())
+        with detecting:
+            with self._lock:
+                if key in self._encodings:
+                    return self._encodings[key]
+            encoding = self._detect(*key)
+            with self._lock:
+                self._encodings[key] = encoding
+                self._detecting.pop(key, None)
+        return encoding
+
+    @staticmethod
+    def _detect(directory: str, extension: str) -> Optional[str]:
+        try:
+            names = sorted(n for n in os.listdir(directory or os.curdir)
+                           if os.path.splitext(n)[1].lower() == extension)
+        except OSError:
+            return None
+        for name in names[:DIRECTORY_SAMPLE_FILES]:
+            try:
+                with open(os.path.join(directory, name), 'rb') as f:
+                    sample = f.read(DETECTION_SAMPLE_BYTES)
+            except OSError:
+                continue
+            if _sniff_bom(sample) is None and not _is_utf8(sample):
+                return chardet.detect(sample)['encoding']
+        return None
+
 
 class FileReader:
     @staticmethod
-    def read_file(file_path: str) -> Tuple[Optional[str], str]:
+    def read_file(file_path: str, encodings: Optional[DirectoryEncodings] = None) -> Tuple[Optional[str], str]:
         """
         Reads a file and returns its content and encoding.
         Returns (content, encoding) or (None, error_message).
         """
         try:
-            # First, try reading as binary to detect encoding
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-            
-            result = chardet.detect(raw_data)
-            encoding = result['encoding']
-            
-            if not encoding:
-                # Fallback to utf-8 if detection fails
-                encoding = 'utf-8'
-                
-            # If confidence is low, might be worth trying utf-8 first
+            raw_data = FileReader.read_bytes(file_path)
+        except Exception as e:
+            return None, str(e)
+
+        folder_encoding = None
+        if encodings is not None and needs_folder_encoding(raw_data):
+            folder_encoding = encodings.encoding_for(file_path)
+        return FileReader.decode(raw_data, folder_encoding)
+
+    @staticmethod
+    def read_bytes(file_path: str, size: Optional[int] = None) -> bytes:
+        """
+        Reads the raw file content (callers hash it before paying for decoding).
+        size is the length discovery already stat'ed; it saves read() the
+        fstat it would otherwise make to size its buffer.
+        """
+        with open(file_path, 'rb') as f:
+            if size is None:
+                return f.read()
+            data = f.read(size + 1)
+            if len(data) <= size:
+                return data
+            # The file grew since discovery
+            return data + f.read()
+
+    @staticmethod
+    def decode(raw_data: bytes, folder_encoding: Optional[str] = None) -> Tuple[Optional[str], str]:
+        """
+        Decodes a raw buffer.
+        Returns (content, encoding) or (None, error_message).
+        """
+        content, encoding, _ = FileReader.decode_with_strategy(raw_data, folder_encoding)
+        return content, encoding
+
+    @staticmethod
+    def decode_with_strategy(raw_data: bytes, folder_encoding: Optional[str] = None) -> Tuple[Optional[str], str, str]:
+        """
+        Decodes a raw buffer, cheapest strategy first: BOM sniffing, strict
+        UTF-8, folder_encoding (the scan's DirectoryEncodings decision for
+        the file's folder, when given), then chardet on a bounded sample.
+        Returns (content, encoding, strategy) or (None, error_message, "").
+        """
+        try:
+            encoding = _sniff_bom(raw_data)
+            if encoding:
+                try:
+                    return raw_data.decode(encoding), encoding, STRATEGY_BOM
+                except UnicodeDecodeError:
+                    pass
+
             try:
-                content = raw_data.decode(encoding)
+                return raw_data.decode('utf-8'), 'utf-8', STRATEGY_UTF8
             except UnicodeDecodeError:
+                pass
+
+            if folder_encoding:
+                try:
+                    return raw_data.decode(folder_encoding), folder_encoding, STRATEGY_DIRECTORY
+                except (UnicodeDecodeError, LookupError):
+                    pass
+
+            encoding = chardet.detect(raw_data[:DETECTION_SAMPLE_BYTES])['encoding']
+            strategy = STRATEGY_SAMPLED
+            try:
+                # No verdict falls through to the common encodings (UTF-8 already failed)
+                content = raw_data.decode(encoding or 'utf-8')
+            except (UnicodeDecodeError, LookupError):
                 # Fallback: try common encodings
-                for enc in ['utf-8', 'windows-1252', 'latin-1']:
+                for enc in ['windows-1252', 'latin-1']:
                     try:
                         content = raw_data.decode(enc)
                         encoding = enc
+                        strategy = STRATEGY_FALLBACK
                         break
                     except UnicodeDecodeError:
                         continue
                 else:
-                    return None, "Failed to decode file with detected or fallback encodings."
+                    return None, "Failed to decode file with detected or fallback encodings.", ""
 
-            return content, encoding
+            return content, encoding, strategy
 
         except Exception as e:
-            return None, str(e)
+            return None, str(e), ""
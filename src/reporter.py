@@ -100,6 +100,9 @@ class Reporter:
         self._create_external_css_sheet()
         
         self._create_ajax_sheet() # Merged back
+        self._create_vendor_sheet()
+        self._create_minified_sheet()
+        self._create_oversized_sheet()
         self._create_legend_sheet() # New Legend
         
         self._save_wb(wb, "Code_Inventory.xlsx")
@@ -222,6 +225,9 @@ class Reporter:
         clean_ajax = sum([getattr(f, 'ajax_count', 0) for f in self.findings if f.ajax_detected and f.is_inline_ajax and not f.has_server_deps])
         
         dynamic_count = sum([getattr(f, 'dynamic_count', 0) for f in self.findings])
+        vendor_count = len([f for f in self.findings if f.category == 'Vendor'])
+        minified_count = len([f for f in self.findings if f.category == 'Minified'])
+        oversized_count = len([f for f in self.findings if f.category == 'Oversized'])
 
         # Table Header
         ws.cell(row=6, column=1, value="Detection Summary").font = Font(bold=True, size=14)
@@ -254,6 +260,10 @@ class Reporter:
             ("  - Clean/Extractable", clean_ajax, "AJAX with no server-side dependency markers"),
             ("", "", ""),
             ("Total Dynamic Code Sinks Found", dynamic_count, "Regex match for eval(), innerHTML, document.write()"),
+            ("", "", ""),
+            ("Vendor Libraries (Not Analysed)", vendor_count, "Known third-party files (content hash or name + banner); one row each"),
+            ("Minified/Bundled Files (Counted Only)", minified_count, "Long lines, little whitespace; pattern counts only, not in the totals above"),
+            ("Oversized Files (Windowed Scan)", oversized_count, "Over max_file_size_mb; pattern counts and line numbers only, not in the totals above"),
         ]
 
         for i, (cat, count, criteria) in enumerate(data):
@@ -274,7 +284,7 @@ class Reporter:
     # --- JS Sheets ---
     def _create_inline_js_sheet(self):
         """1. Inline JS: Attributes (onclick, etc.)"""
-        headers = ["File Path", "File Name", "Context", "Line", "Code Snippet", "Full Code"]
+        headers = ["File Path", "File Name", "Duplicates", "Context", "Line", "Code Snippet", "Full Code"]
         data = []
         # Filter: JS + Inline Source + NOT Script Block
         findings = [f for f in self.findings if f.category == 'JS' and f.source_type == 'INLINE' and f.code_type != 'scriptblock']
@@ -283,6 +293,7 @@ class Reporter:
             data.append([
                 f.file_path,
                 os.path.basename(f.file_path),
+                f.duplicate_count,
                 f.code_type,
                 f.start_line,
                 f.snippet,
@@ -292,7 +303,7 @@ class Reporter:
 
     def _create_internal_js_sheet(self):
         """2. Internal JS: Script Blocks"""
-        headers = ["File Path", "File Name", "Extracted File", "Line", "Length (Lines)", "AJAX?", "Code Snippet", "Full Code"]
+        headers = ["File Path", "File Name", "Duplicates", "Extracted File", "Line", "Length (Lines)", "AJAX?", "Code Snippet", "Full Code"]
         data = []
         # Filter: JS + Inline Source + IS Script Block
         findings = [f for f in self.findings if f.category == 'JS' and f.source_type == 'INLINE' and f.code_type == 'scriptblock']
@@ -301,6 +312,7 @@ class Reporter:
             data.append([
                 f.file_path,
                 os.path.basename(f.file_path),
+                f.duplicate_count,
                 f.bundled_file,
                 f.start_line,
                 (f.end_line - f.start_line),
@@ -313,7 +325,7 @@ class Reporter:
     def _create_external_js_sheet(self):
         """3. External JS: Local Files & Remote References"""
         # Added "Contains AJAX?" column
-        headers = ["File Path", "File Name", "Reference Type", "Source/URL", "Contains AJAX?", "Line", "Is Remote?"]
+        headers = ["File Path", "File Name", "Duplicates", "Reference Type", "Source/URL", "Contains AJAX?", "Line", "Is Remote?"]
         data = []
         
         # Filter: 
@@ -339,6 +351,7 @@ class Reporter:
             data.append([
                 f.file_path,
                 os.path.basename(f.file_path),
+                f.duplicate_count,
                 f.code_type,
                 src_url,
                 ajax_status,
@@ -350,7 +363,7 @@ class Reporter:
     # --- CSS Sheets ---
     def _create_inline_css_sheet(self):
         """1. Inline CSS: Attributes (style=...)"""
-        headers = ["File Path", "File Name", "Attribute", "Line", "Code Snippet"]
+        headers = ["File Path", "File Name", "Duplicates", "Attribute", "Line", "Code Snippet"]
         data = []
         # Filter: CSS + Inline Source + NOT Style Block
         findings = [f for f in self.findings if f.category == 'CSS' and f.source_type == 'INLINE' and 'styleblock' not in f.code_type]
@@ -359,6 +372,7 @@ class Reporter:
             data.append([
                 f.file_path,
                 os.path.basename(f.file_path),
+                f.duplicate_count,
                 f.code_type,
                 f.start_line,
                 f.snippet
@@ -367,7 +381,7 @@ class Reporter:
 
     def _create_internal_css_sheet(self):
         """2. Internal CSS: Style Blocks"""
-        headers = ["File Path", "File Name", "Extracted File", "Line", "Code Snippet", "Full Code"]
+        headers = ["File Path", "File Name", "Duplicates", "Extracted File", "Line", "Code Snippet", "Full Code"]
         data = []
         # Filter: CSS + Inline Source + IS Style Block
         findings = [f for f in self.findings if f.category == 'CSS' and f.source_type == 'INLINE' and 'styleblock' in f.code_type]
@@ -376,6 +390,7 @@ class Reporter:
             data.append([
                 f.file_path,
                 os.path.basename(f.file_path),
+                f.duplicate_count,
                 f.bundled_file,
                 f.start_line,
                 f.snippet,
@@ -385,7 +400,7 @@ class Reporter:
 
     def _create_external_css_sheet(self):
         """3. External CSS: Local Files & Remote References"""
-        headers = ["File Path", "File Name", "Reference Type", "Source/URL", "Line", "Is Remote?"]
+        headers = ["File Path", "File Name", "Duplicates", "Reference Type", "Source/URL", "Line", "Is Remote?"]
         data = []
         
         # Filter: 
@@ -403,6 +418,7 @@ class Reporter:
             data.append([
                 f.file_path,
                 os.path.basename(f.file_path),
+                f.duplicate_count,
                 f.code_type,
                 src_url,
                 f.start_line,
@@ -410,6 +426,63 @@ class Reporter:
             ])
         self._create_sheet("External CSS (Files)", headers, data)
 
+    def _create_vendor_sheet(self):
+        """Known third-party libraries: one summary row per file, not analysed"""
+        headers = ["File Path", "File Name", "Duplicates", "Library", "Identified By", "Lines"]
+        data = []
+        for f in self.findings:
+            if f.category != 'Vendor':
+                continue
+            data.append([
+                f.file_path,
+                os.path.basename(f.file_path),
+                f.duplicate_count,
+                f.snippet,
+                f.identified_by,
+                f.end_line
+            ])
+        self._create_sheet("Vendor Libraries", headers, data)
+
+    def _create_minified_sheet(self):
+        """Minified/bundled files: pattern counts and character offsets, one row per file"""
+        headers = ["File Path", "File Name", "Duplicates", "Lines", "Shape", "AJAX Calls", "Dynamic Sinks", "Pattern Counts", "Character Offsets (first 100 per pattern)"]
+        data = []
+        for f in self.findings:
+            if f.category != 'Minified':
+                continue
+            counts = f.pattern_counts
+            data.append([
+                f.file_path,
+                os.path.basename(f.file_path),
+                f.duplicate_count,
+                f.end_line,
+                f.snippet,
+                counts.get('ajax', 0),
+                sum(count for name, count in counts.items() if name != 'ajax'),
+                ", ".join(f"{name} {count}" for name, count in counts.items()),
+                "; ".join(f"{name}: " + ", ".join(map(str, offsets)) for name, offsets in f.match_offsets.items())
+            ])
+        self._create_sheet("Minified Files", headers, data)
+
+    def _create_oversized_sheet(self):
+        """Files over the size limit: pattern counts and line numbers from a windowed scan, one row per file"""
+        headers = ["File Path", "File Name", "Duplicates", "Lines", "Scan", "AJAX Calls", "Pattern Counts", "Line Numbers (first 100 per pattern)"]
+        data = []
+        for f in self.findings:
+            if f.category != 'Oversized':
+                continue
+            data.append([
+                f.file_path,
+                os.path.basename(f.file_path),
+                f.duplicate_count,
+                f.end_line,
+                f.snippet,
+                f.pattern_counts.get('ajax', 0),
+                ", ".join(f"{name} {count}" for name, count in f.pattern_counts.items()),
+                "; ".join(f"{name}: " + ", ".join(map(str, lines)) for name, lines in f.match_lines.items())
+            ])
+        self._create_sheet("Oversized Files", headers, data)
+
     def _create_sheet(self, title: str, headers: List[str], data_rows: List[List[str]]):
         ws = self.wb.create_sheet(title)
         
@@ -632,6 +705,10 @@ class Reporter:
             ("AJAX Calls", "Detected Asynchronous JavaScript patterns (local or remote).", "Indicates data flow. High count = Heavy API dependency."),
             ("Logic Density", "Score based on loops, conditionals, and logic structure.", "Low (<2) = Glue Code (keep inline?), High (>5) = Business Logic (Must Extract)."),
             ("Server Severity", "Presence of @Model, @ViewBag (Razor) or <% (ASP).", "High = Cannot move to .js file without rewriting logic to API/JSON."),
+            ("Vendor Libraries", "Files recognised as a known third-party library (jQuery, Bootstrap, Kendo, DevExtreme, ...) by content hash or file name + banner.", "Not analysed and not in the refactoring trackers. Upgrade or replace; do not refactor."),
+            ("Minified Files", "JS/CSS files whose sampled lines are very long with little whitespace (*.min.js, bundles).", "Only AJAX and dynamic-code patterns are counted, with byte offsets; no snippets. Work from the unminified source instead."),
+            ("Oversized Files", "Files over max_file_size_mb (generated pages, data dumps), scanned in fixed-size overlapping windows instead of being parsed.", "Script/style blocks, handlers, AJAX and dynamic-code patterns are counted with their line numbers; no snippets. Often generated output: fix the generator."),
+            ("Duplicates", "Other scanned files with byte-identical content (e.g. copies of jquery-*.js in several folders).", "Refactor once, then replace or delete the copies."),
         ]
         
         # Header Style
@@ -1,48 +1,143 @@
 import os
-import glob
-from typing import List, Generator
+import time
+from typing import Generator, NamedTuple, Optional
 import logging
 from .config import ScannerConfig
+from .path_matcher import PathMatcher
+from . import git_index
+from .git_index import GitIndexError
+from reposcan_shared.walker import walk
+
+
+class DiscoveredFile(NamedTuple):
+    path: str
+    size: int    # Bytes, from the directory entry's stat
+    mtime: int   # st_mtime_ns, from the directory entry's stat
+    digest: str = ""  # Git blob id when the git index vouches for the content ("" = unknown)
+
 
 class Scanner:
     def __init__(self, config: ScannerConfig):
         self.config = config
+        # Discovery metrics of the last scan
+        self.files_seen = 0
+        self.dirs_seen = 0
+        self.elapsed = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_seen / self.elapsed if self.elapsed > 0 else 0.0
 
     def scan(self) -> Generator[str, None, None]:
         """
         Recursively yields file paths that match the configuration criteria.
         """
+        for discovered in self.discover():
+            yield discovered.path
+
+    def discover(self) -> Generator[DiscoveredFile, None, None]:
+        """
+        Recursively yields the matching files with their size and mtime.
+
+        discovery = walk lists every folder, in os.walk (top-down) order.
+        Each candidate is stat'ed once; on Windows the stat comes with the
+        directory listing itself, which matters on SMB shares. With
+        discovery_threads > 1, folders are listed (and candidates stat'ed)
+        concurrently.
+
+        discovery = git enumerates the files tracked in the checkout's
+        .git/index instead (untracked files are not scanned), in index order,
+        and falls back to walking when root_folder is not in a git checkout.
+        """
         logging.info(f"Scanning directory: {os.path.abspath(self.config.root_folder)}")
-        
-        for root, dirs, files in os.walk(self.config.root_folder):
-            # Modify dirs in-place to skip excluded folders
-            dirs[:] = [d for d in dirs if d not in self.config.exclude_folders]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                
-                if self._should_include(file, file_path):
-                    yield file_path
-
-    def _should_include(self, filename: str, filepath: str) -> bool:
-        # Check extension
-        _, ext = os.path.splitext(filename)
-        if ext.lower() not in self.config.include_extensions:
-            return False
-
-        # Check glob exclusions
-        for pattern in self.config.exclude_files:
-            if glob.fnmatch.fnmatch(filename, pattern):
-                return False
+        self.files_seen = self.dirs_seen = 0
+        start = time.perf_counter()
+        self._matcher = PathMatcher(self.config.include_extensions, self.config.exclude_folders,
+                                    self.config.exclude_files)
+        self._root_prefix = len(os.path.join(self.config.root_folder, ''))
+
+        try:
+            if self.config.discovery == "git":
+                yield from self._discover_git()
+            else:
+                yield from self._walk(self.config.root_folder)
+        finally:
+            self.elapsed = time.perf_counter() - start
+
+    def _walk(self, folder: str) -> Generator[DiscoveredFile, None, None]:
+        for listing in walk(folder, self._should_include,
+                            skip_dir=lambda entry: not self._matcher.include_dir(self._relative(entry)),
+                            threads=self.config.discovery_threads):
+            self.dirs_seen += 1
+            self.files_seen += listing.file_count
+            yield from listing.files
+
+    def _discover_git(self) -> Generator[DiscoveredFile, None, None]:
+        root = self.config.root_folder
+        try:
+            entries, index_mtime = git_index.tracked_files(root)
+        except GitIndexError as e:
+            logging.info(f"Git index not usable ({e}); walking {root} instead.")
+            yield from self._walk(root)
+            return
+
+        included_dirs = {'': True}
+
+        def include_dir(rel_dir: str) -> bool:
+            # Folder rules apply to every ancestor, as if the tree were walked
+            if rel_dir not in included_dirs:
+                parent = rel_dir.rpartition('/')[0]
+                included_dirs[rel_dir] = include_dir(parent) and self._matcher.include_dir(rel_dir)
+                self.dirs_seen += 1
+            return included_dirs[rel_dir]
+
+        max_size = self.config.max_file_size_mb * 1024 * 1024
+        for entry in entries:
+            if not include_dir(entry.path.rpartition('/')[0]):
+                continue
+            full_path = os.path.join(root, *entry.path.split('/'))
+            if entry.mode == git_index.MODE_GITLINK:
+                # Submodule: its files are listed in its own index, walk it
+                if include_dir(entry.path):
+                    yield from self._walk(full_path)
+                continue
+
+            self.files_seen += 1
+            if not self._matcher.include_file(entry.path):
+                continue
+            try:
+                # Deleted-but-tracked files drop out here; the stat also
+                # tells whether git's cached blob id still holds
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            if st.st_size > max_size and self.config.oversized_files == "skip":
+                continue
+
+            # A symlink's blob is the link target, not the file content
+            known = entry.mode == git_index.MODE_FILE and git_index.stat_matches(entry, st, index_mtime)
+            digest = entry.blob_id if known else ""
+            yield DiscoveredFile(full_path, st.st_size, st.st_mtime_ns, digest)
+
+    def _relative(self, entry: 'os.DirEntry') -> str:
+        """The entry's path relative to the scan root, '/'-separated (as the filter rules are written)."""
+        rel_path = entry.path[self._root_prefix:]
+        return rel_path.replace(os.sep, '/') if os.sep != '/' else rel_path
+
+    def _should_include(self, entry: 'os.DirEntry') -> Optional[DiscoveredFile]:
+        # Check extension and exclusion rules (one compiled matcher)
+        if not self._matcher.include_file(self._relative(entry)):
+            return None
 
         # Check file size
         try:
-            size_mb = os.path.getsize(filepath) / (1024 * 1024)
-            if size_mb > self.config.max_file_size_mb:
-                # Optional: Log warning about skipped large file
-                return False
+            st = entry.stat()
+            size_mb = st.st_size / (1024 * 1024)
+            if size_mb > self.config.max_file_size_mb and self.config.oversized_files == "skip":
+                # Larger files are otherwise scanned in windows by the engine
+                return None
         except OSError:
             # File might be inaccessible
-            return False
+            return None
 
-        return True
+        return DiscoveredFile(entry.path, st.st_size, st.st_mtime_ns)
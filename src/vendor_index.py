@@ -0,0 +1,169 @@
+r"""
+Known Third-Party Library Index for RepoScan-Analyser
+
+Classifies vendor files (jQuery, Bootstrap, Telerik/Kendo, DevExpress, ...)
+before they are parsed, so their thousands of always-discarded matches
+cost nothing. A file is vendor code when either
+
+    its content hash is listed in the index (O(1) dict lookup), or
+    its file name matches a library's name pattern AND the library's
+    banner comment appears in its first kilobyte (a renamed bundle that
+    merely embeds jQuery keeps its own name and is analysed)
+
+Hashes are git blob ids (see manifest.content_digest), so
+`git hash-object jquery-1.12.4.min.js` prints the value to list.
+
+The built-in heuristics can be extended with a local JSON file
+([Vendor] index_file):
+
+    {
+      "hashes": {"<git blob id>": "jQuery 1.12.4"},
+      "libraries": [
+        {"name": "Contoso Grid", "file": "contoso\\.grid(\\.min)?\\.js",
+         "banner": "Contoso Grid v(?P<version>[\\d.]+)"}
+      ]
+    }
+
+`python -m src.vendor_index add <index_file> <label> <files...>` hashes
+files and adds them to the index file.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import logging
+from typing import Dict, List, NamedTuple, Optional
+
+BANNER_BYTES = 1024
+_NAMED_GROUP = re.compile(r'\(\?P<\w+>')
+
+# (name, file name pattern, banner pattern); a 'version' group in either supplies the version
+BUILTIN_LIBRARIES = [
+    ("jQuery", r'jquery(?:-(?P<version>\d[\w.]*?))?(?:\.slim)?(?:\.min)?\.js',
+     r'jQuery (?:JavaScript Library )?v(?P<version>\d[\w.-]*)'),
+    ("jQuery UI", r'jquery-ui(?:-(?P<version>\d[\w.]*?))?(?:\.custom)?(?:\.min)?\.(?:js|css)',
+     r'jQuery UI - v(?P<version>\d[\w.]*)'),
+    ("jQuery Validation", r'jquery\.validate(?:\.unobtrusive)?(?:\.min)?\.js',
+     r'jQuery Validation Plugin (?:- )?v(?P<version>\d[\w.]*)|Unobtrusive validation support library for jQuery'),
+    ("Bootstrap", r'bootstrap(?:-(?P<version>\d[\w.]*?))?(?:\.bundle)?(?:\.min)?\.(?:js|css)',
+     r'Bootstrap v(?P<version>\d[\w.]*)'),
+    ("Modernizr", r'modernizr(?:-(?P<version>\d[\w.]*?))?(?:\.min)?\.js',
+     r'Modernizr v?(?P<version>\d[\w.]*)'),
+    ("Knockout", r'knockout(?:-(?P<version>\d[\w.]*?))?(?:\.min|\.debug)?\.js',
+     r'Knockout JavaScript library v(?P<version>\d[\w.]*)'),
+    ("AngularJS", r'angular(?:\.min)?\.js',
+     r'AngularJS v(?P<version>\d[\w.]*)'),
+    ("Kendo UI", r'kendo\.[\w.]+\.(?:js|css)',
+     r'Kendo UI v(?P<version>\d[\w.]*)'),
+    ("Telerik UI", r'telerik\.[\w.]+\.(?:js|css)',
+     r'Telerik'),
+    ("DevExtreme", r'dx\.[\w.]+\.(?:js|css)',
+     r'DevExtreme \([^)]*\)\s*\*?\s*Version:\s*(?P<version>\d[\w.]*)'),
+    ("Microsoft Ajax", r'MicrosoftAjax(?:WebForms|MVC)?(?:\.debug)?\.js',
+     r'Assembly:\s*System\.Web(?:\.Extensions|\.Mvc)?\s*(?://)?\s*Version:\s*(?P<version>[\d.]+)|MicrosoftAjax'),
+    ("Font Awesome", r'(?:font-awesome|fontawesome|all)(?:\.min)?\.css',
+     r'Font Awesome (?:Free |Pro )?(?P<version>\d[\w.]*)'),
+]
+
+
+class VendorLibrary(NamedTuple):
+    name: str
+    file_regex: 're.Pattern'
+    banner_regex: 're.Pattern'
+
+
+class VendorMatch(NamedTuple):
+    label: str       # "jQuery 3.6.0"
+    matched_by: str  # "content hash" or "file name + banner"
+
+
+class VendorIndex:
+    def __init__(self, libraries: List[VendorLibrary], hashes: Dict[str, str]):
+        self.libraries = libraries
+        self.hashes = hashes
+        # One screen for all name patterns (their named groups repeat, so
+        # they are made non-capturing): most file names match no library
+        try:
+            self._any_file = re.compile('|'.join(f'(?:{_NAMED_GROUP.sub("(?:", lib.file_regex.pattern)})'
+                                                 for lib in libraries), re.IGNORECASE)
+        except re.error:
+            self._any_file = None
+
+    @classmethod
+    def load(cls, index_file: Optional[str] = None) -> 'VendorIndex':
+        """Built-in libraries plus the local index file, if it exists."""
+        definitions = list(BUILTIN_LIBRARIES)
+        hashes = {}
+        if index_file and os.path.exists(index_file):
+            try:
+                with open(index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                hashes.update({k.lower(): v for k, v in data.get('hashes', {}).items()})
+                definitions += [(lib['name'], lib['file'], lib['banner']) for lib in data.get('libraries', [])]
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logging.warning(f"Could not read vendor index {index_file}: {e}. Using the built-in libraries only.")
+
+        libraries = []
+        for name, file_pattern, banner_pattern in definitions:
+            try:
+                libraries.append(VendorLibrary(name, re.compile(file_pattern, re.IGNORECASE), re.compile(banner_pattern)))
+            except re.error as e:
+                logging.warning(f"Skipping vendor library '{name}': invalid pattern ({e})")
+        return cls(libraries, hashes)
+
+    def fingerprint(self) -> str:
+        """Changes whenever the index would classify some file differently (invalidates the scan manifest)."""
+        digest = hashlib.sha1()
+        for lib in self.libraries:
+            digest.update(f"{lib.name}\x00{lib.file_regex.pattern}\x00{lib.banner_regex.pattern}\x00".encode('utf-8'))
+        for content_hash in sorted(self.hashes):
+            digest.update(f"{content_hash}\x00{self.hashes[content_hash]}\x00".encode('utf-8'))
+        return digest.hexdigest()
+
+    def classify(self, file_path: str, raw_data: bytes, digest: str) -> Optional[VendorMatch]:
+        """The known library the file is, or None (analyse it)."""
+        label = self.hashes.get(digest)
+        if label:
+            return VendorMatch(label, "content hash")
+
+        name = os.path.basename(file_path)
+        if self._any_file is not None and not self._any_file.fullmatch(name):
+            return None
+
+        banner = raw_data[:BANNER_BYTES].decode('latin-1')
+        for lib in self.libraries:
+            name_match = lib.file_regex.fullmatch(name)
+            if not name_match:
+                continue
+            banner_match = lib.banner_regex.search(banner)
+            if not banner_match:
+                continue
+            version = banner_match.groupdict().get('version') or name_match.groupdict().get('version')
+            return VendorMatch(f"{lib.name} {version}" if version else lib.name, "file name + banner")
+        return None
+
+
+def add_to_index(index_file: str, label: str, paths: List[str]):
+    """Adds the content hash of each file to the local index file under label."""
+    from .manifest import content_digest
+
+    data = {}
+    if os.path.exists(index_file):
+        with open(index_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    hashes = data.setdefault('hashes', {})
+    for path in paths:
+        with open(path, 'rb') as f:
+            hashes[content_digest(f.read())] = label
+        print(f"{path}: {label}")
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 5 or sys.argv[1] != 'add':
+        print("Usage: python -m src.vendor_index add <index_file> <label> <files...>")
+        sys.exit(1)
+    add_to_index(sys.argv[2], sys.argv[3], sys.argv[4:])
@@ -0,0 +1,54 @@
+import unittest
+from reposcan_shared import patterns
+from reposcan_shared import prefilter
+from reposcan_shared.ajax_patterns import AJAX_ANCHORS, AJAX_CLASSIFICATION, classify_ajax_match
+
+class TestAjaxPatterns(unittest.TestCase):
+    def test_every_group_is_classified(self):
+        self.assertEqual(set(patterns.get('ajax_call_groups').groupindex), set(AJAX_CLASSIFICATION))
+        self.assertEqual(patterns.get('ajax_call').groups, 0)
+
+    def classify(self, code):
+        return [(m.group(), classify_ajax_match(m).capability) for m in patterns.get('ajax_call').finditer(code)]
+
+    def test_classification_follows_matched_alternative(self):
+        self.assertEqual(self.classify('$.getScript("a.js"); $.load("/x"); $.ajaxSetup({}); $.param(d);'), [
+            ('$.getScript(', "Script Loading (Dynamic)"),
+            ('$.load(', "UI Injection (Likely)"),
+            ('$.ajaxSetup(', "AJAX Configuration"),
+            ('$.param(', "Form/Data Utility"),
+        ])
+        # Method names no longer leak into the classification through substrings
+        self.assertEqual(self.classify('PageMethods.LoadOrders(1)'), [('PageMethods.LoadOrders(', "RPC (Code-Behind)")])
+        self.assertEqual(self.classify('data-ajax-loading="#spinner"'), [('data-ajax-loading=', "Declarative AJAX")])
+
+    def test_registry_compiles_once(self):
+        self.assertIs(patterns.get('ajax_call'), patterns.get('ajax_call'))
+        self.assertEqual(patterns.pattern_version(), patterns.pattern_version())
+
+    def test_server_dependencies_report_first_reason(self):
+        reasons = [reason for pattern, reason in patterns.server_dependencies() if pattern.search('var id = @Model.Id;')]
+        self.assertEqual(reasons, ['Razor Model syntax detected'])
+        self.assertIsNone(patterns.get('server_dependency').search('var id = 1;'))
+
+    def test_prefilter_matches_full_scan(self):
+        code = '''
+            var xhr = new   XMLHttpRequest(); xhr.open("GET", url); xhr.send();
+            <asp:UpdatePanel runat="server"> <my_ctl:ScriptManager />
+            $.getJSON("/api"); io(); function option() {} new
+            WebSocket("ws://x"); img.src = "https://t.example/p.gif";
+        '''
+        saved = prefilter.ahocorasick
+        try:
+            for automaton in (saved, None):
+                prefilter.ahocorasick = automaton
+                pf = prefilter.LiteralPrefilter(patterns.get('ajax_call'), AJAX_ANCHORS)
+                for text in (code, code.upper(), 'var total = price * qty;'):
+                    expected = [m.span() for m in patterns.get('ajax_call').finditer(text)]
+                    self.assertEqual([m.span() for m in pf.finditer(text)], expected)
+                self.assertEqual(pf.stats.snapshot()[:2], (3, 1))
+        finally:
+            prefilter.ahocorasick = saved
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import io
+import unittest
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from unittest import mock
+from reposcan_shared import prefilter, windowed
+from reposcan_shared.scheduling import plan_tasks
+from repo_depth_analyser.src import scanner as depth_scanner
+from repo_depth_analyser.src.scanner import Scanner
+
+PAGE = '''<html><head><link rel="stylesheet" href="site.css"><style>.a { color: red; }</style></head>
+<body onload="init()">
+  <div style="display:none">x</div>
+  <script src="app.js"></script>
+  <script>
+    $.ajax({ url: '/api/items' });
+    fetch('/api/users').then(r => r.json());
+    xhr.open('GET', '/legacy');
+    document.getElementById('out').innerHTML = html;
+    var s = document.createElement('script');
+    el.style.color = 'red';
+  </script>
+</body></html>
+'''
+
+class TestDepthScanner(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_memory_mapped_scan_matches_text_scan(self):
+        path = os.path.join(self.test_dir, 'Page.aspx')
+        with open(path, 'w') as f:
+            f.write(PAGE * 3)
+
+        scanner = Scanner(self.test_dir)
+        expected = scanner.count_lines_and_analyze(path)
+        # Small windows and chunks put matches, anchors and newlines across their boundaries
+        with mock.patch.object(depth_scanner, 'MMAP_THRESHOLD', 1), \
+                mock.patch.object(windowed, 'WINDOW_BYTES', 200), \
+                mock.patch.object(windowed, 'OVERLAP_BYTES', 400), \
+                mock.patch.object(prefilter, 'SCAN_CHUNK', 64):
+            mapped = scanner.count_lines_and_analyze(path)
+
+        self.assertEqual(mapped, expected)
+        self.assertEqual(expected['lines'], PAGE.count('\n') * 3 + 1)
+        self.assertGreater(expected['ajax_calls'], 0)
+
+        # Files that are not web code only have their lines counted
+        notes = os.path.join(self.test_dir, 'notes.txt')
+        with open(notes, 'w') as f:
+            f.write(PAGE)
+        with mock.patch.object(depth_scanner, 'MMAP_THRESHOLD', 1), \
+                mock.patch.object(depth_scanner, 'LINE_COUNT_CHUNK', 100):
+            self.assertEqual(scanner.count_lines_and_analyze(notes)['lines'], PAGE.count('\n') + 1)
+
+    def test_process_engine_matches_thread_engine(self):
+        for i in range(7):
+            folder = os.path.join(self.test_dir, f'area{i % 3}')
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f'Page{i}.aspx'), 'w') as f:
+                f.write(PAGE * (i + 1))
+
+        expected = Scanner(self.test_dir, engine='thread', largest_first=False).scan()
+        for engine, workers in (('thread', 0), ('process', 1), ('process', 2)):
+            with mock.patch.object(depth_scanner, 'TASK_SIZE', 2):
+                scanner = Scanner(self.test_dir, engine=engine, workers=workers)
+                scanned = scanner.scan()
+
+            # Files complete largest first, but are reported in walk order
+            self.assertEqual(len(scanned[0]), 7)
+            self.assertEqual(scanned, expected)
+            times = scanner.worker_times.times()
+            self.assertEqual(len(times), 7 if engine == 'thread' else workers)
+            self.assertTrue(all(busy + idle >= scanner.worker_times.elapsed - 1e-6 for busy, idle in times))
+
+    def test_largest_files_are_planned_first(self):
+        sizes = [1, 5, 300, 2, 5, 90, 1]
+        tasks = plan_tasks(sizes, lambda size: size, max_items=3, max_bytes=100)
+        # A file over max_bytes makes a task alone; tasks run largest total first
+        self.assertEqual(tasks, [[300], [90, 5, 5], [2, 1, 1]])
+
+    def test_verbose_progress_reports_folder_totals(self):
+        for folder, copies in (('Admin', 3), ('Public', 1)):
+            os.makedirs(os.path.join(self.test_dir, folder))
+            for i in range(copies):
+                with open(os.path.join(self.test_dir, folder, f'Page{i}.aspx'), 'w') as f:
+                    f.write(PAGE)
+        per_page = Scanner(self.test_dir).count_lines_and_analyze(os.path.join(self.test_dir, 'Public', 'Page0.aspx'))
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            _, dir_stats, _ = Scanner(self.test_dir, engine='thread').scan(verbose=True)
+
+        # Each folder is reported once, after its last file, with the running totals
+        self.assertEqual(dir_stats['Admin']['ajax_calls'], 3 * per_page['ajax_calls'])
+        self.assertEqual(output.getvalue().count('  Admin\n'), 1)
+        self.assertIn(f"    Files: 3 | JS: {3 * per_page['inline_js']} | CSS: {3 * per_page['inline_css']} | "
+                      f"AJAX: {3 * per_page['ajax_calls']}\n", output.getvalue())
+        self.assertIn('[4/4 files | 2/2 folders]', output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import os
+import shutil
+import tempfile
+from src.config import ScannerConfig
+from src.engine import analysis_pipeline
+
+class TestEngine(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_process_pool_matches_serial_in_input_order(self):
+        paths = []
+        for i in range(10):
+            path = os.path.join(self.test_dir, f'Page{i}.aspx')
+            with open(path, 'wb') as f:
+                f.write(f'<script>$.ajax({{url: "/api/{i}"}});</script>\n<div style="color:red">£{i}</div>'
+                        .encode('cp1252' if i == 3 else 'utf-8'))
+            paths.append(path)
+        paths.insert(5, os.path.join(self.test_dir, 'Missing.aspx'))
+
+        items = [(p, None, None) for p in paths]
+        serial = list(analysis_pipeline().run(items))
+        # A queue shallower than the file count, so results come back from several batches
+        pooled = list(analysis_pipeline(workers=2, queue_depth=4).run(items))
+
+        self.assertEqual([r.file_path for r in pooled], paths)
+        self.assertIsNone(pooled[5].findings)
+        for result, reference in zip(pooled, serial):
+            self.assertEqual((result.encoding, result.decode_strategy), (reference.encoding, reference.decode_strategy))
+            self.assertEqual([vars(f) for f in result.findings or []], [vars(f) for f in reference.findings or []])
+        self.assertTrue(all(r.findings for r in pooled if r.file_path != paths[5]))
+
+    def test_workers_from_config(self):
+        path = os.path.join(self.test_dir, 'config.ini')
+        with open(path, 'w') as f:
+            f.write('[Performance]\nworkers = 0\n')
+        self.assertEqual(ScannerConfig.load(path).workers, 0)
+        self.assertEqual(ScannerConfig().workers, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import re
+import unittest
+from reposcan_shared import patterns
+from reposcan_shared.enrichment import DYNAMIC_ANCHORS, ENRICHMENT_ANCHORS, count_enrichment_groups
+from reposcan_shared.prefilter import LiteralPrefilter
+from src.parser import Parser, CodeSnippet
+
+CODE = '''
+    function validate(form) {
+        if (form.name.value == '') { document.getElementById('err').innerHTML = 'Required'; return false; }
+        for (var i = 0; i < rows.length; i++) { rows[i].style.display = 'none'; }
+        var f = new   Function('a', 'return a'); System.import('./m.js'); el.classList.add('x');
+        btn.addEventListener('click', go); $("#id").hide(); var url = '@Url.Action("Save")';
+    }
+'''
+
+class TestEnrichment(unittest.TestCase):
+    def test_fused_scan_counts_each_member(self):
+        counts = count_enrichment_groups(CODE)
+        for name in patterns.ENRICHMENT_GROUPS:
+            source, flags = patterns.PATTERN_SOURCES[name]
+            self.assertEqual(counts[name], len(patterns.get(name).findall(CODE.lower() if not flags else CODE)), name)
+
+    def test_overlapping_members_each_count(self):
+        # 'function setTimeout' is a logic structure and 'setTimeout(' a JS sink, as with separate scans
+        text = 'function setTimeout(cb) { if (x) el.style.color = "red"; }'
+        counts = count_enrichment_groups(text)
+        self.assertEqual((counts['logic_structures'], counts['js_sink'], counts['dynamic_style']), (2, 1, 1))
+        for name in patterns.ENRICHMENT_GROUPS:
+            self.assertEqual(counts[name], len(re.findall(patterns.PATTERN_SOURCES[name][0], text, re.I)), name)
+
+    def test_prefilter_matches_full_scan(self):
+        for name, anchors in (('enrichment', ENRICHMENT_ANCHORS), ('dynamic_sinks', DYNAMIC_ANCHORS)):
+            pf = LiteralPrefilter(patterns.get(name), anchors)
+            for text in (CODE, CODE.upper(), 'var total = price * qty;'):
+                expected = [m.span() for m in patterns.get(name).finditer(text)]
+                self.assertEqual([m.span() for m in pf.finditer(text)], expected)
+
+    def test_parser_fields(self):
+        snippet = CodeSnippet('a.aspx', 1, 8, 'JS', CODE[:200], 'scriptblock', full_code=CODE)
+        Parser()._enrich(snippet)
+        self.assertEqual((snippet.dynamic_pattern, snippet.dynamic_count), ('dom_sink', 5))
+        self.assertEqual((snippet.logic_density_score, snippet.complexity), (8, "High"))  # +1 for the @Url. construct
+        self.assertTrue(snippet.ajax_detected)
+        self.assertEqual((snippet.server_severity, snippet.functionality), ("Medium", "Data/Network Operation"))
+
+if __name__ == '__main__':
+    unittest.main()
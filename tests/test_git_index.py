@@ -0,0 +1,95 @@
+import unittest
+import os
+import shutil
+import subprocess
+import tempfile
+from src.config import ScannerConfig
+from src.scanner import Scanner
+from src.manifest import ScanManifest, content_digest
+from src.parser import CodeSnippet
+from src import git_index
+
+@unittest.skipUnless(shutil.which('git'), "git is not installed")
+class TestGitIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for rel in ('Default.aspx', 'Views/Home/Index.cshtml', 'bin/Debug/Skip.aspx', 'Scripts/app.js', 'Scripts/vendor.js'):
+            self._write(rel, f'<script>init("{rel}");</script>\n')
+        self._git('init', '-q')
+        self._git('add', '.')
+        self._write('Untracked.aspx', '<script>draft();</script>\n')
+        os.remove(os.path.join(self.test_dir, 'Scripts', 'vendor.js'))
+
+        self.config = ScannerConfig()
+        self.config.root_folder = self.test_dir
+        self.config.include_extensions = {'.aspx', '.cshtml', '.js'}
+        self.config.exclude_folders = ['bin']
+        self.config.discovery = 'git'
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, rel, text):
+        path = os.path.join(self.test_dir, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def _git(self, *args):
+        return subprocess.run(['git', '-C', self.test_dir] + list(args), check=True,
+                              capture_output=True, text=True).stdout
+
+    def test_index_matches_ls_files(self):
+        for version in ('2', '4'):
+            self._git('update-index', '--index-version', version)
+            expected = [line.split('\t', 1)[1] for line in self._git('ls-files', '-s').splitlines()]
+            blob_ids = [line.split()[1] for line in self._git('ls-files', '-s').splitlines()]
+            entries, _ = git_index.tracked_files(self.test_dir)
+            self.assertEqual([e.path for e in entries], expected)
+            self.assertEqual([e.blob_id for e in entries], blob_ids)
+
+        # Scanning a subfolder keeps only its entries, relative to it
+        entries, _ = git_index.tracked_files(os.path.join(self.test_dir, 'Scripts'))
+        self.assertEqual([e.path for e in entries], ['app.js', 'vendor.js'])
+
+    def test_git_discovery(self):
+        scanner = Scanner(self.config)
+        found = {os.path.relpath(f.path, self.test_dir).replace(os.sep, '/'): f for f in scanner.discover()}
+        # Tracked files only; excluded folders and deleted files drop out
+        self.assertEqual(sorted(found), ['Default.aspx', 'Scripts/app.js', 'Views/Home/Index.cshtml'])
+        for f in found.values():
+            if f.digest:
+                with open(f.path, 'rb') as fh:
+                    self.assertEqual(f.digest, content_digest(fh.read()))
+
+        # Not a git checkout: falls back to walking
+        plain_dir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(plain_dir, 'Page.aspx'), 'w') as f:
+                f.write('<script></script>')
+            self.config.root_folder = plain_dir
+            self.assertEqual([f.path for f in Scanner(self.config).discover()], [os.path.join(plain_dir, 'Page.aspx')])
+        finally:
+            shutil.rmtree(plain_dir)
+
+    def test_manifest_reuses_findings_by_blob_id(self):
+        path = os.path.join(self.test_dir, 'Default.aspx')
+        with open(path, 'rb') as f:
+            digest = content_digest(f.read())
+        finding = CodeSnippet(path, 1, 1, 'JS', 'init();', 'Script Block')
+
+        first = ScanManifest(self.test_dir)
+        self.assertIsNone(first.lookup(path))
+        first.record(path, digest, [finding])
+        first.save()
+
+        # A checkout rewrote the file (new mtime) with the same content
+        second = ScanManifest(self.test_dir)
+        second.load()
+        st = os.stat(path)
+        self.assertIsNone(second.lookup(path, st.st_size, st.st_mtime_ns + 1))
+        findings = second.lookup(path, st.st_size, st.st_mtime_ns + 1, digest)
+        self.assertEqual([f.snippet for f in findings], ['init();'])
+
+if __name__ == '__main__':
+    unittest.main()
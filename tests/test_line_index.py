@@ -0,0 +1,18 @@
+import unittest
+from reposcan_shared.lineindex import LineIndex
+
+class TestLineIndex(unittest.TestCase):
+    def test_matches_newline_counting(self):
+        text = "first\nsecond\n\nfourth é\nfifth"
+        index = LineIndex(text)
+        for offset in range(len(text)):
+            self.assertEqual(index.line_of(offset), text.count('\n', 0, offset) + 1)
+        self.assertEqual(index.line_count(), text.count('\n') + 1)
+
+    def test_bytes_buffer(self):
+        data = b"<html>\n<script>\nfetch('/api')\n</script>"
+        index = LineIndex(data)
+        self.assertEqual(index.line_of(data.index(b"fetch")), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from reposcan_shared import minified
+from src.parser import Parser
+
+# One 10 KB line, like a *.min.js
+BUNDLE = ('!function(e){var t="é";' + 'e.innerHTML=t;$.ajax({url:"/x"});if(e){e.a=1}' * 200 + '}(window);').strip()
+SOURCE = '\n'.join(['function save(item) {', '    if (item) {', '        $.ajax({ url: "/x" });', '    }', '}', ''] * 200)
+
+class TestMinified(unittest.TestCase):
+    def test_detection(self):
+        self.assertIsNotNone(minified.looks_minified(BUNDLE))
+        self.assertIsNone(minified.looks_minified(SOURCE))
+        self.assertIsNone(minified.looks_minified(BUNDLE[:2000]))  # Small files are analysed in full
+
+    def test_counting_only_finding(self):
+        finding, = Parser().parse('Scripts/app.min.js', BUNDLE)
+        self.assertEqual((finding.category, finding.code_type, finding.end_line), ('Minified', 'Minified/Bundled', 1))
+        self.assertEqual(finding.pattern_counts, {'ajax': 200, 'dom_sink': 200})
+        self.assertEqual(len(finding.match_offsets['ajax']), 100)
+        # Offsets are into the decoded text, whatever encoding it was read from
+        self.assertEqual(finding.match_offsets['ajax'][0], BUNDLE.index('$.ajax'))
+
+        # Overlapping dynamic groups each count, as in snippet enrichment
+        finding, = Parser().parse('Scripts/app.min.js', 'img.style.src=u;' * 300)
+        self.assertEqual(finding.pattern_counts, {'dynamic_load': 300, 'dynamic_css': 300})
+
+        # The same content in an ASPX page is still analysed in full
+        self.assertNotIn('Minified', [f.category for f in Parser().parse('Page.js.aspx', '<script>' + BUNDLE + '</script>')])
+
+if __name__ == '__main__':
+    unittest.main()
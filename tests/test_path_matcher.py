@@ -0,0 +1,32 @@
+import unittest
+from src.path_matcher import PathMatcher
+
+class TestPathMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = PathMatcher(
+            {'.aspx', '.js'},
+            ['bin', 'obj', 'Scripts/vendor/**', '**/App_Data', '!Areas/Admin/bin'],
+            ['*.min.js', '!app.min.js', 'Scripts/legacy/*.js', 'Default[0-9].aspx'])
+
+    def test_folder_rules(self):
+        self.assertFalse(self.matcher.include_dir('bin'))
+        self.assertFalse(self.matcher.include_dir('Areas/Shop/obj'))
+        self.assertFalse(self.matcher.include_dir('Scripts/vendor'))
+        self.assertTrue(self.matcher.include_dir('Scripts/vendors'))
+        self.assertTrue(self.matcher.include_dir('Content/Scripts/vendor'))  # Paths are anchored at the root
+        self.assertFalse(self.matcher.include_dir('Areas/Shop/App_Data'))
+        # Negation: the last matching rule wins
+        self.assertTrue(self.matcher.include_dir('Areas/Admin/bin'))
+
+    def test_file_rules(self):
+        self.assertTrue(self.matcher.include_file('Views/Default.aspx'))
+        self.assertFalse(self.matcher.include_file('Views/site.css'))
+        self.assertFalse(self.matcher.include_file('Scripts/jquery.min.js'))
+        self.assertTrue(self.matcher.include_file('Scripts/app.min.js'))
+        self.assertFalse(self.matcher.include_file('Scripts/legacy/grid.js'))
+        self.assertTrue(self.matcher.include_file('Scripts/legacy/sub/grid.js'))  # '*' stays within a segment
+        self.assertFalse(self.matcher.include_file('Default1.aspx'))
+        self.assertTrue(self.matcher.include_file('Default10.aspx'))
+
+if __name__ == '__main__':
+    unittest.main()
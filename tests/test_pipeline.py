@@ -0,0 +1,165 @@
+import unittest
+import os
+import time
+import random
+import shutil
+import tempfile
+import threading
+import multiprocessing
+from src.pipeline import Pipeline
+from src.engine import analysis_pipeline
+from repo_depth_analyser.src.scanner import Scanner as DepthScanner
+from tests.test_depth_scanner import PAGE
+
+class TestPipeline(unittest.TestCase):
+    def test_results_in_input_order_with_bounded_flight(self):
+        lock = threading.Lock()
+        state = {'in_flight': 0, 'peak': 0}
+
+        def read(n):
+            with lock:
+                state['in_flight'] += 1
+                state['peak'] = max(state['peak'], state['in_flight'])
+            time.sleep(random.random() / 1000)
+            return n * 2
+
+        pipeline = Pipeline(read, lambda n: n + 1, readers=4, parsers=3, depth=8)
+        results = []
+        for result in pipeline.run(range(200)):
+            results.append(result)
+            with lock:
+                state['in_flight'] -= 1
+
+        self.assertEqual(results, [n * 2 + 1 for n in range(200)])
+        self.assertLessEqual(state['peak'], 8)
+        self.assertEqual([s.items for s in pipeline.stages], [200] * 4)
+        self.assertTrue(all(q.peak <= 8 for q in pipeline.queues))
+
+    def test_batched_parse_keeps_input_order(self):
+        batches = []
+
+        def parse(items):
+            batches.append(len(items))
+            time.sleep(0.001)
+            return [n + 1 for n in items]
+
+        pipeline = Pipeline(lambda n: n * 2, parse, readers=4, parsers=2, depth=16, batch=5)
+        self.assertEqual(list(pipeline.run(range(100))), [n * 2 + 1 for n in range(100)])
+        self.assertTrue(all(1 <= size <= 5 for size in batches))
+        self.assertEqual(sum(batches), 100)
+        self.assertEqual(pipeline.stages[2].items, 100)
+
+    def test_stage_error_reaches_the_caller(self):
+        def parse(n):
+            if n == 50:
+                raise ValueError("bad file")
+            return n
+
+        closed = []
+        pipeline = Pipeline(lambda n: n, parse, depth=4, on_close=lambda: closed.append(True))
+        with self.assertRaises(ValueError):
+            list(pipeline.run(range(100)))
+        self.assertEqual(closed, [True])
+
+        # Stopping early shuts the stages down too
+        run = pipeline.run(range(100))
+        self.assertEqual(next(run), 0)
+        run.close()
+        self.assertEqual(closed, [True, True])
+
+    def test_largest_waiting_item_parsed_first(self):
+        release = threading.Event()
+        parsed = []
+        size = lambda n: n % 4
+
+        def parse(n):
+            if not parsed:
+                release.wait()   # Holds the only parser while the rest queue up
+            parsed.append(n)
+            return n
+
+        pipeline = Pipeline(lambda n: n, parse, readers=1, parsers=1, depth=8, work_size=size)
+        results = []
+        consumer = threading.Thread(target=lambda: results.extend(pipeline.run(range(8))))
+        consumer.start()
+        deadline = time.monotonic() + 5
+        while not pipeline.queues or pipeline.queues[1].qsize() < 7:
+            if time.monotonic() > deadline:
+                release.set()
+                consumer.join()
+                self.fail("parse queue never filled")
+            time.sleep(0.001)
+        release.set()
+        consumer.join()
+
+        # Results still come out in input order
+        self.assertEqual(results, list(range(8)))
+        self.assertEqual(parsed[1:], sorted(parsed[1:], key=lambda n: (-size(n), n)))
+        self.assertEqual(len(pipeline.stages[2].thread_times.times()), 1)
+
+    def test_pool_only_runs_inside_run(self):
+        test_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(test_dir, 'Page.aspx')
+            with open(path, 'w') as f:
+                f.write(PAGE)
+            # Built but not run: no worker processes
+            pipeline = analysis_pipeline(workers=2)
+            self.assertEqual(multiprocessing.active_children(), [])
+            result, = pipeline.run([(path, None, None)])
+            self.assertTrue(result.findings)
+            self.assertEqual(multiprocessing.active_children(), [])
+        finally:
+            shutil.rmtree(test_dir)
+
+    def test_identical_files_parsed_once(self):
+        test_dir = tempfile.mkdtemp()
+        try:
+            paths = []
+            for name in ['a/jquery.js', 'b/jquery.js', 'c/jquery.js', 'a/Page.aspx', 'b/Page.aspx', 'Other.aspx']:
+                path = os.path.join(test_dir, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w') as f:
+                    f.write('<button onclick="save()">Save</button>' if name == 'Other.aspx' else
+                            '<script>$.ajax({url: "/api/items"});</script>\n<div style="color:red"></div>')
+                paths.append(path)
+
+            for workers in (1, 2):
+                results = list(analysis_pipeline(workers=workers).run((p, None, None) for p in paths))
+                # Copies are read concurrently, so any one of a group may be the one parsed
+                shared = [r.shared for r in results]
+                self.assertEqual((sorted(shared[:3]), sorted(shared[3:5]), shared[5]),
+                                 ([False, True, True], [False, True], False))
+                expected = list(analysis_pipeline(read_threads=1, queue_depth=1).run((p, None, None) for p in paths))
+                for result, reference in zip(results, expected):
+                    self.assertEqual([vars(f) for f in result.findings], [vars(f) for f in reference.findings])
+                    self.assertTrue(all(f.file_path == result.file_path for f in result.findings))
+        finally:
+            shutil.rmtree(test_dir)
+
+    def test_depth_metrics_from_the_same_read(self):
+        test_dir = tempfile.mkdtemp()
+        try:
+            paths = []
+            for name, text in (('a/Page.aspx', PAGE), ('b/Page.aspx', PAGE), ('Big.aspx', PAGE * 40),
+                               ('app.js', "fetch('/api/items');\n")):
+                path = os.path.join(test_dir, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w') as f:
+                    f.write(text)
+                paths.append(path)
+
+            # Big.aspx is over the limit: its depth metrics come from the windowed scan
+            depth = DepthScanner(test_dir)
+            for workers in (1, 2):
+                results = list(analysis_pipeline(workers=workers, window_above=len(PAGE) * 10, depth=True)
+                               .run((p, None, os.path.getsize(p)) for p in paths))
+                self.assertEqual(sum(r.shared for r in results), 1)
+                self.assertEqual([r.windowed for r in results], [False, False, True, False])
+                for path, result in zip(paths, results):
+                    self.assertEqual(result.depth, depth.process_file(*os.path.split(path)))
+        finally:
+            shutil.rmtree(test_dir)
+
+if __name__ == '__main__':
+    unittest.main()
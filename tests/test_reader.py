@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src import reader
+from src.reader import FileReader
+
+PAGE = '<script>var t = "Café – £5"; if (ok) { save(); }</script>\n'
+
+class TestFileReader(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def decode(self, name, raw, encodings=None):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'wb') as f:
+            f.write(raw)
+        folder_encoding = encodings.encoding_for(path) if encodings and reader.needs_folder_encoding(raw) else None
+        return FileReader.decode_with_strategy(raw, folder_encoding)
+
+    def test_bom_and_utf8_fast_paths(self):
+        self.assertEqual(self.decode('a.html', PAGE.encode('utf-8')), (PAGE, 'utf-8', reader.STRATEGY_UTF8))
+        self.assertEqual(self.decode('b.html', b'\xef\xbb\xbf' + PAGE.encode('utf-8')), (PAGE, 'utf-8-sig', reader.STRATEGY_BOM))
+        self.assertEqual(self.decode('c.html', PAGE.encode('utf-16')), (PAGE, 'utf-16', reader.STRATEGY_BOM))
+
+    def test_directory_reuses_detected_encoding(self):
+        raw = PAGE.encode('cp1252')
+        content, encoding, strategy = self.decode('a.aspx', raw)
+        self.assertEqual((content, strategy), (PAGE, reader.STRATEGY_SAMPLED))
+        encodings = reader.DirectoryEncodings()
+        self.assertEqual(self.decode('b.aspx', raw, encodings), (PAGE, encoding, reader.STRATEGY_DIRECTORY))
+        # UTF-8 files in the same directory still take the fast path
+        self.assertEqual(self.decode('c.aspx', PAGE.encode('utf-8'), encodings)[2], reader.STRATEGY_UTF8)
+
+    def test_directory_encoding_independent_of_decode_order(self):
+        # The folder's encoding comes from its first non-UTF-8 file by name,
+        # whichever file a worker happens to decode first
+        first, second = 'Café £5'.encode('cp1252'), 'Привет, мир'.encode('koi8-r')
+        self.decode('a.aspx', first)
+        self.decode('b.aspx', second)
+        in_order, reversed_order = reader.DirectoryEncodings(), reader.DirectoryEncodings()
+        self.assertEqual(in_order.encoding_for(os.path.join(self.test_dir, 'a.aspx')),
+                         reversed_order.encoding_for(os.path.join(self.test_dir, 'b.aspx')))
+        self.assertEqual(self.decode('b.aspx', second, in_order), self.decode('b.aspx', second, reversed_order))
+        self.assertIsNone(in_order.encoding_for(os.path.join(self.test_dir, 'page.html')))
+
+    def test_directory_detection_samples_a_bounded_number_of_siblings(self):
+        for i in range(reader.DIRECTORY_SAMPLE_FILES):
+            self.decode(f'{i:03}.aspx', PAGE.encode('utf-8'))
+        raw = PAGE.encode('cp1252')
+        self.assertEqual(self.decode('zzz.aspx', raw, reader.DirectoryEncodings())[2], reader.STRATEGY_SAMPLED)
+
+    def test_read_file(self):
+        path = os.path.join(self.test_dir, 'page.html')
+        with open(path, 'wb') as f:
+            f.write(PAGE.encode('utf-8'))
+        self.assertEqual(FileReader.read_file(path), (PAGE, 'utf-8'))
+        self.assertIsNone(FileReader.read_file(path + '.missing')[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from src import manifest
+from src.manifest import ScanManifest
+from src.engine import analysis_pipeline
+
+class TestScanManifest(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.test_dir, 'output')
+        os.makedirs(self.output_dir)
+        self.page = os.path.join(self.test_dir, 'Index.html')
+        with open(self.page, 'w') as f:
+            f.write('<html><body onload="init()">\n<script>\nfetch("/api/users");\n</script>\n</body></html>\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def run_scan(self):
+        manifest = ScanManifest(self.output_dir)
+        manifest.load()
+        cached = manifest.lookup(self.page)
+        if cached is not None:
+            manifest.save()
+            return 'cached', cached
+
+        result, = analysis_pipeline().run([(self.page, manifest.known_digest(self.page), None)])
+        if result.unchanged:
+            findings = manifest.reuse(self.page, result.digest)
+            status = 'unchanged'
+        else:
+            findings = result.findings
+            manifest.record(self.page, result.digest, findings)
+            status = 'parsed'
+        manifest.save()
+        return status, findings
+
+    def test_unchanged_file_reuses_findings(self):
+        status, first = self.run_scan()
+        self.assertEqual(status, 'parsed')
+
+        status, second = self.run_scan()
+        self.assertEqual(status, 'cached')
+        self.assertEqual([f.to_dict() for f in first], [f.to_dict() for f in second])
+
+    def test_touched_file_is_matched_by_hash(self):
+        self.run_scan()
+        st = os.stat(self.page)
+        os.utime(self.page, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        status, findings = self.run_scan()
+        self.assertEqual(status, 'unchanged')
+        self.assertTrue(any(f.ajax_detected for f in findings))
+
+    def test_modified_file_is_reparsed(self):
+        self.run_scan()
+        with open(self.page, 'a') as f:
+            f.write('<div style="color: red"></div>\n')
+
+        status, findings = self.run_scan()
+        self.assertEqual(status, 'parsed')
+        self.assertTrue(any(f.code_type == 'inlinestyle' for f in findings))
+
+    def test_partial_save_keeps_files_not_reached(self):
+        self.run_scan()
+        # A run that failed before reaching the page
+        manifest = ScanManifest(self.output_dir)
+        manifest.load()
+        manifest.save(partial=True)
+        self.assertEqual(self.run_scan()[0], 'cached')
+
+    def test_version_covers_the_analysis_code(self):
+        # Every module the engine loads (the Parser imports ajax_detector lazily),
+        # in a fresh interpreter so other tests' imports don't count
+        loaded = subprocess.run(
+            [sys.executable, '-c', "import sys, src.engine, src.ajax_detector; "
+             "print('\\n'.join(m.__file__ for n, m in sys.modules.items() if n.split('.')[0] in ('src', 'reposcan_shared')))"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), capture_output=True, text=True, check=True)
+        # Modules that don't shape findings (patterns.py is hashed by pattern_version)
+        exempt = {'__init__.py', 'manifest.py', 'pipeline.py', 'git_index.py', 'patterns.py', 'scheduling.py', 'walker.py'}
+        module_dir = os.path.dirname(os.path.abspath(manifest.__file__))
+        fingerprinted = {os.path.normpath(os.path.join(module_dir, name)) for name in manifest._ANALYSIS_MODULES}
+        for path in loaded.stdout.split():
+            if os.path.basename(path) not in exempt:
+                self.assertIn(os.path.normpath(path), fingerprinted)
+
+if __name__ == '__main__':
+    unittest.main()
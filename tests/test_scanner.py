@@ -0,0 +1,70 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from src.config import ScannerConfig
+from src.scanner import Scanner
+from src.reader import FileReader
+from reposcan_shared import walker
+
+class TestScanner(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for rel in ('Default.aspx', 'Views/Home/Index.cshtml', 'Views/site.css', 'bin/Debug/Skip.aspx', 'Scripts/app.js'):
+            path = os.path.join(self.test_dir, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write('<script>init();</script>\n')
+
+        self.config = ScannerConfig()
+        self.config.root_folder = self.test_dir
+        self.config.include_extensions = {'.aspx', '.cshtml', '.js'}
+        self.config.exclude_folders = ['bin']
+        self.config.exclude_files = []
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_discovery_matches_os_walk(self):
+        expected = []
+        for root, dirs, files in os.walk(self.test_dir):
+            dirs[:] = [d for d in dirs if d not in self.config.exclude_folders]
+            expected += [os.path.join(root, f) for f in files if os.path.splitext(f)[1] in self.config.include_extensions]
+
+        for threads in (1, 4):
+            self.config.discovery_threads = threads
+            scanner = Scanner(self.config)
+            discovered = list(scanner.discover())
+            self.assertEqual([f.path for f in discovered], expected)
+            self.assertEqual(len(expected), 3)
+            self.assertEqual((scanner.files_seen, scanner.dirs_seen), (4, 4))
+
+        # Size and mtime come from the directory entry
+        for f in discovered:
+            st = os.stat(f.path)
+            self.assertEqual((f.size, f.mtime), (st.st_size, st.st_mtime_ns))
+
+    def test_threaded_walk_lists_a_bounded_number_ahead(self):
+        wide = os.path.join(self.test_dir, 'wide')
+        for i in range(40):
+            os.makedirs(os.path.join(wide, f'd{i:02}'))
+            open(os.path.join(wide, f'd{i:02}', 'page.aspx'), 'w').close()
+        visited = []
+        walk = walker.walk(wide, visited.append, threads=2)
+        next(walk)
+        time.sleep(0.2)
+        # Only the next folders in walk order were listed, not the whole tree
+        self.assertLessEqual(len(visited), 2 * walker.PREFETCH_PER_THREAD)
+        self.assertEqual(len(list(walk)), 40)
+        self.assertEqual(len(visited), 40)
+
+    def test_read_with_stale_size(self):
+        path = os.path.join(self.test_dir, 'Default.aspx')
+        size = os.path.getsize(path)
+        with open(path, 'a') as f:
+            f.write('<!-- appended after discovery -->\n')
+        self.assertEqual(FileReader.read_bytes(path, size), FileReader.read_bytes(path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from src.parser import Parser
+from src import html_tokenizer
+
+EDGE_CASE_PAGE = '''<%@ Page Language="C#" %>
+<html>
+<head>
+  <link rel="stylesheet" href="/Content/site.css">
+  <link rel="icon  stylesheet" href="https://cdn.example.com/theme.css" />
+  <link rel="preload" href="/fonts/a.woff2">
+  <script src="/Scripts/app.js"></script>
+  <script src="//cdn.example.com/jquery.js" />
+  <style>
+    @import url("print.css");
+    .grid { color: red; }
+  </style>
+  <style></style>
+</head>
+<body onload="init()" ONCLICK="a()" onclick="b()">
+  <a href="javascript:void(0)" style="color: <%= Color %>">x</a>
+  <div style="display:none"
+       onmouseover="show(
+         1)">y</div>
+  <script> </script>
+  <script></script>
+  <script>
+    if (a < b && c > d) { $.ajax({ url: "/api/items" }); }
+    document.write("</div>");
+  </script>
+  <input disabled onchange>
+</body>
+</html>
+<script>
+  fetch("/api/unterminated");
+'''
+
+
+def comparable(findings):
+    rows = []
+    for f in findings:
+        row = dict(vars(f))
+        if f.code_type in ('External Script', 'Internal Script', 'External Style', 'Internal Style'):
+            # The stream backend keeps the tag as written instead of BS4's re-serialised form
+            for key in ('full_code', 'server_severity', 'logic_density_score', 'complexity', 'functionality'):
+                row.pop(key)
+        rows.append(row)
+    return rows
+
+
+class TestStreamBackend(unittest.TestCase):
+    def test_stream_matches_bs4(self):
+        reference = Parser('bs4').parse('Edge.aspx', EDGE_CASE_PAGE)
+        streamed = Parser('stream').parse('Edge.aspx', EDGE_CASE_PAGE)
+        self.assertEqual(comparable(reference), comparable(streamed))
+        self.assertTrue(any(f.ajax_detected for f in streamed))
+
+    def test_scan_matches_tokenize(self):
+        page = EDGE_CASE_PAGE[:EDGE_CASE_PAGE.rindex('<script>')]   # Without the unterminated script
+        self.assertEqual(list(html_tokenizer.scan(page)), list(html_tokenizer.tokenize(page)))
+
+        # Markup left to html.parser
+        for markup in ('<p>a</p><script>fetch("/x");', '<p>a &#; b</p>', '<!-- a -- b -->', '<![CDATA[x]]>',
+                       '<script>a</ script>b</script>', '<a href="x"'):
+            with self.assertRaises(html_tokenizer.Unsupported, msg=markup):
+                list(html_tokenizer.scan(markup))
+
+    def test_chunk_boundaries_do_not_change_events(self):
+        whole = list(html_tokenizer.tokenize(EDGE_CASE_PAGE))
+        for chunk_size in (1, 7, 64):
+            self.assertEqual(whole, list(html_tokenizer.tokenize(EDGE_CASE_PAGE, chunk_size)))
+
+    def test_start_tag_offsets(self):
+        for event in html_tokenizer.tokenize(EDGE_CASE_PAGE):
+            if isinstance(event, html_tokenizer.StartTag):
+                self.assertTrue(EDGE_CASE_PAGE.startswith(event.source, event.offset))
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Parser('lxml')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import re
+import unittest
+from reposcan_shared import patterns
+from src.parser import Parser, TIER_DOM, TIER_SCRIPT, TIER_TRIAGE
+
+# Markup the DOM walk finds something in, however little
+CANDIDATES = [
+    '<p>Total</p><button onclick="save()">Save</button>',
+    '<div title="a>b"style>x</div>',                          # valueless, after a quote
+    '<input type=text ONCHANGE=go()>',
+    '<a href="&#106;avascript:run()">Run</a>',                # entity-encoded URI
+    '<a href="x"><SCRIPT src=app.js></SCRIPT></a>',
+    '<link rel=stylesheet href=site.css>',
+    '<body onload>',
+]
+
+class TestTriage(unittest.TestCase):
+    def test_every_event_handler_is_a_candidate(self):
+        pattern = patterns.get('dom_candidates')
+        for name in Parser().event_handlers:
+            self.assertTrue(pattern.search(f'<a {name}>x</a>'), name)
+
+    def test_triage_keeps_the_dom_findings(self):
+        triaged, untriaged = Parser(), Parser()
+        untriaged.dom_candidates = re.compile('')
+        for text in CANDIDATES:
+            self.assertEqual([vars(f) for f in triaged.parse('Page.aspx', text)],
+                             [vars(f) for f in untriaged.parse('Page.aspx', text)], text)
+            self.assertEqual(triaged.last_tier, TIER_DOM, text)
+            self.assertTrue(triaged.parse('Page.aspx', text), text)
+
+        # Nothing to find: no tree is built
+        parser = Parser()
+        self.assertEqual(parser.parse('Grid.ascx', '<div class="grid"><%= Model.Title %> only once</div>\n'), [])
+        self.assertEqual(parser.last_tier, TIER_TRIAGE)
+        parser.parse('app.js', 'var grid = 1;\n')
+        self.assertEqual(parser.last_tier, TIER_SCRIPT)
+
+if __name__ == '__main__':
+    unittest.main()
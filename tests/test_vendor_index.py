@@ -0,0 +1,48 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+from src.vendor_index import VendorIndex
+from src.manifest import content_digest
+from src.engine import analysis_pipeline
+
+JQUERY = b'/*! jQuery v3.6.0 | (c) OpenJS Foundation and other contributors */\n!function(e){$.ajax({url:"/x"});e.innerHTML="";}(window);\n'
+
+class TestVendorIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_name_and_banner_heuristics(self):
+        index = VendorIndex.load()
+        match = index.classify('Scripts/jquery-3.6.0.min.js', JQUERY, content_digest(JQUERY))
+        self.assertEqual((match.label, match.matched_by), ('jQuery 3.6.0', 'file name + banner'))
+        # Both the name and the banner must agree: a bundle embedding jQuery is analysed
+        self.assertIsNone(index.classify('Scripts/site.bundle.js', JQUERY, content_digest(JQUERY)))
+        self.assertIsNone(index.classify('Scripts/jquery.js', b'// our own helpers\n', content_digest(b'x')))
+
+    def test_local_index_file(self):
+        grid = b'// Contoso Grid\nfunction grid() { $.ajax("/rows"); }\n'
+        index_file = os.path.join(self.test_dir, 'vendor_libraries.json')
+        with open(index_file, 'w') as f:
+            json.dump({'hashes': {content_digest(grid): 'Contoso Grid 2.1'},
+                       'libraries': [{'name': 'Fabrikam UI', 'file': r'fabrikam\.js', 'banner': r'Fabrikam UI v(?P<version>[\d.]+)'}]}, f)
+        index = VendorIndex.load(index_file)
+        self.assertNotEqual(index.fingerprint(), VendorIndex.load().fingerprint())
+        self.assertEqual(index.classify('lib/renamed.js', grid, content_digest(grid)).label, 'Contoso Grid 2.1')
+        fabrikam = b'/* Fabrikam UI v1.2 */'
+        self.assertEqual(index.classify('fabrikam.js', fabrikam, content_digest(fabrikam)).label, 'Fabrikam UI 1.2')
+
+        # The pipeline summarises vendor files as one finding instead of parsing them
+        path = os.path.join(self.test_dir, 'grid.js')
+        with open(path, 'wb') as f:
+            f.write(grid)
+        result, = analysis_pipeline(vendor_index=index).run([(path, None, None)])
+        self.assertEqual(result.vendor, 'Contoso Grid 2.1')
+        self.assertEqual([(f.category, f.snippet, f.end_line) for f in result.findings], [('Vendor', 'Contoso Grid 2.1', 3)])
+
+if __name__ == '__main__':
+    unittest.main()
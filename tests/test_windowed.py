@@ -0,0 +1,59 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from reposcan_shared import patterns
+from reposcan_shared.ajax_patterns import find_ajax_calls
+from reposcan_shared.lineindex import LineIndex
+from reposcan_shared.windowed import WindowedScan
+from src.engine import analysis_pipeline
+from src.manifest import content_digest
+from tests.test_depth_scanner import PAGE
+
+class TestWindowedScan(unittest.TestCase):
+    def test_matches_and_lines_as_one_scan(self):
+        data = (PAGE * 20).encode('utf-8')
+        finders = {'blocks': patterns.get_bytes('internal_script_blocks').finditer,
+                   'ajax': find_ajax_calls}
+        line_index = LineIndex(data)
+        expected = sorted([('blocks', m.start(), line_index.line_of(m.start())) for m in finders['blocks'](data, 0)] +
+                          [('ajax', m.start(), line_index.line_of(m.start())) for m in finders['ajax'](data, 0)])
+
+        for window in (97, 256, 1000, len(data)):
+            scan = WindowedScan(io.BytesIO(data), finders, window=window, overlap=512)
+            self.assertEqual(sorted((hit.name, hit.offset, hit.line) for hit in scan), expected, window)
+            self.assertEqual((scan.lines, scan.size), (data.count(b'\n') + 1, len(data)))
+
+    def test_oversized_files_are_scanned_not_skipped(self):
+        test_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(test_dir, 'Generated.aspx')
+            raw = (PAGE * 50).encode('utf-8')
+            with open(path, 'wb') as f:
+                f.write(raw)
+            size = len(raw)
+
+            result, = analysis_pipeline(window_above=size - 1).run([(path, None, size)])
+            finding, = result.findings
+            self.assertTrue(result.windowed)
+            self.assertEqual(result.digest, content_digest(raw))
+            self.assertEqual((finding.category, finding.end_line), ('Oversized', PAGE.count('\n') * 50 + 1))
+            self.assertEqual(finding.pattern_counts['internal_script_blocks'], 50)
+            self.assertEqual(finding.match_lines['inline_js'][:2], [2, 2 + PAGE.count('\n')])
+
+            # Discovery saw a smaller file: the digest is still the blob id of the content
+            result, = analysis_pipeline(window_above=1).run([(path, None, size - 100)])
+            self.assertEqual(result.digest, content_digest(raw))
+            # Unchanged content is recognised before scanning
+            result, = analysis_pipeline(window_above=1).run([(path, content_digest(raw), size)])
+            self.assertEqual((result.unchanged, result.findings), (True, None))
+
+            # Under the limit it is parsed as usual
+            result, = analysis_pipeline(window_above=size).run([(path, None, size)])
+            self.assertFalse(result.windowed)
+        finally:
+            shutil.rmtree(test_dir)
+
+if __name__ == '__main__':
+    unittest.main()